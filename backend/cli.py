@@ -6,6 +6,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.domain.services.game import Game
 from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color
 from src.domain.exceptions.game_error import InvalidMoveError, IllegalMoveError
 
 def main():
@@ -17,10 +18,12 @@ def main():
     # Simple placement phase for demonstration
     
     print("\nGame ready. This is a skeleton. Implement further interactions.")
-    game = Game(config={})  # Assuming config is a dictionary for now
+    # `cli.py --bot` lets the computer play black
+    bot_color = Color.BLACK if "--bot" in sys.argv else None
+    game = Game(config={}, bot_color=bot_color)  # Assuming config is a dictionary for now
     
     flag = True
-    while flag:
+    while flag and not game.is_over:
         try:
             game.step()
 
@@ -33,4 +36,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # `cli.py perft <depth> <position>` runs the move generator benchmark
+    if len(sys.argv) > 1 and sys.argv[1] == "perft":
+        from src.domain.services.perft import main as perft_main
+        sys.exit(perft_main(sys.argv[2:]))
     main()
@@ -1,14 +1,23 @@
 # backend/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-app = FastAPI()
+from src.infrastructure.api.game_routes import router as game_router, manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # stop the engine worker pools
+    manager.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/")
 def read_root():
     return {"message": "Go-Chess Backend is running!"}
 
-# Placeholder for game routes
-# Example:
-# from src.infrastructure.api.game_routes import router as game_router
-# app.include_router(game_router, prefix="/api/v1")
+app.include_router(game_router, prefix="/api/v1")
@@ -1,63 +1,215 @@
-from typing import Optional
-
 from ..value_objects.position import Position
+from ..value_objects.piece_type import Color, PieceType
+from ..value_objects.bitboard import iter_squares, lsb
+from .zobrist import piece_square_keys
 from ..exceptions.game_error import *
 
+# shared piece instances by code (see piece_code), filled in by entities.piece.
+# Index 0 stays None and stands for an empty square.
+PIECES_BY_CODE: list = [None] * (1 + len(Color) * len(PieceType))
+
 
 class Board:
-    """Represents the chess board."""
+    """Represents the chess board.
+
+    The position is kept as bitboards: one integer mask per (color, piece type)
+    plus per-color and total occupancy masks. Square ``row * size + col`` maps
+    to bit ``row * size + col``. A flat mailbox mirrors the masks so that
+    looking up the piece on a square is a single list index. The mailbox only
+    holds small integer piece codes, pieces being shared singletons.
+
+    The board also keeps the Zobrist hash of its pieces, XOR-updated on every
+    change, and optionally an AttackMap of the squares each color attacks.
+    """
 
     def __init__(self, size: int = 8):
-        from ..entities.piece import Piece
         self.size = size
-        # just a list of lists
-        self._grid: list[list[Optional[Piece]]] = [
-            [None for _ in range(size)] for _ in range(size)
-        ]
+        self.num_squares = size * size
+        self.full_mask = (1 << self.num_squares) - 1
+
+        # mailbox of piece codes, indexed by square, 0 for empty squares
+        self._squares: list[int] = [0] * self.num_squares
+        # bitboards, indexed by [color.value][piece_type.value]
+        self._pieces: list[list[int]] = [[0] * len(PieceType) for _ in Color]
+        self._colors: list[int] = [0] * len(Color)
+        self._occupied = 0
+
+        # Zobrist hash of the pieces on the board
+        self._keys = piece_square_keys(size)
+        self.zobrist = 0
+
+        # attacked squares kept up to date, see services.attack_map
+        self.attack_map = None
+
+    # --- Position based API ---
 
     def place_piece(self, piece, position: Position):
-        
+
         if not piece:
             raise ValueError("Invalid piece")
-        
+
         if self.is_valid_position(position):
-            self._grid[position.row][position.col] = piece
+            self.put(position.row * self.size + position.col, piece)
         else:
             raise ValueError("Invalid board position")
-        
+
     def remove_piece(self, position: Position):
-        
+
         if self.is_valid_position(position):
-            self._grid[position.row][position.col] = None
+            self.clear(position.row * self.size + position.col)
         else:
             raise ValueError("Invalid board position")
 
     def get_piece(self, position: Position):
-        
+
         if self.is_valid_position(position):
-            return self._grid[position.row][position.col]
+            return PIECES_BY_CODE[self._squares[position.row * self.size + position.col]]
         return None
 
     def move_piece(self, from_pos: Position, to_pos: Position):
-        
+
         piece = self.get_piece(from_pos)
         if piece:
-            self._grid[from_pos.row][from_pos.col] = None
-            self.place_piece(piece, to_pos)
+            if not self.is_valid_position(to_pos):
+                raise ValueError("Invalid board position")
+            self.relocate(
+                from_pos.row * self.size + from_pos.col,
+                to_pos.row * self.size + to_pos.col,
+            )
         else:
             raise InvalidMoveError("No piece at the source position")
 
     def is_valid_position(self, position: Position) -> bool:
-        
+
         return 0 <= position.row < self.size and 0 <= position.col < self.size
 
+    # --- Square index API ---
+    # These skip bounds checking, callers are expected to pass valid indexes.
+
+    def square_index(self, position: Position) -> int:
+        """Returns the square index of a position on this board."""
+        return position.row * self.size + position.col
+
+    def position_of(self, square: int) -> Position:
+        """Returns the position of a square index on this board."""
+        return Position.from_index(square, self.size)
+
+    def piece_at(self, square: int):
+        """Returns the piece on a square index, or None."""
+        return PIECES_BY_CODE[self._squares[square]]
+
+    def code_at(self, square: int) -> int:
+        """Returns the piece code on a square index, 0 when empty."""
+        return self._squares[square]
+
+    def put(self, square: int, piece):
+        """Puts a piece on a square, replacing whatever was there."""
+        if self._squares[square]:
+            self.clear(square)
+        code = piece.code
+        color, piece_type = divmod(code - 1, 6)
+        bit = 1 << square
+        self._squares[square] = code
+        self._pieces[color][piece_type] |= bit
+        self._colors[color] |= bit
+        self._occupied |= bit
+        self.zobrist ^= self._keys[code - 1][square]
+
+    def clear(self, square: int):
+        """Empties a square. Returns the piece that was on it, if any."""
+        code = self._squares[square]
+        if code:
+            color, piece_type = divmod(code - 1, 6)
+            mask = ~(1 << square)
+            self._squares[square] = 0
+            self._pieces[color][piece_type] &= mask
+            self._colors[color] &= mask
+            self._occupied &= mask
+            self.zobrist ^= self._keys[code - 1][square]
+        return PIECES_BY_CODE[code]
+
+    def relocate(self, from_square: int, to_square: int):
+        """Moves the piece on from_square to to_square, capturing anything there.
+        Returns the captured piece, if any."""
+        code = self._squares[from_square]
+        captured = self.clear(to_square)
+        color, piece_type = divmod(code - 1, 6)
+        move = (1 << from_square) | (1 << to_square)
+        self._squares[from_square] = 0
+        self._squares[to_square] = code
+        self._pieces[color][piece_type] ^= move
+        self._colors[color] ^= move
+        self._occupied ^= move
+        keys = self._keys[code - 1]
+        self.zobrist ^= keys[from_square] ^ keys[to_square]
+        return captured
+
+    def load(self, squares: list[int]):
+        """Replaces the whole position with a mailbox of piece codes, one per
+        square. Faster than putting the pieces one by one."""
+        if len(squares) != self.num_squares:
+            raise ValueError("Invalid number of squares")
+        # one mask per piece code first, split by color afterwards
+        masks = [0] * len(PIECES_BY_CODE)
+        keys = self._keys
+        zobrist = 0
+        for square, code in enumerate(squares):
+            if code:
+                masks[code] |= 1 << square
+                zobrist ^= keys[code - 1][square]
+        per_color = len(PieceType)
+        pieces = [masks[1 + c * per_color:1 + (c + 1) * per_color] for c in range(len(Color))]
+        self._squares = list(squares)
+        self._pieces = pieces
+        self._colors = [sum(color_masks) for color_masks in pieces]
+        self._occupied = self._colors[0] | self._colors[1]
+        self.zobrist = zobrist
+
+    # --- Mask queries ---
+
+    def pieces_mask(self, piece_type: PieceType, color: Color) -> int:
+        """Returns the bitboard of the pieces of a given type and color."""
+        return self._pieces[color.value][piece_type.value]
+
+    def color_mask(self, color: Color) -> int:
+        """Returns the bitboard of all the pieces of a given color."""
+        return self._colors[color.value]
+
+    @property
+    def occupied(self) -> int:
+        """Bitboard of every occupied square."""
+        return self._occupied
+
+    @property
+    def empty(self) -> int:
+        """Bitboard of every empty square."""
+        return ~self._occupied & self.full_mask
+
+    def king_square(self, color: Color) -> int | None:
+        """Returns the square index of the king of the given color, or None."""
+        kings = self._pieces[color.value][PieceType.KING.value]
+        return lsb(kings) if kings else None
+
+    def iter_pieces(self, color: Color | None = None):
+        """Yields (square, piece) pairs for the pieces on the board."""
+        mask = self._occupied if color is None else self._colors[color.value]
+        for square in iter_squares(mask):
+            yield square, PIECES_BY_CODE[self._squares[square]]
+
+    @property
+    def _grid(self) -> list[list]:
+        """Row-major view of the board, handy for debugging."""
+        return [
+            [PIECES_BY_CODE[code] for code in self._squares[r * self.size:(r + 1) * self.size]]
+            for r in range(self.size)
+        ]
+
     def __repr__(self) -> str:
         # Find the max width of any piece's string representation
         max_width = 1  # Minimum width for empty squares
-        for row in self._grid:
-            for piece in row:
-                if piece:
-                    max_width = max(max_width, len(str(piece)))
+        for code in self._squares:
+            if code:
+                max_width = max(max_width, len(str(PIECES_BY_CODE[code])))
 
         # this pads the cells to align them using python's string formatting
         cell_fmt = f"{{:>{max_width}}}"
@@ -70,12 +222,26 @@ class Board:
                 line.append(cell_fmt.format(cell))
             lines.append(" ".join(line))
         return "\n".join(lines)
-    
+
     def copy(self):
-        new_board = Board(self.size)
-        for r in range(self.size):
-            for c in range(self.size):
-                piece = self.get_piece(Position(r, c))
-                if piece:
-                    new_board.place_piece(piece, Position(r, c))
+        new_board = Board.__new__(Board)
+        new_board.size = self.size
+        new_board.num_squares = self.num_squares
+        new_board.full_mask = self.full_mask
+        new_board._squares = self._squares[:]
+        new_board._pieces = [masks[:] for masks in self._pieces]
+        new_board._colors = self._colors[:]
+        new_board._occupied = self._occupied
+        new_board._keys = self._keys
+        new_board.zobrist = self.zobrist
+        # the map follows the original board, the copy starts untracked
+        new_board.attack_map = None
         return new_board
+
+    def __eq__(self, other) -> bool:
+        """Two boards are equal when they hold the same pieces on the same squares."""
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.size == other.size and self._squares == other._squares
+
+    __hash__ = None  # boards are mutable
@@ -0,0 +1,176 @@
+"""Compact binary encoding of GoChess positions.
+
+Every position of a given board size encodes to the same number of bytes, so
+a corpus is a plain concatenation of records that can be sliced by index
+without any parsing. The layout of a record::
+
+    byte  0     board size
+    byte  1     flags: bit 0 black to move, bit 1 movement phase,
+                bit 2 reserves tracked, bits 4-7 castling rights
+    byte  2     en passant file plus one, 0 for none (the rank follows from
+                the side to move)
+    bytes 3-    board, one nibble per square (the piece code, 0 for empty),
+                the low nibble first
+    12 bytes    reserve counts, white pawn to king then black pawn to king
+    2 bytes     placement turns used, white then black
+
+A standard 8x8 position takes 49 bytes. Records are decoded from bytes or
+memoryview objects, so bulk decoding slices a single buffer without copies.
+The game config, the move history and the undo records are not part of the
+position and are not encoded.
+
+Run ``python -m src.domain.entities.codec`` from ``backend`` for a benchmark
+against pickle.
+"""
+
+from itertools import chain
+from typing import Iterable, Iterator
+
+from .board import Board
+from . import piece  # noqa: F401, registers the pieces of the codes loaded on boards
+from .game_state import GameState, GamePhase
+from ..value_objects.position import Position
+from ..value_objects.piece_type import Color, PieceType
+
+HEADER_BYTES = 3
+COUNTERS_BYTES = len(Color) * len(PieceType) + len(Color)
+
+_BLACK = 1
+_MOVEMENT = 2
+_RESERVES = 4
+# the two nibbles of every byte
+_NIBBLES = [(byte & 0xF, byte >> 4) for byte in range(256)]
+
+
+def record_size(size: int = 8) -> int:
+    """Bytes taken by a position of the given board size."""
+    return HEADER_BYTES + (size * size + 1) // 2 + COUNTERS_BYTES
+
+
+def encode_state(state: GameState) -> bytes:
+    """Encodes the position of a state."""
+    board = state.board
+    size = board.size
+    squares = board._squares
+    if len(squares) % 2:
+        squares = squares + [0]
+
+    flags = state.castling << 4
+    if state.current_player_color == Color.BLACK:
+        flags |= _BLACK
+    if state.phase == GamePhase.MOVEMENT:
+        flags |= _MOVEMENT
+    ep = state.en_passant_target
+    counters = [0] * COUNTERS_BYTES
+    if state.reserves is not None:
+        flags |= _RESERVES
+        for color, counts in state.reserves.items():
+            base = color.value * len(PieceType)
+            for piece_type, count in counts.items():
+                counters[base + piece_type.value] = count
+    counters[-2] = state.placement_turns[Color.WHITE]
+    counters[-1] = state.placement_turns[Color.BLACK]
+
+    # counters stay below zobrist.MAX_COUNT, so they fit in a byte
+    return (
+        bytes((size, flags, ep.col + 1 if ep is not None else 0))
+        + bytes(low | high << 4 for low, high in zip(squares[0::2], squares[1::2]))
+        + bytes(counters)
+    )
+
+
+def decode_state(data: bytes | memoryview, offset: int = 0) -> GameState:
+    """Decodes the position encoded at offset in data."""
+    size = data[offset]
+    flags = data[offset + 1]
+    num_squares = size * size
+    start = offset + HEADER_BYTES
+    end = start + (num_squares + 1) // 2
+    if len(data) < end + COUNTERS_BYTES:
+        raise ValueError("Truncated position record")
+
+    board = Board(size)
+    squares = list(chain.from_iterable(map(_NIBBLES.__getitem__, data[start:end])))
+    board.load(squares[:num_squares])
+
+    color = Color.BLACK if flags & _BLACK else Color.WHITE
+    state = GameState(board, color)
+    state.castling = flags >> 4
+    if flags & _MOVEMENT:
+        state.phase = GamePhase.MOVEMENT
+    ep_file = data[offset + 2]
+    if ep_file:
+        # the target is behind a pawn of the player who just moved
+        row = 2 if color == Color.WHITE else size - 3
+        state.en_passant_target = Position(row, ep_file - 1, size)
+
+    counters = data[end:end + COUNTERS_BYTES]
+    if flags & _RESERVES:
+        per_type = len(PieceType)
+        state.reserves = {
+            color_: {
+                piece_type: counters[color_.value * per_type + piece_type.value]
+                for piece_type in PieceType
+                if counters[color_.value * per_type + piece_type.value]
+            }
+            for color_ in Color
+        }
+    state.placement_turns[Color.WHITE] = counters[-2]
+    state.placement_turns[Color.BLACK] = counters[-1]
+    return state
+
+
+def encode_many(states: Iterable[GameState]) -> bytes:
+    """Concatenates the records of positions, which must share a board size."""
+    return b"".join(encode_state(state) for state in states)
+
+
+def decode_many(data: bytes | memoryview, size: int = 8) -> Iterator[GameState]:
+    """Decodes every record of a buffer made by encode_many, lazily and
+    without copying the buffer."""
+    view = memoryview(data)
+    step = record_size(size)
+    if len(view) % step:
+        raise ValueError(f"Buffer length is not a multiple of the record size {step}")
+    for offset in range(0, len(view), step):
+        yield decode_state(view, offset)
+
+
+if __name__ == "__main__":
+    import pickle
+    import random
+    import time
+
+    from ..services.move_generator import legal_moves
+
+    # positions of random games from the opening with reserves
+    rng = random.Random(0)
+    states = []
+    while len(states) < 2000:
+        state = GameState.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P QN2P2/qn2p2 0/0")
+        for _ in range(rng.randrange(30)):
+            moves = legal_moves(state)
+            if not moves:
+                break
+            state.play(rng.choice(moves))
+        state._undo_stack.clear()
+        states.append(state)
+
+    def rate(function, items) -> float:
+        start = time.perf_counter()
+        results = [function(item) for item in items]
+        return len(results) / (time.perf_counter() - start)
+
+    encoded = [encode_state(state) for state in states]
+    pickled = [pickle.dumps(state) for state in states]
+    print(f"{len(states)} positions")
+    print(f"{'':>8} {'bytes':>8} {'encode/s':>10} {'decode/s':>10}")
+    print(f"{'binary':>8} {sum(map(len, encoded)) / len(states):8.1f} "
+          f"{rate(encode_state, states):10,.0f} {rate(decode_state, encoded):10,.0f}")
+    print(f"{'pickle':>8} {sum(map(len, pickled)) / len(states):8.1f} "
+          f"{rate(pickle.dumps, states):10,.0f} {rate(pickle.loads, pickled):10,.0f}")
+
+    corpus = encode_many(states)
+    start = time.perf_counter()
+    count = sum(1 for _ in decode_many(corpus))
+    print(f"bulk decode: {count / (time.perf_counter() - start):,.0f}/s from a {len(corpus)} byte buffer")
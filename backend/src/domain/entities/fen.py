@@ -0,0 +1,204 @@
+"""Extended FEN: a one-line text form of a GoChess position.
+
+The first four fields are standard FEN; three GoChess fields follow::
+
+    rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P N2P/n2p 0/1
+
+1. piece placement, rank by rank from the top, digits counting empty squares
+   (several digits for boards wider than 9)
+2. side to move, ``w`` or ``b``
+3. castling rights, ``KQkq`` or ``-``
+4. en passant target square or ``-``
+5. phase, ``P`` (placement) or ``M`` (movement)
+6. reserves: the pieces in hand, white ones in upper case then a ``/`` and
+   the black ones, each letter followed by its count when more than one
+   (``QN2P3/qn2p3``, ``/`` when both hands are empty), or ``-`` when the
+   game does not track reserves
+7. placement turns used, white and black (``0/0``)
+
+Parsing also accepts plain FEN: four fields, or six with the move clocks,
+which GoChess ignores. The missing fields take the GameState defaults.
+"""
+
+from functools import lru_cache
+
+from .board import Board
+from . import piece  # noqa: F401, registers the pieces of the codes loaded on boards
+from .game_state import GameState, GamePhase, CASTLING_BITS
+from .zobrist import MAX_COUNT
+from ..exceptions.game_error import InvalidMoveError
+from ..value_objects.position import Position
+from ..value_objects.piece_type import Color, PieceType, piece_code
+
+# piece letter <-> piece code
+_CODES: dict[str, int] = {}
+for _color in Color:
+    for _piece_type, _letter in zip(PieceType, "pnbrqk"):
+        _CODES[_letter.upper() if _color == Color.WHITE else _letter] = piece_code(_piece_type, _color)
+_LETTERS = [""] + [None] * len(_CODES)
+for _letter, _code in _CODES.items():
+    _LETTERS[_code] = _letter
+
+_TYPES = {letter: PieceType((code - 1) % 6) for letter, code in _CODES.items()}
+_CASTLING = "KQkq"
+_CASTLING_BITS = [
+    CASTLING_BITS[Color.WHITE]['kingside'], CASTLING_BITS[Color.WHITE]['queenside'],
+    CASTLING_BITS[Color.BLACK]['kingside'], CASTLING_BITS[Color.BLACK]['queenside'],
+]
+# reserves are written from the king down to the pawns
+_RESERVE_ORDER = [(piece_type, letter) for piece_type, letter in zip(PieceType, "pnbrqk")][::-1]
+_PHASES = {"P": GamePhase.PLACEMENT, "M": GamePhase.MOVEMENT}
+
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P - 0/0"
+
+
+@lru_cache(maxsize=4096)
+def _rank_codes(rank: str, size: int) -> tuple[int, ...] | None:
+    """Piece codes of a FEN rank, None when it is invalid. Cached, since the
+    same ranks come up again and again across positions."""
+    codes = []
+    empty = 0
+    for char in rank:
+        if char.isdigit():
+            empty = empty * 10 + int(char)
+            continue
+        codes += [0] * empty
+        empty = 0
+        code = _CODES.get(char)
+        if code is None:
+            return None
+        codes.append(code)
+    codes += [0] * empty
+    return tuple(codes) if len(codes) == size else None
+
+
+def parse_fen(fen: str) -> GameState:
+    """Builds a GameState from extended (or plain) FEN."""
+    fields = fen.split()
+    if len(fields) not in (4, 6, 7):
+        raise ValueError(f"Invalid FEN, expected 4, 6 or 7 fields: {fen!r}")
+
+    ranks = fields[0].split("/")
+    size = len(ranks)
+    squares = []
+    for rank in ranks:
+        codes = _rank_codes(rank, size)
+        if codes is None:
+            raise ValueError(f"Invalid FEN placement: {fields[0]!r}")
+        squares += codes
+    board = Board(size)
+    board.load(squares)
+
+    if fields[1] not in ("w", "b"):
+        raise ValueError(f"Invalid FEN side to move: {fields[1]!r}")
+    state = GameState(board, Color.WHITE if fields[1] == "w" else Color.BLACK)
+
+    castling = 0
+    if fields[2] != "-":
+        for char in fields[2]:
+            index = _CASTLING.find(char)
+            if index < 0:
+                raise ValueError(f"Invalid FEN castling rights: {fields[2]!r}")
+            castling |= _CASTLING_BITS[index]
+    state.castling = castling
+
+    if fields[3] != "-":
+        try:
+            state.en_passant_target = Position.from_algebraic(fields[3], size)
+        except InvalidMoveError:
+            raise ValueError(f"Invalid FEN en passant square: {fields[3]!r}") from None
+
+    if len(fields) == 7:
+        phase = _PHASES.get(fields[4])
+        if phase is None:
+            raise ValueError(f"Invalid FEN phase: {fields[4]!r}")
+        state.phase = phase
+        if fields[5] != "-":
+            state.reserves = {
+                color: dict(counts) for color, counts in zip(Color, _parse_reserves(fields[5]))
+            }
+        turns = fields[6].split("/")
+        # counters are hashed with one key per value, see zobrist.MAX_COUNT
+        if len(turns) != 2 or not all(turn.isdigit() and int(turn) < MAX_COUNT for turn in turns):
+            raise ValueError(f"Invalid FEN placement turns: {fields[6]!r}")
+        state.placement_turns[Color.WHITE] = int(turns[0])
+        state.placement_turns[Color.BLACK] = int(turns[1])
+    return state
+
+
+@lru_cache(maxsize=4096)
+def _parse_reserves(field: str) -> tuple[tuple[tuple[PieceType, int], ...], ...]:
+    """Per color (white first), the (piece type, count) pairs of a reserves field."""
+    sides = field.split("/")
+    if len(sides) != 2:
+        raise ValueError(f"Invalid FEN reserves: {field!r}")
+    reserves = []
+    for color, side in zip(Color, sides):
+        counts: dict[PieceType, int] = {}
+        letter = None
+        count = ""
+        for char in side + " ":
+            if char.isdigit():
+                if letter is None:
+                    raise ValueError(f"Invalid FEN reserves: {field!r}")
+                count += char
+                continue
+            if letter is not None:
+                counts[_TYPES[letter]] = int(count) if count else 1
+                if counts[_TYPES[letter]] >= MAX_COUNT:
+                    raise ValueError(f"Invalid FEN reserves, at most {MAX_COUNT - 1} of a piece: {field!r}")
+            if char == " ":
+                break
+            upper = char.isupper()
+            if char not in _TYPES or upper != (color == Color.WHITE):
+                raise ValueError(f"Invalid FEN reserves: {field!r}")
+            letter, count = char, ""
+        reserves.append(tuple(counts.items()))
+    return tuple(reserves)
+
+
+def to_fen(state: GameState) -> str:
+    """Writes the extended FEN of a state."""
+    board = state.board
+    size = board.size
+    squares = board._squares
+    ranks = []
+    for start in range(0, size * size, size):
+        rank = []
+        empty = 0
+        for code in squares[start:start + size]:
+            if code:
+                if empty:
+                    rank.append(str(empty))
+                    empty = 0
+                rank.append(_LETTERS[code])
+            else:
+                empty += 1
+        if empty:
+            rank.append(str(empty))
+        ranks.append("".join(rank))
+
+    castling = "".join(
+        char for char, bit in zip(_CASTLING, _CASTLING_BITS) if state.castling & bit
+    ) or "-"
+    ep = state.en_passant_target
+    if state.reserves is None:
+        reserves = "-"
+    else:
+        reserves = "/".join(
+            "".join(
+                (letter.upper() if color == Color.WHITE else letter) + (str(count) if count > 1 else "")
+                for piece_type, letter in _RESERVE_ORDER
+                if (count := state.reserves.get(color, {}).get(piece_type, 0)) > 0
+            )
+            for color in Color
+        )
+    return " ".join((
+        "/".join(ranks),
+        "w" if state.current_player_color == Color.WHITE else "b",
+        castling,
+        ep.algebraic() if ep is not None else "-",
+        "P" if state.phase == GamePhase.PLACEMENT else "M",
+        reserves,
+        f"{state.placement_turns[Color.WHITE]}/{state.placement_turns[Color.BLACK]}",
+    ))
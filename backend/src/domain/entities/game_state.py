@@ -1,7 +1,12 @@
+from dataclasses import dataclass
+from functools import partial
 from enum import Enum, auto
 from .board import Board
+from . import zobrist
 from ..value_objects.position import Position
 from ..value_objects.piece_type import Color, PieceType
+from ..value_objects.game_config import GameConfigStandard
+from ..value_objects.move import MoveList
 
 
 class GamePhase(Enum):
@@ -9,46 +14,298 @@ class GamePhase(Enum):
     MOVEMENT = auto()
 
 
+# castling rights are packed in 4 bits, one per color and side
+CASTLING_BITS: dict[Color, dict[str, int]] = {
+    Color.WHITE: {'kingside': 1, 'queenside': 2},
+    Color.BLACK: {'kingside': 4, 'queenside': 8},
+}
+ALL_CASTLING = 0b1111
+
+
+@dataclass(slots=True)
+class MoveUndo:
+    """Everything needed to take back a move or a placement in place.
+    Squares are board square indexes."""
+    from_square: int  # -1 for placements
+    to_square: int
+    piece: object
+    captured: object = None
+    captured_square: int = -1  # differs from to_square on en passant
+    en_passant_target: Position | None = None
+    castling: int = 0
+    promotion: object = None  # the piece the pawn turned into
+    rook_from: int = -1  # rook squares when the move is a castle
+    rook_to: int = -1
+
+    @property
+    def is_drop(self) -> bool:
+        return self.from_square < 0
+
+
+class _CastlingRightsView:
+    """Dict-like view over the castling bits of one color,
+    so that ``state.castling_rights[color]['kingside']`` keeps working."""
+
+    __slots__ = ("_state", "_bits")
+
+    def __init__(self, state: "GameState", color: Color):
+        self._state = state
+        self._bits = CASTLING_BITS[color]
+
+    def __getitem__(self, side: str) -> bool:
+        return bool(self._state.castling & self._bits[side])
+
+    def __setitem__(self, side: str, value: bool):
+        if value:
+            self._state.castling |= self._bits[side]
+        else:
+            self._state.castling &= ~self._bits[side]
+
+    def __iter__(self):
+        return iter(self._bits)
+
+    def items(self):
+        return [(side, self[side]) for side in self._bits]
+
+    def __eq__(self, other) -> bool:
+        return dict(self.items()) == (dict(other.items()) if hasattr(other, "items") else other)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class _Counts(dict):
+    """Counters (reserves per piece type, placement turns per color) that
+    report every change to their owner, so its Zobrist key stays in sync."""
+
+    __slots__ = ("_on_change",)
+
+    def __init__(self, values, on_change):
+        super().__init__(values)
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        old = self.get(key, 0)
+        super().__setitem__(key, value)
+        self._on_change(key, old, value)
+
+    def __reduce__(self):
+        # rebuilt without replaying the changes, the owner's key already has them
+        return (_Counts, (dict(self), self._on_change))
+
+
 class GameState:
-    """Represents the state of the game."""
+    """Represents the state of the game.
+
+    The state keeps a Zobrist key (see ``zobrist_key``) covering the pieces,
+    the side to move, castling rights, en passant file, phase, placement
+    reserves and placement turns. Every change XORs the key in O(1), so state
+    changes must go through the attributes (or the castling/reserve views),
+    not around them.
+    """
 
     def __init__(self, board: Board, current_player_color: Color,
                  en_passant_target: Position | None = None,
-                 castling_rights: dict | None = None):
+                 castling_rights: dict | None = None,
+                 reserves: dict[Color, dict[PieceType, int]] | None = None,
+                 config: GameConfigStandard | None = None):
+        # Zobrist key of everything but the pieces, which the board hashes
+        self._key = zobrist.CASTLING_KEYS[0]
+        self._current_player_color = Color.WHITE
+        self._phase = GamePhase.PLACEMENT
+        self._en_passant_target: Position | None = None
+        self._castling = 0
+        self._reserves = None
+
         self.board = board
         self.current_player_color = current_player_color
         self.phase = GamePhase.PLACEMENT
         self.winner = None
-        self.move_history = []
+        # moves and placements played in the game, from initial_fen, packed
+        self.move_history = MoveList(size=board.size)
+        self.initial_fen: str | None = None
 
         # number of the column where en passant is possible
         if en_passant_target:
             self.en_passant_target = en_passant_target
         else:
             self.en_passant_target: Position | None = None
-        
+
         ## Castling states
+        self.castling: int = ALL_CASTLING
+        self._castling_views = {color: _CastlingRightsView(self, color) for color in Color}
         if castling_rights:
-            self.castling_rights : dict[dict] = castling_rights
-        else:
-            self.castling_rights = {
-                Color.WHITE: {'kingside': True, 'queenside': True},
-                Color.BLACK: {'kingside': True, 'queenside': True}
-            }
-        
+            self.castling_rights = castling_rights
+
         # if the player's move is a castle, indicate with the piece side (king or queen)
         self.castle_next_move : dict[dict] = {
-            Color.WHITE: {'kingside': None, 'queenside': None}, 
+            Color.WHITE: {'kingside': None, 'queenside': None},
             Color.BLACK: {'kingside': None, 'queenside': None}
         }
 
+        ## Placement states
+        # rules of the placement phase, None for free setups (no turn limit,
+        # pawns kept off the first and last ranks)
+        self.config = config
+        # pieces each player still has in hand, None when placements are not tracked
+        self.reserves = reserves
+        # number of turns each player has spent placing pieces
+        self.placement_turns: dict[Color, int] = _Counts(
+            {Color.WHITE: 0, Color.BLACK: 0}, self._placement_turn_changed
+        )
+
+        # undo records of the moves made through make_move / make_drop
+        self._undo_stack: list[MoveUndo] = []
+
+    # --- FEN ---
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "GameState":
+        """Builds a state from extended FEN (plain FEN works too), see entities.fen."""
+        from .fen import parse_fen
+        return parse_fen(fen)
+
+    def to_fen(self) -> str:
+        """Writes the position as extended FEN, see entities.fen."""
+        from .fen import to_fen
+        return to_fen(self)
+
+    # --- Attack maps ---
+
+    @property
+    def attack_map(self):
+        """The board's AttackMap, None unless tracked."""
+        return self.board.attack_map
+
+    def track_attacks(self, enabled: bool = True):
+        """Keeps maps of the squares attacked by each color up to date, which
+        turns check and square safety tests into mask lookups. Returns the
+        AttackMap, see services.attack_map."""
+        if not enabled:
+            self.board.attack_map = None
+        elif self.board.attack_map is None:
+            from ..services.attack_map import AttackMap
+            self.board.attack_map = AttackMap(self.board)
+        return self.board.attack_map
+
+    # --- Hashed attributes ---
+
+    @property
+    def zobrist_key(self) -> int:
+        """64-bit hash of the position, kept up to date incrementally."""
+        return self.board.zobrist ^ self._key
+
+    @property
+    def current_player_color(self) -> Color:
+        return self._current_player_color
+
+    @current_player_color.setter
+    def current_player_color(self, color: Color):
+        if color != self._current_player_color:
+            self._key ^= zobrist.SIDE_KEY
+            self._current_player_color = color
+
+    @property
+    def phase(self) -> GamePhase:
+        return self._phase
+
+    @phase.setter
+    def phase(self, phase: GamePhase):
+        if phase != self._phase:
+            self._key ^= zobrist.MOVEMENT_PHASE_KEY
+            self._phase = phase
+
+    @property
+    def en_passant_target(self) -> Position | None:
+        return self._en_passant_target
+
+    @en_passant_target.setter
+    def en_passant_target(self, target: Position | None):
+        old = self._en_passant_target
+        if old is not None:
+            self._key ^= zobrist.EN_PASSANT_KEYS[old.col]
+        if target is not None:
+            self._key ^= zobrist.EN_PASSANT_KEYS[target.col]
+        self._en_passant_target = target
+
+    @property
+    def castling(self) -> int:
+        """Castling rights as 4 bits, see CASTLING_BITS."""
+        return self._castling
+
+    @castling.setter
+    def castling(self, castling: int):
+        self._key ^= zobrist.CASTLING_KEYS[self._castling] ^ zobrist.CASTLING_KEYS[castling]
+        self._castling = castling
+
+    @property
+    def castling_rights(self) -> dict[Color, _CastlingRightsView]:
+        return self._castling_views
+
+    @castling_rights.setter
+    def castling_rights(self, rights: dict):
+        castling = 0
+        for color, sides in rights.items():
+            for side, allowed in sides.items():
+                if allowed:
+                    castling |= CASTLING_BITS[color][side]
+        self.castling = castling
+
+    @property
+    def reserves(self) -> dict[Color, dict[PieceType, int]] | None:
+        return self._reserves
+
+    @reserves.setter
+    def reserves(self, reserves: dict[Color, dict[PieceType, int]] | None):
+        # replacing the whole reserves swaps their keys out and back in
+        for color, counts in (self._reserves or {}).items():
+            for piece_type, count in counts.items():
+                self._reserve_changed(color, piece_type, count, 0)
+        if reserves is None:
+            self._reserves = None
+            return
+        self._reserves = {}
+        for color, counts in reserves.items():
+            self._reserves[color] = _Counts(counts, partial(self._reserve_changed, color))
+            for piece_type, count in counts.items():
+                self._reserve_changed(color, piece_type, 0, count)
+
+    def _reserve_changed(self, color: Color, piece_type: PieceType, old: int, new: int):
+        keys = zobrist.RESERVE_KEYS[color.value][piece_type.value]
+        self._key ^= keys[old] ^ keys[new]
+
+    def _placement_turn_changed(self, color: Color, old: int, new: int):
+        keys = zobrist.PLACEMENT_TURN_KEYS[color.value]
+        self._key ^= keys[old] ^ keys[new]
+
+    def compute_zobrist_key(self) -> int:
+        """Computes the Zobrist key from scratch. Only meant to check the
+        incremental key, which is what everything else should use."""
+        key = 0
+        keys = self.board._keys
+        for square, piece in self.board.iter_pieces():
+            key ^= keys[zobrist.piece_index(piece)][square]
+        if self.current_player_color == Color.BLACK:
+            key ^= zobrist.SIDE_KEY
+        if self.phase == GamePhase.MOVEMENT:
+            key ^= zobrist.MOVEMENT_PHASE_KEY
+        key ^= zobrist.CASTLING_KEYS[self.castling]
+        if self.en_passant_target is not None:
+            key ^= zobrist.EN_PASSANT_KEYS[self.en_passant_target.col]
+        for color, counts in (self.reserves or {}).items():
+            for piece_type, count in counts.items():
+                key ^= zobrist.RESERVE_KEYS[color.value][piece_type.value][count]
+        for color, count in self.placement_turns.items():
+            key ^= zobrist.PLACEMENT_TURN_KEYS[color.value][count]
+        return key
+
     def switch_phase(self):
         """Switches the game phase."""
         if self.phase == GamePhase.PLACEMENT:
             self.phase = GamePhase.MOVEMENT
         else:
             self.phase = GamePhase.PLACEMENT
-    
+
     def switch_player(self):
         """Switches the current player."""
         if self.current_player_color == Color.WHITE:
@@ -56,14 +313,151 @@ class GameState:
         else:
             self.current_player_color = Color.WHITE
 
+    # --- In-place moves ---
+
+    def apply_move(self, from_pos: Position, to_pos: Position,
+                   promotion: PieceType | None = None) -> MoveUndo:
+        """Plays a move on the board without any validation and updates en passant,
+        castling rights and promotion. The current player is not switched.
+        Pawns reaching the last rank promote to ``promotion`` (a queen by default).
+        Returns the record needed by revert_move."""
+        board = self.board
+        size = board.size
+        from_square = from_pos.row * size + from_pos.col
+        to_square = to_pos.row * size + to_pos.col
+        piece = board.piece_at(from_square)
+        color = piece.color
+        undo = MoveUndo(from_square, to_square, piece,
+                        en_passant_target=self.en_passant_target, castling=self.castling)
+
+        if (piece.type == PieceType.PAWN and to_pos == self.en_passant_target
+                and from_pos.col != to_pos.col):
+            # en passant, the captured pawn is beside the moving one
+            undo.captured_square = from_pos.row * size + to_pos.col
+            undo.captured = board.clear(undo.captured_square)
+            board.relocate(from_square, to_square)
+        else:
+            undo.captured_square = to_square
+            undo.captured = board.relocate(from_square, to_square)
+
+        self.en_passant_target = None
+        home_row = size - 1 if color == Color.WHITE else 0
+
+        if piece.type == PieceType.PAWN:
+            if abs(from_pos.row - to_pos.row) == 2:
+                self.en_passant_target = Position.from_index((from_square + to_square) // 2, size)
+            elif to_pos.row == size - 1 - home_row:
+                from .piece import Piece
+                undo.promotion = Piece.create(promotion or PieceType.QUEEN, color)
+                board.put(to_square, undo.promotion)
+
+        elif piece.type == PieceType.KING:
+            bits = CASTLING_BITS[color]
+            self.castling &= ~(bits['kingside'] | bits['queenside'])
+            # castling, move the rook as well
+            if abs(from_pos.col - to_pos.col) == 2:
+                row_start = from_square - from_pos.col
+                if to_pos.col > from_pos.col:
+                    undo.rook_from, undo.rook_to = row_start + size - 1, to_square - 1
+                else:
+                    undo.rook_from, undo.rook_to = row_start, to_square + 1
+                board.relocate(undo.rook_from, undo.rook_to)
+
+        elif piece.type == PieceType.ROOK and from_pos.row == home_row:
+            if from_pos.col == 0:
+                self.castling &= ~CASTLING_BITS[color]['queenside']
+            elif from_pos.col == size - 1:
+                self.castling &= ~CASTLING_BITS[color]['kingside']
+
+        # capturing a rook on its corner takes away that castling right
+        captured = undo.captured
+        if captured is not None and captured.type == PieceType.ROOK:
+            if to_pos.row == (size - 1 if captured.color == Color.WHITE else 0):
+                if to_pos.col == 0:
+                    self.castling &= ~CASTLING_BITS[captured.color]['queenside']
+                elif to_pos.col == size - 1:
+                    self.castling &= ~CASTLING_BITS[captured.color]['kingside']
+
+        return undo
+
+    def apply_drop(self, piece, position: Position) -> MoveUndo:
+        """Places a piece from the current reserves on an empty square without
+        any validation. The current player is not switched."""
+        board = self.board
+        square = position.row * board.size + position.col
+        undo = MoveUndo(-1, square, piece,
+                        en_passant_target=self.en_passant_target, castling=self.castling)
+        board.put(square, piece)
+        self.en_passant_target = None
+        if self.reserves is not None:
+            self.reserves[piece.color][piece.type] -= 1
+        self.placement_turns[piece.color] += 1
+        return undo
+
+    def revert_move(self, undo: MoveUndo):
+        """Takes back a move or placement applied with apply_move / apply_drop."""
+        board = self.board
+        piece = undo.piece
+        board.clear(undo.to_square)
+        if undo.is_drop:
+            if self.reserves is not None:
+                self.reserves[piece.color][piece.type] += 1
+            self.placement_turns[piece.color] -= 1
+        else:
+            if undo.rook_from >= 0:
+                board.relocate(undo.rook_to, undo.rook_from)
+            board.put(undo.from_square, piece)
+            if undo.captured is not None:
+                board.put(undo.captured_square, undo.captured)
+        self.en_passant_target = undo.en_passant_target
+        self.castling = undo.castling
+
+    def make_move(self, from_pos: Position, to_pos: Position,
+                  promotion: PieceType | None = None) -> MoveUndo:
+        """Plays a move in place and passes the turn. Undo with unmake_move."""
+        undo = self.apply_move(from_pos, to_pos, promotion)
+        self.switch_player()
+        self._undo_stack.append(undo)
+        return undo
+
+    def make_drop(self, piece, position: Position) -> MoveUndo:
+        """Places a piece in place and passes the turn. Undo with unmake_drop."""
+        undo = self.apply_drop(piece, position)
+        self.switch_player()
+        self._undo_stack.append(undo)
+        return undo
+
+    def unmake_move(self) -> MoveUndo:
+        """Takes back the last move or placement made."""
+        undo = self._undo_stack.pop()
+        self.switch_player()
+        self.revert_move(undo)
+        return undo
+
+    # both kinds of record share the same stack
+    unmake_drop = unmake_move
+
     def is_checkmate(self) -> bool:
-        # TODO
-        return False
+        """The current player is in check and has no legal move or placement."""
+        from ..services.move_generator import is_checkmate
+        return is_checkmate(self)
 
     def is_stalemate(self) -> bool:
-        # TODO
-        return False
-    
+        """The current player is not in check but has no legal move or placement."""
+        from ..services.move_generator import is_stalemate
+        return is_stalemate(self)
+
+    def play(self, move) -> MoveUndo:
+        """Makes a Move (or placement) from the move generator in place,
+        take it back with unmake_move."""
+        if move.drop is not None:
+            from .piece import Piece
+            return self.make_drop(Piece.create(move.drop, self.current_player_color), move.to_pos)
+        return self.make_move(move.from_pos, move.to_pos, move.promotion)
+
     def add_move_to_history(self, move):
-        """Adds a move to the history."""
-        # TODO
+        """Adds a move to the history, before it is applied. The position
+        before the first move recorded is kept as the start of the game."""
+        if self.initial_fen is None:
+            self.initial_fen = self.to_fen()
+        self.move_history.append(move)
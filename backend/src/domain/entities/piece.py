@@ -1,25 +1,60 @@
 from abc import ABC, abstractmethod
-from ..value_objects.piece_type import PieceType, Color
-from ..services.validators import is_square_attacked_by
+from ..value_objects.piece_type import PieceType, Color, piece_code
+from ..services.attacks import is_attacked
 from ..value_objects.position import Position
-from ..entities.board import Board
+from ..value_objects.geometry import geometry
+from ..entities.board import Board, PIECES_BY_CODE
 from ..entities.game_state import GameState
 
 
 class Piece(ABC):
-    """Represents a chess piece."""
+    """Represents a chess piece.
+
+    Pieces carry no per-instance state, so there is a single shared instance
+    per (type, color): ``Pawn(Color.WHITE)`` and ``Piece.create`` always return
+    the same immutable object. Each one has a small integer code (what the
+    board stores), its unicode glyph and the move deltas of its type.
+    """
+
+    __slots__ = ("type", "color", "code", "glyph", "deltas")
+
+    TYPE: PieceType
+    # (row, col) steps of the piece, directions for sliding pieces
+    DELTAS: tuple[tuple[int, int], ...] = ()
+
+    def __new__(cls, color: Color):
+        piece = PIECES_BY_CODE[piece_code(cls.TYPE, color)]
+        if piece is None:
+            piece = object.__new__(cls)
+            code = piece_code(cls.TYPE, color)
+            object.__setattr__(piece, "type", cls.TYPE)
+            object.__setattr__(piece, "color", color)
+            object.__setattr__(piece, "code", code)
+            # assuming the background is black... so white pieces are actually black
+            object.__setattr__(piece, "glyph", "♙♘♗♖♕♔♟♞♝♜♛♚"[cls.TYPE.value + (6 if color == Color.WHITE else 0)])
+            object.__setattr__(piece, "deltas", cls._deltas(color))
+            PIECES_BY_CODE[code] = piece
+        return piece
 
-    def __init__(self, piece_type: PieceType, color: Color):
-        self._type = piece_type
-        self._color = color
+    def __init__(self, color: Color):
+        pass
+
+    @classmethod
+    def _deltas(cls, color: Color) -> tuple[tuple[int, int], ...]:
+        return cls.DELTAS
 
-    @property
-    def type(self) -> PieceType:
-        return self._type
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-    @property
-    def color(self) -> Color:
-        return self._color
+    def __reduce__(self):
+        # unpickled pieces come back as the shared instances
+        return (type(self), (self.color,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     @abstractmethod
     def get_possible_moves(
@@ -36,14 +71,16 @@ class Piece(ABC):
         self, position: Position, board: Board, directions: list[tuple[int, int]]
     ) -> list[Position]:
         moves = []
+        size = board.size
+        positions = Position.table(size)
         for dr, dc in directions:
-            for i in range(1, board.size):
+            for i in range(1, size):
                 row, col = position.row + i * dr, position.col + i * dc
-                if not board.is_valid_position(Position(row, col)):
+                if not (0 <= row < size and 0 <= col < size):
                     break
 
-                target_pos = Position(row, col)
-                piece_at_target = board.get_piece(target_pos)
+                target_pos = positions[row * size + col]
+                piece_at_target = board.piece_at(target_pos.index)
 
                 if piece_at_target is None:
                     moves.append(target_pos)
@@ -56,50 +93,51 @@ class Piece(ABC):
     
     @classmethod
     def create(cls, piece_type: PieceType, color: Color) -> 'Piece':
-        """Factory method to create a piece instance based on type and color."""
-        match piece_type:
-            case PieceType.PAWN: return Pawn(color)
-            case PieceType.KNIGHT: return Knight(color)
-            case PieceType.BISHOP: return Bishop(color)
-            case PieceType.ROOK: return Rook(color)
-            case PieceType.QUEEN: return Queen(color)
-            case PieceType.KING: return King(color)
-            case _: raise ValueError("Invalid piece type")
+        """Factory method returning the piece instance of a type and color."""
+        if not isinstance(piece_type, PieceType):
+            raise ValueError("Invalid piece type")
+        return PIECES_BY_CODE[piece_code(piece_type, color)] or _CLASSES[piece_type](color)
+
+    @staticmethod
+    def from_code(code: int) -> 'Piece | None':
+        """Returns the piece of a code, None for the empty code 0."""
+        return PIECES_BY_CODE[code]
 
     def __repr__(self) -> str:
         return f"{self.color.name.capitalize()} {self.type.name.capitalize()}"
 
     def __str__(self):
         """Use the unicode chess character for the piece in the console"""
-
-        chess_set = "♙♘♗♖♕♔♟♞♝♜♛♚"
-        # assuming the background is black... so white pieces are actually black
-        if self.color == Color.WHITE:
-            return chess_set[self.type.value + 6]
-        else:
-            return chess_set[self.type.value]
+        return self.glyph
 
 
 class Pawn(Piece):
-    def __init__(self, color: Color):
-        super().__init__(PieceType.PAWN, color)
+    __slots__ = ()
+    TYPE = PieceType.PAWN
+
+    @classmethod
+    def _deltas(cls, color: Color) -> tuple[tuple[int, int], ...]:
+        # forward step first, then the two captures
+        direction = -1 if color == Color.WHITE else 1
+        return ((direction, 0), (direction, -1), (direction, 1))
 
     def get_possible_moves(
         self, position: Position, game_state: GameState
     ) -> list[Position]:
         moves = []
-        direction = -1 if self.color == Color.WHITE else 1
-        start_row = 6 if self.color == Color.WHITE else 1
+        direction = self.deltas[0][0]
         board = game_state.board
+        rows = geometry(board.size)
+        start_row = rows.pawn_row[self.color.value]
 
         # 1. Forward move
-        one_step = Position(position.row + direction, position.col)
+        one_step = Position(position.row + direction, position.col, board.size)
         if board.is_valid_position(one_step) and board.get_piece(one_step) is None:
             moves.append(one_step)
 
             # 2. Double step from start
             if position.row == start_row:
-                two_steps = Position(position.row + 2 * direction, position.col)
+                two_steps = Position(position.row + 2 * direction, position.col, board.size)
                 if (
                     board.is_valid_position(two_steps)
                     and board.get_piece(two_steps) is None
@@ -108,7 +146,7 @@ class Pawn(Piece):
 
         # 3. Captures
         for dc in [-1, 1]:
-            capture_pos = Position(position.row + direction, position.col + dc)
+            capture_pos = Position(position.row + direction, position.col + dc, board.size)
             if board.is_valid_position(capture_pos):
                 target_piece = board.get_piece(capture_pos)
                 if target_piece and target_piece.color != self.color:
@@ -117,10 +155,9 @@ class Pawn(Piece):
         # 4. En passant
         # TODO if this becomes a problem, offload en passant logic to a validator and just read from the game state here
         if game_state.en_passant_target:
-            # The capturing pawn must be on the 5th rank for White or 4th for Black
-            correct_rank = (self.color == Color.WHITE and position.row == 3) or (
-                self.color == Color.BLACK and position.row == 4
-            )
+            # The capturing pawn must be two rows past the enemy pawns' start
+            # (the 5th rank for White or 4th for Black on 8x8)
+            correct_rank = position.row == rows.en_passant_row[self.color.value]
 
             if correct_rank:
                 # The target square must be diagonal to the current pawn's file
@@ -141,27 +178,18 @@ class Pawn(Piece):
 
 
 class Knight(Piece):
-    def __init__(self, color: Color):
-        super().__init__(PieceType.KNIGHT, color)
+    __slots__ = ()
+    TYPE = PieceType.KNIGHT
+    DELTAS = ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1))
 
     def get_possible_moves(
         self, position: Position, game_state: GameState
     ) -> list[Position]:
         moves = []
-        deltas = [
-            (1, 2),
-            (1, -2),
-            (-1, 2),
-            (-1, -2),
-            (2, 1),
-            (2, -1),
-            (-2, 1),
-            (-2, -1),
-        ]
         board = game_state.board
 
-        for dr, dc in deltas:
-            target_pos = Position(position.row + dr, position.col + dc)
+        for dr, dc in self.deltas:
+            target_pos = Position(position.row + dr, position.col + dc, board.size)
             if board.is_valid_position(target_pos):
                 target_piece = board.get_piece(target_pos)
                 if target_piece is None or target_piece.color != self.color:
@@ -170,50 +198,45 @@ class Knight(Piece):
 
 
 class Bishop(Piece):
-    def __init__(self, color: Color):
-        super().__init__(PieceType.BISHOP, color)
+    __slots__ = ()
+    TYPE = PieceType.BISHOP
+    DELTAS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
 
     def get_possible_moves(
         self, position: Position, game_state: GameState
     ) -> list[Position]:
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-        return self._get_sliding_moves(position, game_state.board, directions)
+        return self._get_sliding_moves(position, game_state.board, self.deltas)
 
 
 class Rook(Piece):
-    def __init__(self, color: Color):
-        super().__init__(PieceType.ROOK, color)
+    __slots__ = ()
+    TYPE = PieceType.ROOK
+    DELTAS = ((1, 0), (-1, 0), (0, 1), (0, -1))
 
     def get_possible_moves(
         self, position: Position, game_state: GameState
     ) -> list[Position]:
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        return self._get_sliding_moves(position, game_state.board, directions)
+        return self._get_sliding_moves(position, game_state.board, self.deltas)
 
 
 class Queen(Piece):
-    def __init__(self, color: Color):
-        super().__init__(PieceType.QUEEN, color)
+    __slots__ = ()
+    TYPE = PieceType.QUEEN
+    DELTAS = (
+        (1, 0), (-1, 0), (0, 1), (0, -1),  # Rook moves
+        (1, 1), (1, -1), (-1, 1), (-1, -1),  # Bishop moves
+    )
 
     def get_possible_moves(
         self, position: Position, game_state: GameState
     ) -> list[Position]:
-        directions = [
-            (1, 0),
-            (-1, 0),
-            (0, 1),
-            (0, -1),  # Rook moves
-            (1, 1),
-            (1, -1),
-            (-1, 1),
-            (-1, -1),  # Bishop moves
-        ]
-        return self._get_sliding_moves(position, game_state.board, directions)
+        return self._get_sliding_moves(position, game_state.board, self.deltas)
 
 
 class King(Piece):
-    def __init__(self, color: Color):
-        super().__init__(PieceType.KING, color)
+    __slots__ = ()
+    TYPE = PieceType.KING
+    DELTAS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
 
     def get_possible_moves(
         self, position: Position, game_state: GameState, 
@@ -222,20 +245,10 @@ class King(Piece):
         include_castling=True 
     ) -> list[Position]:
         moves = []
-        deltas = [
-            (1, 0),
-            (-1, 0),
-            (0, 1),
-            (0, -1),
-            (1, 1),
-            (1, -1),
-            (-1, 1),
-            (-1, -1),
-        ]
         board = game_state.board
 
-        for dr, dc in deltas:
-            target_pos = Position(position.row + dr, position.col + dc)
+        for dr, dc in self.deltas:
+            target_pos = Position(position.row + dr, position.col + dc, board.size)
             if board.is_valid_position(target_pos):
                 target_piece = board.get_piece(target_pos)
                 if target_piece is None or target_piece.color != self.color:
@@ -249,37 +262,36 @@ class King(Piece):
     def _add_castling_moves(
         self, position: Position, game_state: GameState, moves: list[Position]
     ):
+        board = game_state.board
+        enemy = ~self.color
+        king_square = board.square_index(position)
+        paths = geometry(board.size).castling[self.color.value]
+
+        # Castling starts from the king's home square
+        if king_square != paths["kingside"].king_from:
+            return
+
         # Check if king is in check
-        if is_square_attacked_by(game_state, position, ~self.color):
+        if is_attacked(board, king_square, enemy):
             return
 
-        # Kingside castling
-        if game_state.castling_rights[self.color]["kingside"]:
-            # Check if path is clear
+        rooks = board.pieces_mask(PieceType.ROOK, self.color)
+        rights = game_state.castling_rights[self.color]
+        for side, path in paths.items():
+            # the rook is home, the path is clear and the squares the king
+            # passes through are not attacked
             if (
-                game_state.board.get_piece(Position(position.row, 5)) is None
-                and game_state.board.get_piece(Position(position.row, 6)) is None
+                rights[side]
+                and rooks >> path.rook_from & 1
+                and not board.occupied & path.empty
+                and not any(is_attacked(board, square, enemy) for square in path.passes)
             ):
-                # Check if squares king passes through are not attacked
-                if not is_square_attacked_by(
-                    game_state, Position(position.row, 5), ~self.color
-                ) and not is_square_attacked_by(
-                    game_state, Position(position.row, 6), ~self.color
-                ):
-                    moves.append(Position(position.row, 6))
+                moves.append(Position.from_index(path.king_to, board.size))
 
-        # Queenside castling
-        if game_state.castling_rights[self.color]["queenside"]:
-            # Check if path is clear
-            if (
-                game_state.board.get_piece(Position(position.row, 1)) is None
-                and game_state.board.get_piece(Position(position.row, 2)) is None
-                and game_state.board.get_piece(Position(position.row, 3)) is None
-            ):
-                # Check if squares king passes through are not attacked
-                if not is_square_attacked_by(
-                    game_state, Position(position.row, 2), ~self.color
-                ) and not is_square_attacked_by(
-                    game_state, Position(position.row, 3), ~self.color
-                ):
-                    moves.append(Position(position.row, 2))
+
+_CLASSES = {piece_class.TYPE: piece_class for piece_class in (Pawn, Knight, Bishop, Rook, Queen, King)}
+
+# build the twelve shared instances up front
+for _piece_class in _CLASSES.values():
+    for _color in Color:
+        _piece_class(_color)
@@ -0,0 +1,54 @@
+"""Zobrist keys.
+
+Every feature of a position (a piece on a square, the side to move, the
+castling rights, ...) gets a random 64-bit key, and the hash of a position is
+the XOR of the keys of its features. Changing one feature is then a single
+XOR, no matter how big the position is.
+
+The keys come from a fixed seed, so hashes are stable across processes.
+"""
+
+import random
+from functools import lru_cache
+
+from ..value_objects.piece_type import Color, PieceType
+
+SEED = 0x60C4E55
+# upper bound (exclusive) of the reserve and placement turn counters
+MAX_COUNT = 256
+# largest board side supported by the en passant keys
+MAX_SIZE = 16
+
+_rng = random.Random(SEED)
+
+
+def _key() -> int:
+    return _rng.getrandbits(64)
+
+
+SIDE_KEY = _key()  # XORed in when black is to move
+MOVEMENT_PHASE_KEY = _key()  # XORed in during the movement phase
+CASTLING_KEYS = [_key() for _ in range(16)]  # indexed by the castling bits
+EN_PASSANT_KEYS = [_key() for _ in range(MAX_SIZE)]  # indexed by file
+# indexed by [color.value][piece_type.value][count], a count of 0 has no key
+# so that a missing entry and an explicit 0 hash the same
+RESERVE_KEYS = [
+    [[0] + [_key() for _ in range(MAX_COUNT - 1)] for _ in PieceType] for _ in Color
+]
+# indexed by [color.value][count]
+PLACEMENT_TURN_KEYS = [[0] + [_key() for _ in range(MAX_COUNT - 1)] for _ in Color]
+
+
+def piece_index(piece) -> int:
+    """Index of a piece in the piece-square tables (its code minus one)."""
+    return piece.code - 1
+
+
+@lru_cache(maxsize=None)
+def piece_square_keys(size: int) -> tuple[tuple[int, ...], ...]:
+    """Keys of every piece on every square, indexed by [piece_code][square]."""
+    rng = random.Random(SEED + size)
+    return tuple(
+        tuple(rng.getrandbits(64) for _ in range(size * size))
+        for _ in range(len(Color) * len(PieceType))
+    )
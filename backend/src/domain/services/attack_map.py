@@ -0,0 +1,195 @@
+"""Incrementally maintained attack maps.
+
+An AttackMap keeps, for each color, the number of its pieces attacking every
+square and the mask of the squares it attacks, so that "is this square
+attacked?" (check, castling transit squares, king placements) is a mask
+lookup instead of a scan for attackers.
+
+The map follows its board by diffing the board's piece bitboards against the
+ones it last saw, on the first query after a change. Only the pieces on the
+squares that changed are recomputed, along with the sliders whose attacks
+reached one of those squares (their rays got cut or extended). Leapers never
+depend on the occupancy. A move taken back before the next query costs
+nothing, which fits search's make/unmake pattern, and pieces put on the board
+directly (free setup) are picked up like moves.
+
+Enable it with GameState.track_attacks(); Board.attack_map holds it and
+attacks.is_attacked answers from it when it is there.
+"""
+
+from ..entities.board import Board
+from ..value_objects.bitboard import iter_squares
+from ..value_objects.piece_type import Color, PieceType
+from .attacks import attack_tables
+
+_PAWN = PieceType.PAWN.value
+_KNIGHT = PieceType.KNIGHT.value
+_BISHOP = PieceType.BISHOP.value
+_ROOK = PieceType.ROOK.value
+_QUEEN = PieceType.QUEEN.value
+_SLIDERS = (_BISHOP, _ROOK, _QUEEN)
+
+
+class AttackMap:
+    """Attacked squares and attacker counts per color of a board."""
+
+    def __init__(self, board: Board):
+        self.board = board
+        self._tables = attack_tables(board.size)
+        self.refresh()
+
+    def refresh(self):
+        """Rebuilds the whole map from the board."""
+        board = self.board
+        n = board.num_squares
+        # squares attacked by the piece on each square, and its color (-1 when empty)
+        self._from = [0] * n
+        self._owner = [-1] * n
+        self._counts = ([0] * n, [0] * n)
+        self._attacked = [0, 0]
+        self._sliders = 0
+        self._seen = [[0] * len(PieceType) for _ in Color]
+        self._zobrist = None
+        self._sync()
+
+    # --- Queries ---
+
+    def is_attacked(self, square: int, color: Color) -> bool:
+        """Checks if any piece of color attacks the square."""
+        self._sync()
+        return bool(self._attacked[color.value] >> square & 1)
+
+    def attacked(self, color: Color) -> int:
+        """The mask of the squares attacked by color."""
+        self._sync()
+        return self._attacked[color.value]
+
+    def attacker_count(self, square: int, color: Color) -> int:
+        """How many pieces of color attack the square."""
+        self._sync()
+        return self._counts[color.value][square]
+
+    # --- Updates ---
+
+    def _sync(self):
+        board = self.board
+        if board.zobrist == self._zobrist:
+            return
+        pieces = board._pieces
+        seen = self._seen
+        changed = 0
+        for color in (0, 1):
+            for mine, theirs in zip(seen[color], pieces[color]):
+                changed |= mine ^ theirs
+        if changed:
+            # sliders whose attacks reached a changed square see further or less far now
+            touched = changed
+            origins = self._from
+            for square in iter_squares(self._sliders & ~changed):
+                if origins[square] & changed:
+                    touched |= 1 << square
+            occupied = board.occupied
+            codes = board._squares
+            for square in iter_squares(touched):
+                self._recompute(square, codes[square], occupied)
+            self._seen = [list(masks) for masks in pieces]
+        self._zobrist = board.zobrist
+
+    def _recompute(self, square: int, code: int, occupied: int):
+        tables = self._tables
+        if code:
+            color, piece_type = divmod(code - 1, len(PieceType))
+            if piece_type == _PAWN:
+                new = tables.pawn[color][square]
+            elif piece_type == _KNIGHT:
+                new = tables.knight[square]
+            elif piece_type == _BISHOP:
+                new = tables.bishop_attacks(square, occupied)
+            elif piece_type == _ROOK:
+                new = tables.rook_attacks(square, occupied)
+            elif piece_type == _QUEEN:
+                new = tables.queen_attacks(square, occupied)
+            else:
+                new = tables.king[square]
+            if piece_type in _SLIDERS:
+                self._sliders |= 1 << square
+            else:
+                self._sliders &= ~(1 << square)
+        else:
+            color, new = -1, 0
+            self._sliders &= ~(1 << square)
+
+        old, old_color = self._from[square], self._owner[square]
+        if old_color == color:
+            if old == new:
+                return
+            lost, gained = old & ~new, new & ~old
+        else:
+            lost, gained = old, new
+        if lost:
+            self._remove(old_color, lost)
+        if gained:
+            self._add(color, gained)
+        self._from[square] = new
+        self._owner[square] = color
+
+    def _add(self, color: int, mask: int):
+        counts = self._counts[color]
+        attacked = self._attacked[color]
+        for square in iter_squares(mask):
+            counts[square] += 1
+        self._attacked[color] = attacked | mask
+
+    def _remove(self, color: int, mask: int):
+        counts = self._counts[color]
+        attacked = self._attacked[color]
+        for square in iter_squares(mask):
+            counts[square] -= 1
+            if not counts[square]:
+                attacked &= ~(1 << square)
+        self._attacked[color] = attacked
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from ..entities.game_state import GameState
+    from .attacks import is_attacked
+    from .move_generator import legal_moves
+
+    rng = random.Random(0)
+    state = GameState.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0")
+    lines = []
+    for _ in range(200):
+        line = []
+        for _ in range(6):
+            moves = legal_moves(state)
+            if not moves:
+                break
+            line.append(rng.choice(moves))
+            state.play(line[-1])
+        for _ in line:
+            state.unmake_move()
+        lines.append(line)
+
+    def bench(name):
+        # plays every line, asking after each move which squares around both kings are attacked
+        board = state.board
+        king_moves = attack_tables(board.size).king
+        begin = time.perf_counter()
+        queries = 0
+        for line in lines:
+            for move in line:
+                state.play(move)
+                for color in Color:
+                    for square in iter_squares(king_moves[board.king_square(color)]):
+                        is_attacked(board, square, ~color)
+                        queries += 1
+            for _ in line:
+                state.unmake_move()
+        print(f"{name:>12}: {queries / (time.perf_counter() - begin):12,.0f} queries/s")
+
+    bench("from scratch")
+    state.track_attacks()
+    bench("attack map")
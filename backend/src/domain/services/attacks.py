@@ -0,0 +1,194 @@
+"""Precomputed attack tables and bitboard attack queries.
+
+Tables are built once per board size and cached. Leaper attacks (knight, king,
+pawn) are a single table lookup; sliding attacks walk the precomputed ray of
+each direction and cut it at the first blocker.
+"""
+
+from functools import lru_cache
+
+from ..entities.board import Board
+from ..value_objects.piece_type import Color, PieceType
+
+
+# (row delta, col delta) for every ray direction, indexed by direction number
+DIRECTIONS: tuple[tuple[int, int], ...] = (
+    (-1, 0),  # 0: north
+    (1, 0),  # 1: south
+    (0, 1),  # 2: east
+    (0, -1),  # 3: west
+    (-1, 1),  # 4: north-east
+    (-1, -1),  # 5: north-west
+    (1, 1),  # 6: south-east
+    (1, -1),  # 7: south-west
+)
+ROOK_DIRECTIONS = (0, 1, 2, 3)
+BISHOP_DIRECTIONS = (4, 5, 6, 7)
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+KNIGHT_DELTAS = ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1))
+KING_DELTAS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class AttackTables:
+    """Attack masks for every square of a board of the given size."""
+
+    def __init__(self, size: int):
+        self.size = size
+        n = size * size
+        self.knight: list[int] = [self._leaper(sq, KNIGHT_DELTAS) for sq in range(n)]
+        self.king: list[int] = [self._leaper(sq, KING_DELTAS) for sq in range(n)]
+        # squares attacked by a pawn of each color, indexed by [color.value][square]
+        self.pawn: tuple[list[int], list[int]] = (
+            [self._leaper(sq, ((-1, -1), (-1, 1))) for sq in range(n)],
+            [self._leaper(sq, ((1, -1), (1, 1))) for sq in range(n)],
+        )
+        # rays[direction][square] is the empty-board ray leaving the square
+        self.rays: list[list[int]] = [
+            [self._ray(sq, dr, dc) for sq in range(n)] for dr, dc in DIRECTIONS
+        ]
+        # a direction is "positive" when walking it increases the square index,
+        # the first blocker is then the lowest bit of the ray, else the highest
+        self.positive: tuple[bool, ...] = tuple(
+            dr * size + dc > 0 for dr, dc in DIRECTIONS
+        )
+        # line through two squares and the squares strictly between them,
+        # filled lazily by between()
+        self._between: dict[tuple[int, int], int] = {}
+
+    def _leaper(self, square: int, deltas) -> int:
+        row, col = divmod(square, self.size)
+        mask = 0
+        for dr, dc in deltas:
+            r, c = row + dr, col + dc
+            if 0 <= r < self.size and 0 <= c < self.size:
+                mask |= 1 << (r * self.size + c)
+        return mask
+
+    def _ray(self, square: int, dr: int, dc: int) -> int:
+        row, col = divmod(square, self.size)
+        mask = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < self.size and 0 <= c < self.size:
+            mask |= 1 << (r * self.size + c)
+            r, c = r + dr, c + dc
+        return mask
+
+    def ray_attacks(self, direction: int, square: int, occupied: int) -> int:
+        """Squares reached from square along one direction, up to and
+        including the first occupied square."""
+        ray = self.rays[direction][square]
+        blockers = ray & occupied
+        if blockers:
+            if self.positive[direction]:
+                first = (blockers & -blockers).bit_length() - 1
+            else:
+                first = blockers.bit_length() - 1
+            ray ^= self.rays[direction][first]
+        return ray
+
+    def sliding_attacks(self, square: int, occupied: int, directions) -> int:
+        attacks = 0
+        rays = self.rays
+        positive = self.positive
+        for d in directions:
+            ray = rays[d][square]
+            blockers = ray & occupied
+            if blockers:
+                if positive[d]:
+                    first = (blockers & -blockers).bit_length() - 1
+                else:
+                    first = blockers.bit_length() - 1
+                ray ^= rays[d][first]
+            attacks |= ray
+        return attacks
+
+    def rook_attacks(self, square: int, occupied: int) -> int:
+        return self.sliding_attacks(square, occupied, ROOK_DIRECTIONS)
+
+    def bishop_attacks(self, square: int, occupied: int) -> int:
+        return self.sliding_attacks(square, occupied, BISHOP_DIRECTIONS)
+
+    def queen_attacks(self, square: int, occupied: int) -> int:
+        return self.sliding_attacks(square, occupied, QUEEN_DIRECTIONS)
+
+    def between(self, a: int, b: int) -> int:
+        """Squares strictly between a and b if they share a line, else 0."""
+        key = (a, b)
+        mask = self._between.get(key)
+        if mask is None:
+            mask = 0
+            for d in QUEEN_DIRECTIONS:
+                if self.rays[d][a] >> b & 1:
+                    mask = self.rays[d][a] & ~self.rays[d][b] & ~(1 << b)
+                    break
+            self._between[key] = mask
+        return mask
+
+
+@lru_cache(maxsize=None)
+def attack_tables(size: int = 8) -> AttackTables:
+    """Returns the (shared) attack tables for a board size."""
+    return AttackTables(size)
+
+
+def attackers_to(board: Board, square: int, attacker_color: Color, occupied: int | None = None) -> int:
+    """Returns the mask of attacker_color pieces attacking square.
+
+    The lookup works backwards from the target: a piece of type X attacks the
+    square exactly when an X placed on the square would attack it.
+    An alternative occupancy can be given to look through pieces that are
+    about to move.
+    """
+    tables = attack_tables(board.size)
+    if occupied is None:
+        occupied = board.occupied
+    pieces = board._pieces[attacker_color.value]
+
+    attackers = (
+        tables.knight[square] & pieces[PieceType.KNIGHT.value]
+        | tables.king[square] & pieces[PieceType.KING.value]
+        # a pawn of the attacker color attacks the square when a defender pawn
+        # on the square would attack the attacker pawn
+        | tables.pawn[1 - attacker_color.value][square] & pieces[PieceType.PAWN.value]
+    )
+    queens = pieces[PieceType.QUEEN.value]
+    rooks = pieces[PieceType.ROOK.value] | queens
+    if rooks:
+        attackers |= tables.rook_attacks(square, occupied) & rooks
+    bishops = pieces[PieceType.BISHOP.value] | queens
+    if bishops:
+        attackers |= tables.bishop_attacks(square, occupied) & bishops
+    return attackers
+
+
+def is_attacked(board: Board, square: int, attacker_color: Color) -> bool:
+    """Checks if a square index is attacked by any piece of attacker_color."""
+    if board.attack_map is not None:
+        return board.attack_map.is_attacked(square, attacker_color)
+    tables = attack_tables(board.size)
+    pieces = board._pieces[attacker_color.value]
+
+    # cheap leaper lookups first
+    if tables.knight[square] & pieces[PieceType.KNIGHT.value]:
+        return True
+    if tables.pawn[1 - attacker_color.value][square] & pieces[PieceType.PAWN.value]:
+        return True
+    if tables.king[square] & pieces[PieceType.KING.value]:
+        return True
+
+    occupied = board.occupied
+    queens = pieces[PieceType.QUEEN.value]
+    rooks = pieces[PieceType.ROOK.value] | queens
+    if rooks and tables.rook_attacks(square, occupied) & rooks:
+        return True
+    bishops = pieces[PieceType.BISHOP.value] | queens
+    if bishops and tables.bishop_attacks(square, occupied) & bishops:
+        return True
+    return False
+
+
+if __name__ == "__main__":
+    tables = attack_tables(8)
+    print(bin(tables.knight[0]))  # b6 and c7 from a8
+    print(bin(tables.rook_attacks(0, 0)).count("1"))  # Output: 14
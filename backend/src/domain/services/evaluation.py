@@ -0,0 +1,272 @@
+"""Static evaluation of GoChess positions.
+
+Scores are in centipawns from the point of view of the side to move. The
+evaluation is kept simple and cheap, since the search calls it at every leaf.
+It has four terms:
+
+- material on the board,
+- position: a small bonus for minor pieces and pawns close to the center,
+- mobility: a bonus for the squares a piece would reach on an empty board,
+  a stand-in for its real mobility that only depends on its square,
+- in hand: pieces still in reserve, at a share of their value (GoChess).
+
+Every term is a sum over pieces of a per (piece, square) value, so a move
+changes it by a few table lookups. evaluate() sums the whole board;
+IncrementalEvaluator keeps the terms as running sums, updated with the delta
+of every move and placement and restored on unmake. Weights come from the
+variant's config (GameConfigStandard.evaluation), see EvaluationWeights.
+
+Run ``python -m src.domain.services.evaluation`` from ``backend`` for a
+benchmark of both.
+"""
+
+from functools import lru_cache
+
+from ..entities.game_state import GameState, MoveUndo
+from ..value_objects.game_config import EvaluationWeights, DEFAULT_WEIGHTS
+from ..value_objects.piece_type import Color, PieceType, piece_code
+from ..value_objects.bitboard import iter_squares
+from .attacks import attack_tables
+
+PIECE_VALUES: dict[PieceType, int] = {
+    piece_type: DEFAULT_WEIGHTS.piece_values[piece_type.value] for piece_type in PieceType
+}
+
+# pieces in hand can still be placed anywhere, but are not playing yet
+RESERVE_PERCENT = DEFAULT_WEIGHTS.reserve_percent
+
+# centipawns per step closer to the center, per piece type
+CENTER_BONUS: dict[PieceType, int] = {
+    piece_type: DEFAULT_WEIGHTS.center_bonus[piece_type.value] for piece_type in PieceType
+}
+
+_CODES = [(code, color, piece_type) for color in Color for piece_type in PieceType
+          for code in (piece_code(piece_type, color),)]
+
+
+def weights_of(state: GameState) -> EvaluationWeights:
+    """The evaluation weights of the state's variant."""
+    config = state.config
+    if config is not None and config.evaluation is not None:
+        return config.evaluation
+    return DEFAULT_WEIGHTS
+
+
+@lru_cache(maxsize=None)
+def center_table(size: int) -> tuple[int, ...]:
+    """Steps from the edge towards the center of every square, 0 on the edges."""
+    last = size - 1
+    return tuple(
+        min(sq // size, last - sq // size, sq % size, last - sq % size)
+        for sq in range(size * size)
+    )
+
+
+@lru_cache(maxsize=None)
+def reach_table(size: int, piece_type: PieceType, color: Color) -> tuple[int, ...]:
+    """Squares a piece would attack from every square of an empty board."""
+    tables = attack_tables(size)
+    squares = range(size * size)
+    if piece_type == PieceType.PAWN:
+        masks = (tables.pawn[color.value][sq] for sq in squares)
+    elif piece_type == PieceType.KNIGHT:
+        masks = (tables.knight[sq] for sq in squares)
+    elif piece_type == PieceType.BISHOP:
+        masks = (tables.bishop_attacks(sq, 0) for sq in squares)
+    elif piece_type == PieceType.ROOK:
+        masks = (tables.rook_attacks(sq, 0) for sq in squares)
+    elif piece_type == PieceType.QUEEN:
+        masks = (tables.queen_attacks(sq, 0) for sq in squares)
+    else:
+        masks = (tables.king[sq] for sq in squares)
+    return tuple(mask.bit_count() for mask in masks)
+
+
+@lru_cache(maxsize=None)
+def term_tables(size: int, weights: EvaluationWeights = DEFAULT_WEIGHTS) -> tuple:
+    """The material, position and mobility tables, each indexed by
+    [piece_code][square], from white's point of view (negative for black
+    pieces). Code 0, the empty square, scores 0 everywhere."""
+    center = center_table(size)
+    empty = (0,) * (size * size)
+    material, position, mobility = [empty], [empty], [empty]
+    for _, color, piece_type in _CODES:
+        sign = 1 if color == Color.WHITE else -1
+        kind = piece_type.value
+        material.append((sign * weights.piece_values[kind],) * (size * size))
+        position.append(tuple(sign * weights.center_bonus[kind] * steps for steps in center))
+        mobility.append(tuple(sign * weights.mobility[kind] * reach
+                              for reach in reach_table(size, piece_type, color)))
+    return tuple(material), tuple(position), tuple(mobility)
+
+
+@lru_cache(maxsize=None)
+def piece_square_table(size: int, weights: EvaluationWeights = DEFAULT_WEIGHTS) -> tuple[tuple[int, ...], ...]:
+    """Score of every piece on every square from white's point of view
+    (negative for black pieces), indexed by [piece_code][square]: the board
+    terms summed."""
+    return tuple(
+        tuple(map(sum, zip(*per_square)))
+        for per_square in zip(*term_tables(size, weights))
+    )
+
+
+@lru_cache(maxsize=None)
+def hand_values(weights: EvaluationWeights = DEFAULT_WEIGHTS) -> tuple[int, ...]:
+    """Value of a piece in hand, from white's point of view, by piece code."""
+    values = [0]
+    for _, color, piece_type in _CODES:
+        sign = 1 if color == Color.WHITE else -1
+        values.append(sign * (weights.piece_values[piece_type.value] * weights.reserve_percent // 100))
+    return tuple(values)
+
+
+def _in_hand(state: GameState, hand: tuple[int, ...]) -> int:
+    score = 0
+    if state.reserves is not None:
+        for color, counts in state.reserves.items():
+            for piece_type, count in counts.items():
+                if count:
+                    score += hand[piece_code(piece_type, color)] * count
+    return score
+
+
+def evaluate(state: GameState, weights: EvaluationWeights | None = None) -> int:
+    """Scores the position for the side to move, from scratch."""
+    weights = weights or weights_of(state)
+    board = state.board
+    table = piece_square_table(board.size, weights)
+    squares = board._squares
+    score = sum(table[squares[sq]][sq] for sq in iter_squares(board.occupied))
+    score += _in_hand(state, hand_values(weights))
+    return score if state.current_player_color == Color.WHITE else -score
+
+
+class IncrementalEvaluator:
+    """The evaluation terms of a state, kept as running sums.
+
+    Call push() with the undo record of every move or placement made on the
+    state, and pop() after taking it back; score() is then a sum of four
+    numbers. reset() recomputes the terms, after changes made without
+    pushing them."""
+
+    def __init__(self, state: GameState, weights: EvaluationWeights | None = None):
+        self.state = state
+        self.weights = weights or weights_of(state)
+        self._material, self._position, self._mobility = term_tables(state.board.size, self.weights)
+        self._hand = hand_values(self.weights)
+        self.reset()
+
+    def reset(self):
+        board = self.state.board
+        squares = board._squares
+        occupied = list(iter_squares(board.occupied))
+        self.material = sum(self._material[squares[sq]][sq] for sq in occupied)
+        self.position = sum(self._position[squares[sq]][sq] for sq in occupied)
+        self.mobility = sum(self._mobility[squares[sq]][sq] for sq in occupied)
+        self.in_hand = _in_hand(self.state, self._hand)
+        self._deltas: list[tuple[int, int, int, int]] = []
+
+    @property
+    def total(self) -> int:
+        """The evaluation from white's point of view."""
+        return self.material + self.position + self.mobility + self.in_hand
+
+    def score(self) -> int:
+        """Scores the position for the side to move, like evaluate()."""
+        total = self.material + self.position + self.mobility + self.in_hand
+        return total if self.state.current_player_color == Color.WHITE else -total
+
+    def terms(self) -> dict[str, int]:
+        """The terms from white's point of view."""
+        return {"material": self.material, "position": self.position,
+                "mobility": self.mobility, "in_hand": self.in_hand}
+
+    def push(self, undo: MoveUndo):
+        """Accounts for a move or placement just made."""
+        delta = self._delta(undo)
+        self.material += delta[0]
+        self.position += delta[1]
+        self.mobility += delta[2]
+        self.in_hand += delta[3]
+        self._deltas.append(delta)
+
+    def pop(self):
+        """Takes back the last move or placement pushed."""
+        delta = self._deltas.pop()
+        self.material -= delta[0]
+        self.position -= delta[1]
+        self.mobility -= delta[2]
+        self.in_hand -= delta[3]
+
+    def _delta(self, undo: MoveUndo) -> tuple[int, int, int, int]:
+        material, position, mobility = self._material, self._position, self._mobility
+        code = undo.piece.code
+        to = undo.to_square
+        if undo.is_drop:
+            return material[code][to], position[code][to], mobility[code][to], -self._hand[code]
+
+        origin = undo.from_square
+        landed = undo.promotion.code if undo.promotion is not None else code
+        d_material = material[landed][to] - material[code][origin]
+        d_position = position[landed][to] - position[code][origin]
+        d_mobility = mobility[landed][to] - mobility[code][origin]
+        if undo.captured is not None:
+            captured, square = undo.captured.code, undo.captured_square
+            d_material -= material[captured][square]
+            d_position -= position[captured][square]
+            d_mobility -= mobility[captured][square]
+        if undo.rook_from >= 0:
+            rook = piece_code(PieceType.ROOK, undo.piece.color)
+            d_position += position[rook][undo.rook_to] - position[rook][undo.rook_from]
+            d_mobility += mobility[rook][undo.rook_to] - mobility[rook][undo.rook_from]
+        return d_material, d_position, d_mobility, 0
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from .move_generator import legal_moves
+
+    positions = {
+        "kiwipete": "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0",
+        "reserves": "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P QR2NP3/qr2np3 0/0",
+    }
+    rng = random.Random(0)
+    for name, fen in positions.items():
+        state = GameState.from_fen(fen)
+        lines = []
+        for _ in range(300):
+            line = []
+            for _ in range(8):
+                moves = legal_moves(state)
+                if not moves:
+                    break
+                line.append(rng.choice(moves))
+                state.play(line[-1])
+            for _ in line:
+                state.unmake_move()
+            lines.append(line)
+        nodes = sum(map(len, lines))
+
+        def walk(on_make, on_unmake, score):
+            # plays every line, scoring each node, then takes it back
+            begin = time.perf_counter()
+            scores = []
+            for line in lines:
+                for move in line:
+                    on_make(state.play(move))
+                    scores.append(score())
+                for _ in line:
+                    state.unmake_move()
+                    on_unmake()
+            return scores, time.perf_counter() - begin
+
+        baseline, moves_only = walk(lambda undo: None, lambda: None, lambda: 0)
+        full, full_time = walk(lambda undo: None, lambda: None, lambda: evaluate(state))
+        evaluator = IncrementalEvaluator(state)
+        incremental, incremental_time = walk(evaluator.push, evaluator.pop, evaluator.score)
+        assert incremental == full
+        print(f"{name:>9}: full {(full_time - moves_only) / nodes * 1e6:6.2f} us/node, "
+              f"incremental {(incremental_time - moves_only) / nodes * 1e6:6.2f} us/node")
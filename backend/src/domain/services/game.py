@@ -2,29 +2,60 @@ from src.domain.entities.board import Board
 from src.domain.entities.game_state import GameState
 from src.domain.entities.piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King 
 
-from src.domain.value_objects.piece_type import Color
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.value_objects.game_config import GameConfigStandard
 from src.domain.value_objects.position import Position
+from src.domain.value_objects.game_record import GameRecord
 
 from src.domain.services.go_chess_engine import GoChessEngine
-from src.domain.services.validators import CheckNowValidator
+from src.domain.services.search import SearchLimits
+from src.domain.services.instrumentation import MetricsInstrumentation, MoveEvent
+from src.domain.exceptions.game_error import InvalidMoveError
+
+# letters of the pieces in placement input, e.g. "N@e4"
+_PLACEMENT_LETTERS = {"P": PieceType.PAWN, "N": PieceType.KNIGHT, "B": PieceType.BISHOP,
+                      "R": PieceType.ROOK, "Q": PieceType.QUEEN, "K": PieceType.KING}
+
+
+def _configure(state: GameState, config: GameConfigStandard):
+    """Gives the players the reserves and castling rules of the config."""
+    state.config = config
+    state.reserves = config.initial_reserves()
+    if not config.enable_castling:
+        state.castling = 0
 
 
-        
 class Game:
     """Build a board with game state, pieces, configuration, rules and a GoChessEngine instance."""
 
-    def __init__(self, config):
+    def __init__(self, config, bot_color: Color | None = None, bot_limits: SearchLimits | None = None):
         # TODO use config to set up the game
         board = Board()
         self.state = GameState(board, Color.WHITE)
-
-        # TODO populate validator according to the config
-        self.engine = GoChessEngine(self.state, [
-            # TODO
-            CheckNowValidator()
-        ])
+        self.is_over = False
+        # the computer plays this color, within these search limits
+        self.bot_color = bot_color
+        self.bot_limits = bot_limits or SearchLimits(time_limit=2.0)
+
+        # the console hears about checks through the engine's move events
+        self.events = MetricsInstrumentation()
+        self.events.on(MoveEvent.CHECK, lambda event, data: print(
+            f"Move results in check to {data['checked'].capitalize()}"))
+
+        # the rules come from the config, see validators.compile_pipeline
+        self.engine = GoChessEngine(self.state, [], self.events)
         self._build()
 
+        # with a config, players get their reserves to place during the game
+        if isinstance(config, GameConfigStandard):
+            _configure(self.state, config)
+            # the setup moves above were recorded from a start without the
+            # reserves, the record starts from the configured position instead
+            if self.state.initial_fen is not None:
+                start = GameState.from_fen(self.state.initial_fen)
+                _configure(start, config)
+                self.state.initial_fen = start.to_fen()
+
     def _build(self):
         """Builds the game with initial pieces and configurations."""
 
@@ -140,16 +171,60 @@ class Game:
         # TODO in reality, we would await for input here, managing time, timeouts and so on
         prompt = f"\n{current_color.name.capitalize()}'s turn:"
         print(prompt)
-        from_pos = Position.from_algebraic(input(f"From: "))
-        to_pos = Position.from_algebraic(input(f"To: "))
-        
-        # move the piece
-        moved = self.engine.move_piece(from_pos, to_pos)
+        if current_color == self.bot_color:
+            self._bot_step()
+            self._end_turn(current_color)
+            return
+
+        source = input(f"From (or a placement like N@e4): ")
+        if "@" in source:
+            # place a piece from the reserve
+            letter, square = source.split("@", 1)
+            piece_type = _PLACEMENT_LETTERS.get(letter.strip().upper())
+            if piece_type is None:
+                raise InvalidMoveError(f"Unknown piece to place: {letter}")
+            self.engine.place_piece(Piece.create(piece_type, current_color), Position.from_algebraic(square.strip()))
+        else:
+            from_pos = Position.from_algebraic(source)
+            to_pos = Position.from_algebraic(input(f"To: "))
+
+            # move the piece
+            moved = self.engine.move_piece(from_pos, to_pos)
+        self._end_turn(current_color)
+
+    def _bot_step(self):
+        """Lets the computer search and play its move."""
+        result = self.engine.find_best_move(self.bot_limits)
+        if result.best_move is None:
+            return
+        print(f"{result.best_move} (depth {result.depth}, score {result.score}, "
+              f"{result.nodes} nodes in {result.elapsed:.2f}s)")
+        self.engine.play_move(result.best_move)
+
+    def record(self, headers: dict[str, str] | None = None) -> GameRecord:
+        """The record of the game played so far."""
+        if self.state.winner is not None:
+            result = "1-0" if self.state.winner == Color.WHITE else "0-1"
+        else:
+            result = "1/2-1/2" if self.is_over else "*"
+        fen = self.state.initial_fen or self.state.to_fen()
+        return GameRecord(fen, self.state.move_history[:], result, dict(headers or {}))
+
+    def _end_turn(self, current_color: Color):
+        """Passes the turn and checks the end conditions."""
         # at the end 
         self.state.switch_player()
 
-        # TODO check end conditions, if check then check checkmate
-        # stalemate: no valid moves left for any piece of the current player
+        # check end conditions for the player about to move
+        if self.state.is_checkmate():
+            self.state.winner = current_color
+            self.is_over = True
+            print(self.state.board)
+            print(f"\nCheckmate! {current_color.name.capitalize()} wins.")
+        elif self.state.is_stalemate():
+            self.is_over = True
+            print(self.state.board)
+            print("\nStalemate! The game is a draw.")
 
     
     
\ No newline at end of file
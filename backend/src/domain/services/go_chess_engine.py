@@ -1,133 +1,214 @@
-from ..entities.game_state import GameState
+from time import perf_counter
+
+from ..entities.game_state import GameState, MoveUndo
 from ..value_objects.position import Position
 from ..entities.piece import Piece
 from .validators import *
+from .placement import can_place
+from .search import Searcher, SearchLimits, SearchResult
+from ..value_objects.move import Move
+from ..value_objects.geometry import geometry
 from ..exceptions.game_error import *
 from ..value_objects.piece_type import Color, PieceType
+from .instrumentation import Instrumentation, MoveEvent, Phase, NULL_INSTRUMENTATION
+
+PROMOTION_PIECES = (PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT)
 
 class GoChessEngine:
     """The main engine for the Go-Chess game."""
 
-    def __init__(self, game_state: GameState, validators: list[Validator]):
+    def __init__(self, game_state: GameState, validators: list[Rule],
+                 instrumentation: Instrumentation = NULL_INSTRUMENTATION):
+        # only pipeline rules can run with the variant's rules, anything else
+        # would be silently ignored
+        unsupported = [validator for validator in validators if not isinstance(validator, Rule)]
+        if unsupported:
+            names = ", ".join(type(validator).__name__ for validator in unsupported)
+            raise TypeError(f"Validators must be pipeline rules (validators.Rule), got {names}")
         self._game_state = game_state
-        self._validators = validators
+        # move events, counters and timers, disabled by default
+        self.instrumentation = instrumentation
+        # rules given on top of those of the variant, see validators.compile_pipeline
+        self._extra_rules = list(validators)
+        self._pipelines: dict[tuple, ValidatorPipeline] = {}
+        # created on the first search, keeps its move ordering tables between moves
+        self._searcher: Searcher | None = None
 
     def place_piece(self, piece: Piece, position: Position) -> bool:
         """A placement is an introducion of a new piece on the board.
         If the placement is valid, the board state is updated, therefore
         placing is an atomic operation, it either happens at once or it doesn't.
+
+        When the state doesn't track reserves the placement is a free setup
+        and the piece is put on the board as it is. Otherwise the piece is
+        taken from the current player's reserve, following the placement rules
+        of the config, and the game moves on to the movement phase once
+        neither player can place anymore.
         """
-        # TODO Validation logic will be added here
+        state = self._game_state
+        if state.reserves is None:
+            state.board.place_piece(piece, position)
+            return True
 
-        # after all is good, place the piece
-        # this is the last step ideally
-        self._game_state.board.place_piece(piece, position)
+        self._drop(piece, position)
         return True
 
-    def move_piece(self, from_pos: Position, to_pos: Position) -> bool:
+    def _drop(self, piece: Piece, position: Position) -> MoveUndo:
+        """Validates and plays a placement from the current player's reserve."""
+        state = self._game_state
+        timed = self.instrumentation.enabled
+        if timed:
+            start = perf_counter()
+        context = ValidationContext(state, position, piece=piece, drop=piece.type)
+        self.pipeline(placements=True).validate(context)
+
+        # after all is good, place the piece
+        # this is the last step ideally
+        state.add_move_to_history(Move(None, position, drop=piece.type))
+        if timed:
+            validated = perf_counter()
+            self.instrumentation.time(Phase.VALIDATION, validated - start)
+        undo = state.apply_drop(piece, position)
+        if not can_place(state, Color.WHITE) and not can_place(state, Color.BLACK):
+            state.switch_phase()
+        if timed:
+            self.instrumentation.time(Phase.APPLICATION, perf_counter() - validated)
+            self._report(undo)
+        return undo
+
+    def move_piece(self, from_pos: Position, to_pos: Position,
+                   promotion: PieceType | None = None) -> bool:
         """A movement is a change of position of an existing piece.
         If the movement is valid, the board state is updated, therefore
-        moving is an atomic operation, it either happens at once or it doesn't."""
-
-        # TODO Validation logic will be added here
-        # TODO validators are held in a list, and share the same interface
-        # except for the arguments they take
-        # we can iterate and pass all the arguments, and let them sort it out
-        # or we can modify in some way the interface to accept the game state which has the board 
+        moving is an atomic operation, it either happens at once or it doesn't.
+        A pawn reaching the last rank promotes to promotion, the player is
+        asked for it when it is not given."""
 
         # -------- MUST-HAVE VALIDATIONS BEFORE THE MOVE -----------
 
-        # TODO this should be offloaded to a validator until next "section"
-        piece = self._game_state.board.get_piece(from_pos)
-        print("Piece at pos: ", piece)
-        if not piece:
-            raise InvalidMoveError("No piece at the source position")
-        
-        if piece.color != self._game_state.current_player_color:
-            raise InvalidMoveError("It's not your turn to move this piece")
-    
-        # Check if the move is valid
-        possible_moves = piece.get_possible_moves(from_pos, self._game_state)
-        print("Possible moves: ", [pos.algebraic() for pos in possible_moves])
-        if to_pos not in possible_moves:
-            raise InvalidMoveError("Invalid move for this piece")
-
-        # Validators for check conditions
-        check_next = CheckNextValidator()
-
-        # simulate the move and check if the current player's king would be in check
-        if check_next.validate(self._game_state, from_pos, to_pos, piece.color):
-            raise InvalidMoveError("Move would leave king in check")
-
-        if self._game_state.en_passant_target: # only do this if en passant is possible       
-            if is_en_passant_capture(self._game_state, from_pos, to_pos, piece.color):
-                print(f"En Passant capture detected by {piece} at {to_pos.algebraic()}")
-                
-                # Remove the captured pawn
-                captured_pawn_pos = Position(from_pos.row, to_pos.col)
-                self._game_state.board.remove_piece(captured_pawn_pos)
-                print(f"Captured pawn removed from {captured_pawn_pos.algebraic()}")
-                
-                # Clear en passant target after the capture
-                self._game_state.en_passant_target = None
-
-        # TODO this should be done after everything else... or figure out a good order
-        # after all is good, move the piece
-        self._game_state.board.move_piece(from_pos, to_pos)
-
-        # -------- CHECKS MADE AFTER THE MOVE -----------
-
-        # update en passant target after a two-square pawn move
-        if piece.type == PieceType.PAWN:
-           
-            if abs(from_pos.row - to_pos.row) == 2:
-                direction = -1 if piece.color == Color.WHITE else 1
-                self._game_state.en_passant_target = Position(from_pos.row + direction, from_pos.col)
-            else:
-                self._game_state.en_passant_target = None
-        
-        # update castling rights if a king or rook has moved
-        if piece.type == PieceType.KING:
-            self._game_state.castling_rights[piece.color]['kingside'] = False
-            self._game_state.castling_rights[piece.color]['queenside'] = False
-            # check if the move was a castle, if so move the rook as well
-            if abs(from_pos.col - to_pos.col) == 2:
-                # kingside
-                if to_pos.col > from_pos.col:
-                    rook_from = Position(from_pos.row, 7)
-                    rook_to = Position(from_pos.row, 5)
-                # queenside
-                else:
-                    rook_from = Position(from_pos.row, 0)
-                    rook_to = Position(from_pos.row, 3)
-                self._game_state.board.move_piece(rook_from, rook_to)
-
-        if piece.type == PieceType.ROOK:
-            if from_pos.col == 0 and from_pos.row == (7 if piece.color == Color.WHITE else 0):
-                self._game_state.castling_rights[piece.color]['queenside'] = False
-            elif from_pos.col == 7 and from_pos.row == (7 if piece.color == Color.WHITE else 0):
-                self._game_state.castling_rights[piece.color]['kingside'] = False
-
-        # promotion triggers when a pawn move reaches the last rank
-        if piece.type == PieceType.PAWN:
-            if ((piece.color == Color.WHITE and to_pos.row == 0) 
-                or 
-                (piece.color == Color.BLACK and to_pos.row == 7)):
-                self.handle_promotion(to_pos, self.promotion_prompt)
-
-        # get info and do sanity checks
-        if is_capture(self._game_state, to_pos, piece.color):
-            # Handle capture logic
-            print(f"Capture detected from {piece} at {to_pos.algebraic()}")
+        # the rules of the variant, cheapest first, see validators.ValidatorPipeline
+        state = self._game_state
+        instrumentation = self.instrumentation
+        timed = instrumentation.enabled
+        if timed:
+            start = perf_counter()
+        context = ValidationContext(state, to_pos, from_pos, state.board.get_piece(from_pos))
+        self.pipeline().validate(context)
+        if timed:
+            instrumentation.time(Phase.GENERATION, context.generation_time)
+            instrumentation.time(Phase.VALIDATION, perf_counter() - start - context.generation_time)
+        piece = context.piece
+
+        # promotion triggers when a pawn move reaches the last rank,
+        # ask for the piece before touching the board
+        if (piece.type == PieceType.PAWN
+                and to_pos.row == geometry(state.board.size).promotion_row[piece.color.value]):
+            if promotion is None:
+                promotion = self.promotion_prompt()
+            if promotion not in PROMOTION_PIECES:
+                raise ValueError("Invalid piece type for promotion")
+        else:
+            promotion = None
+
+        # after all is good, move the piece: this updates en passant,
+        # castling rights and the castling rook as well
+        self._game_state.add_move_to_history(Move(from_pos, to_pos, promotion))
+        self._apply(from_pos, to_pos, promotion)
+        return True
+
+    def pipeline(self, placements: bool = False) -> ValidatorPipeline:
+        """The validators of the moves (or placements) of the game's variant,
+        with the rules given to the engine."""
+        config = self._game_state.config
+        if not self._extra_rules:
+            return compile_pipeline(config, placements)
+        key = (variant_of(config), placements)
+        pipeline = self._pipelines.get(key)
+        if pipeline is None:
+            base = compile_pipeline(config, placements)
+            pipeline = self._pipelines[key] = ValidatorPipeline(list(base.rules) + self._extra_rules)
+        return pipeline
+
+    def _apply(self, from_pos: Position, to_pos: Position, promotion: PieceType | None) -> MoveUndo:
+        """Applies a validated move, reporting it to the instrumentation."""
+        instrumentation = self.instrumentation
+        if not instrumentation.enabled:
+            return self._game_state.apply_move(from_pos, to_pos, promotion)
+        start = perf_counter()
+        undo = self._game_state.apply_move(from_pos, to_pos, promotion)
+        instrumentation.time(Phase.APPLICATION, perf_counter() - start)
+        self._report(undo)
+        return undo
+
+    def _report(self, undo: MoveUndo):
+        """Sends the events of a move or placement just applied."""
+        instrumentation = self.instrumentation
+        board = self._game_state.board
+        piece = undo.piece
+        data = {
+            "piece": piece.type.name.lower(),
+            "color": piece.color.name.lower(),
+            "to": board.position_of(undo.to_square).algebraic(),
+        }
+        if undo.is_drop:
+            instrumentation.event(MoveEvent.PLACEMENT, data)
+        else:
+            data["from"] = board.position_of(undo.from_square).algebraic()
+            instrumentation.event(MoveEvent.MOVE_APPLIED, data)
+            if undo.captured is not None:
+                captured = {**data, "captured": undo.captured.type.name.lower(),
+                            "square": board.position_of(undo.captured_square).algebraic()}
+                instrumentation.event(MoveEvent.CAPTURE, captured)
+                if undo.captured_square != undo.to_square:
+                    instrumentation.event(MoveEvent.EN_PASSANT, captured)
+            if undo.rook_from >= 0:
+                instrumentation.event(MoveEvent.CASTLE, {**data, "side": (
+                    "kingside" if undo.rook_from > undo.from_square else "queenside")})
+            if undo.promotion is not None:
+                instrumentation.event(MoveEvent.PROMOTION, {**data, "promotion": undo.promotion.type.name.lower()})
 
         # see if the move gives check to the opposing king AFTER a valid state is reached
-        check_now = CheckNowValidator()
-        print("Checking for check...")
-        if check_now.validate(self._game_state, ~piece.color):
-            print(f"Move results in check to {(~piece.color).name.capitalize()}")
+        if CheckNowValidator().validate(self._game_state, ~piece.color):
+            instrumentation.event(MoveEvent.CHECK, {**data, "checked": (~piece.color).name.lower()})
+
+    def find_best_move(self, limits: SearchLimits | None = None) -> SearchResult:
+        """Searches the best move or placement of the current player within
+        the given time, node and depth limits. The state is left untouched."""
+        if self._searcher is None:
+            self._searcher = Searcher(self._game_state)
+        return self._searcher.search(limits)
+
+    def play_move(self, move: Move) -> MoveUndo:
+        """Plays a move from the move generator or the search, such as the
+        best move found by find_best_move. Those moves are legal already, so
+        only placements are validated, for their reserve and phase
+        bookkeeping. The current player is not switched. Returns the undo
+        record, which tells what the move changed (capture, castling rook,
+        promotion)."""
+        if move.is_drop:
+            piece = Piece.create(move.drop, self._game_state.current_player_color)
+            return self._drop(piece, move.to_pos)
+        self._game_state.add_move_to_history(move)
+        return self._apply(move.from_pos, move.to_pos, move.promotion)
+
+    def make_move(self, from_pos: Position, to_pos: Position,
+                  promotion: PieceType | None = None) -> MoveUndo:
+        """Plays a move in place without validation and passes the turn.
+        Meant for legality tests and search, take it back with unmake_move."""
+        return self._game_state.make_move(from_pos, to_pos, promotion)
+
+    def unmake_move(self) -> MoveUndo:
+        """Takes back the last move made with make_move or make_drop."""
+        return self._game_state.unmake_move()
+
+    def make_drop(self, piece: Piece, position: Position) -> MoveUndo:
+        """Places a piece in place without validation and passes the turn."""
+        return self._game_state.make_drop(piece, position)
+
+    def unmake_drop(self) -> MoveUndo:
+        """Takes back the last placement made with make_drop."""
+        return self._game_state.unmake_drop()
 
-        return True
-    
     # TESTTTTTTT!!!!!!!!!!!!!!!!!!!!
 
     def handle_promotion(self, position: Position, promotion_prompt : callable) -> bool:
@@ -138,7 +219,7 @@ class GoChessEngine:
         
         new_piece_type = promotion_prompt()
 
-        if new_piece_type not in [PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT]:
+        if new_piece_type not in PROMOTION_PIECES:
             raise ValueError("Invalid piece type for promotion")
         
         # Replace the pawn with the new piece
@@ -0,0 +1,156 @@
+"""Instrumentation of the engine: move events, counters and phase timers.
+
+The engine reports to an Instrumentation object. The default one,
+NULL_INSTRUMENTATION, is disabled, and the engine checks ``enabled`` before
+building any event or reading the clock, so an uninstrumented engine pays a
+single attribute test per move.
+
+MetricsInstrumentation counts events, times the phases of a move
+(generation, validation, application) and calls the hooks registered per
+event. JsonLinesExporter writes its metrics, or every event as it happens,
+to a JSON lines file.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, TextIO
+
+
+class MoveEvent(Enum):
+    MOVE_APPLIED = "move_applied"
+    PLACEMENT = "placement"
+    CAPTURE = "capture"
+    EN_PASSANT = "en_passant"
+    CASTLE = "castle"
+    PROMOTION = "promotion"
+    CHECK = "check"
+
+
+class Phase(Enum):
+    GENERATION = "generation"
+    VALIDATION = "validation"
+    APPLICATION = "application"
+
+
+@dataclass
+class PhaseTimer:
+    """Time spent in a phase, in seconds."""
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+Hook = Callable[[MoveEvent, dict], None]
+
+
+class Instrumentation:
+    """Disabled instrumentation, every report is a no-op. Subclasses set
+    enabled and override what they record."""
+
+    enabled = False
+
+    def event(self, event: MoveEvent, data: dict):
+        pass
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def time(self, phase: Phase, seconds: float):
+        pass
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+@dataclass
+class MetricsSnapshot:
+    counters: dict[str, int] = field(default_factory=dict)
+    timers: dict[str, PhaseTimer] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "timers": {
+                name: {"calls": timer.calls, "total": timer.total, "mean": timer.mean, "max": timer.max}
+                for name, timer in self.timers.items()
+            },
+        }
+
+
+class MetricsInstrumentation(Instrumentation):
+    """Counts events, accumulates phase timers and calls the event hooks.
+    Safe to share between the threads serving different games."""
+
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timers: dict[str, PhaseTimer] = defaultdict(PhaseTimer)
+        self._hooks: dict[MoveEvent | None, list[Hook]] = defaultdict(list)
+
+    def on(self, event: MoveEvent | None, hook: Hook):
+        """Calls hook(event, data) on every event of a kind, or on every
+        event when event is None. Hooks run on the thread making the move."""
+        self._hooks[event].append(hook)
+
+    def event(self, event: MoveEvent, data: dict):
+        with self._lock:
+            self._counters[event.value] += 1
+        for hook in self._hooks.get(event, ()):
+            hook(event, data)
+        for hook in self._hooks.get(None, ()):
+            hook(event, data)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def time(self, phase: Phase, seconds: float):
+        with self._lock:
+            timer = self._timers[phase.value]
+            timer.calls += 1
+            timer.total += seconds
+            if seconds > timer.max:
+                timer.max = seconds
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(
+                dict(self._counters),
+                {name: PhaseTimer(timer.calls, timer.total, timer.max) for name, timer in self._timers.items()},
+            )
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+
+class JsonLinesExporter:
+    """Writes metrics snapshots, or events as they happen, as JSON lines."""
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self._lock = threading.Lock()
+
+    def _write(self, record: dict):
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            self.file.write(line + "\n")
+
+    def export(self, metrics: MetricsInstrumentation):
+        """Appends a snapshot of the metrics."""
+        self._write({"time": time.time(), "type": "metrics", **metrics.snapshot().as_dict()})
+
+    def write_event(self, event: MoveEvent, data: dict):
+        """A hook writing every event, register it with metrics.on(None, ...)."""
+        self._write({"time": time.time(), "type": "event", "event": event.value, **data})
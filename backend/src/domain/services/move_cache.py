@@ -0,0 +1,177 @@
+"""Bounded LRU cache of the legal moves of positions.
+
+Interactive clients ask for the legal moves of a piece on every hover or
+click, far more often than moves are played. The cache generates the full
+set of legal moves and placements of a position once and answers the
+per-square questions (where can this piece go, where can a knight be
+placed) from it.
+
+Entries are keyed by the position's Zobrist key, which covers the pieces,
+side to move, castling, en passant, phase, reserves and placement turns,
+along with the board size and the config rules that shape placements. A
+state that changes gets a different key, so there is nothing to invalidate
+by hand: stale entries are never looked up again and age out of the LRU.
+
+The cache is safe to share between threads; generation runs outside of its
+lock, so two threads missing on the same position may both generate it.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from ..entities.game_state import GameState
+from ..value_objects.move import Move
+from ..value_objects.position import Position
+from ..value_objects.piece_type import PieceType
+from .move_generator import legal_moves
+
+DEFAULT_CAPACITY = 4096
+
+
+@dataclass
+class MoveCacheStats:
+    """Counters of the cache usage since the last clear."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hit_rate}
+
+
+class PositionMoves:
+    """The legal moves and placements of a position, grouped by source
+    square and by placed piece type. Immutable, shared between readers."""
+
+    __slots__ = ("moves", "_by_square", "_by_drop")
+
+    def __init__(self, moves: list[Move]):
+        self.moves: tuple[Move, ...] = tuple(moves)
+        # keyed by position, which compares by row and column: a position
+        # made without the board size finds the moves of its square
+        by_square: dict[Position, list[Move]] = {}
+        by_drop: dict[PieceType, list[Move]] = {}
+        for move in self.moves:
+            if move.drop is not None:
+                by_drop.setdefault(move.drop, []).append(move)
+            else:
+                by_square.setdefault(move.from_pos, []).append(move)
+        self._by_square = {square: tuple(group) for square, group in by_square.items()}
+        self._by_drop = {piece_type: tuple(group) for piece_type, group in by_drop.items()}
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __iter__(self):
+        return iter(self.moves)
+
+    def __contains__(self, move: Move) -> bool:
+        if move.drop is not None:
+            return move in self._by_drop.get(move.drop, ())
+        return move in self._by_square.get(move.from_pos, ())
+
+    def from_square(self, position: Position) -> tuple[Move, ...]:
+        """The legal moves of the piece on a square (promotions included)."""
+        return self._by_square.get(position, ())
+
+    def destinations(self, position: Position) -> list[Position]:
+        """The squares the piece on a square can move to."""
+        return list(dict.fromkeys(move.to_pos for move in self.from_square(position)))
+
+    def placements(self, piece_type: PieceType | None = None) -> tuple[Move, ...]:
+        """The legal placements, of one piece type or of all of them."""
+        if piece_type is not None:
+            return self._by_drop.get(piece_type, ())
+        return tuple(move for group in self._by_drop.values() for move in group)
+
+
+def _cache_key(state: GameState) -> tuple:
+    config = state.config
+    rules = (config.max_placement_turns, config.pawn_promotion_distance) if config is not None else None
+    return state.zobrist_key, state.board.size, rules
+
+
+class LegalMoveCache:
+    """LRU cache of PositionMoves, holding at most capacity positions."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("The cache needs room for at least one position")
+        self.capacity = capacity
+        self._entries: OrderedDict[tuple, PositionMoves] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = MoveCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats = MoveCacheStats()
+
+    def peek(self, state: GameState) -> PositionMoves | None:
+        """The cached moves of the state's position, None on a miss (which
+        is not counted, the get() that follows counts it)."""
+        key = _cache_key(state)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+            return entry
+
+    def get(self, state: GameState) -> PositionMoves:
+        """The legal moves of the state's position, generated on a miss."""
+        key = _cache_key(state)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry
+            self.stats.misses += 1
+
+        entry = PositionMoves(legal_moves(state))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return entry
+
+    def moves_from(self, state: GameState, position: Position) -> tuple[Move, ...]:
+        """The legal moves of the piece on a square."""
+        return self.get(state).from_square(position)
+
+
+if __name__ == "__main__":
+    import time
+    from .perft import REFERENCE_POSITIONS
+
+    state = REFERENCE_POSITIONS["kiwipete"].build()
+    cache = LegalMoveCache()
+    squares = Position.table(state.board.size)
+    start = time.perf_counter()
+    for _ in range(100):
+        for square in squares:
+            legal_moves(state)
+    uncached = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(100):
+        for square in squares:
+            cache.moves_from(state, square)
+    cached = time.perf_counter() - start
+    print(f"{len(squares) * 100} square lookups: {uncached:.3f}s generating, "
+          f"{cached:.3f}s cached, hit rate {cache.stats.hit_rate:.1%}")
@@ -0,0 +1,251 @@
+"""Legal move generation.
+
+Checkers and absolute pins are computed once per position, so every generated
+move is legal without playing it on the board. The only exception is en
+passant, which can uncover a check along the rank and is verified by making
+and unmaking it.
+"""
+
+from typing import Iterator
+
+from ..entities.game_state import GameState, CASTLING_BITS
+from ..entities.board import Board
+from ..value_objects.move import Move, CAPTURE, EN_PASSANT, CASTLE, DOUBLE_PUSH
+from ..value_objects.position import Position
+from ..value_objects.piece_type import Color, PieceType
+from ..value_objects.bitboard import iter_squares, lsb, msb
+from ..value_objects.geometry import geometry
+from .attacks import attack_tables, attackers_to, is_attacked, QUEEN_DIRECTIONS
+from .placement import generate_placements
+
+PROMOTIONS = (PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT)
+
+_PAWN = PieceType.PAWN.value
+_KNIGHT = PieceType.KNIGHT.value
+_BISHOP = PieceType.BISHOP.value
+_ROOK = PieceType.ROOK.value
+_QUEEN = PieceType.QUEEN.value
+_KING = PieceType.KING.value
+
+
+def checkers(state: GameState, color: Color | None = None) -> int:
+    """Returns the mask of enemy pieces giving check to the king of color
+    (the current player by default)."""
+    if color is None:
+        color = state.current_player_color
+    king_square = state.board.king_square(color)
+    if king_square is None:
+        return 0
+    return attackers_to(state.board, king_square, ~color)
+
+
+def is_in_check(state: GameState, color: Color | None = None) -> bool:
+    """Checks if the king of color (the current player by default) is attacked."""
+    if color is None:
+        color = state.current_player_color
+    king_square = state.board.king_square(color)
+    return king_square is not None and is_attacked(state.board, king_square, ~color)
+
+
+def pinned_pieces(board: Board, king_square: int, color: Color) -> dict[int, int]:
+    """Finds the pieces of color absolutely pinned to their king.
+    Maps each pinned square to the mask of squares it may still move to
+    (the line between the king and the pinner, pinner included)."""
+    tables = attack_tables(board.size)
+    enemy = board._pieces[1 - color.value]
+    queens = enemy[_QUEEN]
+    rook_like = enemy[_ROOK] | queens
+    bishop_like = enemy[_BISHOP] | queens
+    pins = {}
+    if not rook_like | bishop_like:
+        return pins
+
+    occupied = board.occupied
+    own = board._colors[color.value]
+    for d in QUEEN_DIRECTIONS:
+        sliders = rook_like if d < 4 else bishop_like
+        ray = tables.rays[d][king_square]
+        if not ray & sliders:
+            continue
+        blockers = ray & occupied
+        first = lsb(blockers) if tables.positive[d] else msb(blockers)
+        rest = blockers ^ (1 << first)
+        if not (own >> first & 1) or not rest:
+            continue
+        second = lsb(rest) if tables.positive[d] else msb(rest)
+        if sliders >> second & 1:
+            pins[first] = tables.between(king_square, second) | (1 << second)
+    return pins
+
+
+def generate_legal_moves(state: GameState, placements: bool = True) -> Iterator[Move]:
+    """Yields the legal moves and placements of the current player.
+    Moves are produced lazily, so callers can stop at the first one.
+    placements=False leaves the placements out."""
+    board = state.board
+    color = state.current_player_color
+    enemy = ~color
+    size = board.size
+    tables = attack_tables(size)
+    positions = Position.table(size)
+    full = board.full_mask
+    occupied = board.occupied
+    own = board._colors[color.value]
+    theirs = board._colors[enemy.value]
+    pieces = board._pieces[color.value]
+
+    king_square = board.king_square(color)
+    if king_square is not None:
+        if board.attack_map is not None and not board.attack_map.is_attacked(king_square, enemy):
+            checking = 0
+        else:
+            checking = attackers_to(board, king_square, enemy)
+        pins = pinned_pieces(board, king_square, color)
+    else:
+        checking = 0
+        pins = {}
+    num_checkers = checking.bit_count()
+
+    # squares a non-king move must land on: anywhere when not in check,
+    # capturing the checker or blocking its line when in single check
+    if num_checkers == 0:
+        evasion = full
+    elif num_checkers == 1:
+        evasion = checking | tables.between(king_square, lsb(checking))
+    else:
+        evasion = 0
+
+    # --- King ---
+    if king_square is not None:
+        king_pos = positions[king_square]
+        # look through the king so it can't step back along a checking ray
+        occupied_without_king = occupied ^ (1 << king_square)
+        for to in iter_squares(tables.king[king_square] & ~own):
+            if not attackers_to(board, to, enemy, occupied_without_king):
+                yield Move(king_pos, positions[to], None, None, theirs >> to & 1)
+        if num_checkers == 0 and state.castling:
+            yield from _castling_moves(state, king_square, color)
+
+    # in double check only the king can move
+    if num_checkers > 1:
+        return
+
+    # --- Knights and sliders ---
+    for piece_type in (_KNIGHT, _BISHOP, _ROOK, _QUEEN):
+        for square in iter_squares(pieces[piece_type]):
+            if piece_type == _KNIGHT:
+                targets = tables.knight[square]
+            elif piece_type == _BISHOP:
+                targets = tables.bishop_attacks(square, occupied)
+            elif piece_type == _ROOK:
+                targets = tables.rook_attacks(square, occupied)
+            else:
+                targets = tables.queen_attacks(square, occupied)
+            targets &= ~own & evasion
+            if square in pins:
+                targets &= pins[square]
+            from_pos = positions[square]
+            for to in iter_squares(targets):
+                yield Move(from_pos, positions[to], None, None, theirs >> to & 1)
+
+    # --- Pawns ---
+    rows = geometry(size)
+    step = rows.pawn_step[color.value]
+    start_row = rows.pawn_row[color.value]
+    last_row = rows.promotion_row[color.value]
+    pawn_attacks = tables.pawn[color.value]
+    en_passant = state.en_passant_target
+    en_passant_square = en_passant.row * size + en_passant.col if en_passant else -1
+    for square in iter_squares(pieces[_PAWN]):
+        targets = pawn_attacks[square] & theirs
+        one = square + step
+        if 0 <= one < size * size and not occupied >> one & 1:
+            targets |= 1 << one
+            two = one + step
+            if square // size == start_row and not occupied >> two & 1:
+                targets |= 1 << two
+        targets &= evasion
+        if square in pins:
+            targets &= pins[square]
+
+        from_pos = positions[square]
+        for to in iter_squares(targets):
+            # CAPTURE is bit 0, a capture is the target being taken
+            flags = theirs >> to & 1
+            if to // size == last_row:
+                for promotion in PROMOTIONS:
+                    yield Move(from_pos, positions[to], promotion, None, flags)
+            else:
+                if to == square + 2 * step:
+                    flags = DOUBLE_PUSH
+                yield Move(from_pos, positions[to], None, None, flags)
+
+        if en_passant_square >= 0 and pawn_attacks[square] >> en_passant_square & 1:
+            if _is_legal_en_passant(state, square, en_passant_square, color):
+                yield Move(from_pos, positions[en_passant_square], None, None, CAPTURE | EN_PASSANT)
+
+    # --- Placements ---
+    if placements:
+        yield from generate_placements(state, evasion)
+
+
+def _castling_moves(state: GameState, king_square: int, color: Color) -> Iterator[Move]:
+    board = state.board
+    size = board.size
+    positions = Position.table(size)
+    paths = geometry(size).castling[color.value]
+    # castling only starts from the king's home square
+    if king_square != paths['kingside'].king_from:
+        return
+    rooks = board._pieces[color.value][_ROOK]
+    occupied = board.occupied
+    enemy = ~color
+    bits = CASTLING_BITS[color]
+
+    for side, path in paths.items():
+        if not state.castling & bits[side] or not rooks >> path.rook_from & 1:
+            continue
+        if path.empty & occupied:
+            continue
+        # the king may not pass through or land on an attacked square
+        if is_attacked(board, path.passes[0], enemy) or is_attacked(board, path.passes[1], enemy):
+            continue
+        yield Move(positions[king_square], positions[path.king_to], None, None, CASTLE)
+
+
+def _is_legal_en_passant(state: GameState, from_square: int, to_square: int, color: Color) -> bool:
+    board = state.board
+    size = board.size
+    # the pawn being captured must actually be there
+    captured = board.piece_at(to_square + (size if color == Color.WHITE else -size))
+    if captured is None or captured.type != PieceType.PAWN or captured.color == color:
+        return False
+    positions = Position.table(size)
+    undo = state.apply_move(positions[from_square], positions[to_square])
+    try:
+        king_square = board.king_square(color)
+        return king_square is None or not is_attacked(board, king_square, ~color)
+    finally:
+        state.revert_move(undo)
+
+
+def legal_moves(state: GameState, placements: bool = True) -> list[Move]:
+    """Returns every legal move and placement of the current player."""
+    return list(generate_legal_moves(state, placements))
+
+
+def has_legal_move(state: GameState) -> bool:
+    """Checks if the current player has at least one legal move or placement,
+    stopping at the first one found."""
+    return next(generate_legal_moves(state), None) is not None
+
+
+def is_checkmate(state: GameState) -> bool:
+    """The current player is in check and has no legal move."""
+    return is_in_check(state) and not has_legal_move(state)
+
+
+def is_stalemate(state: GameState) -> bool:
+    """The current player is not in check but has no legal move."""
+    return not is_in_check(state) and not has_legal_move(state)
+
@@ -0,0 +1,148 @@
+"""Standard algebraic notation (SAN), extended with placements.
+
+Moves are written as in chess (``e4``, ``Nbd7``, ``exd6``, ``e8=Q``,
+``O-O``, ``Qh4#``) and placements as the piece letter, ``@`` and the target
+square (``N@e4``, ``P@d3``), with the same check and mate suffixes.
+"""
+
+import re
+from typing import Iterator
+
+from ..entities.game_state import GameState
+from ..exceptions.game_error import InvalidMoveError
+from ..value_objects.game_record import GameRecord
+from ..value_objects.move import Move
+from ..value_objects.position import Position
+from ..value_objects.piece_type import PieceType
+from .move_generator import legal_moves, is_in_check, has_legal_move
+from .replay import apply_moves
+
+_PIECE_LETTERS = {piece_type.algebraic: piece_type for piece_type in PieceType if piece_type.algebraic}
+_SAN = re.compile(r"^([NBRQK])?([a-p])?(\d+)?x?([a-p]\d+)(?:=?([NBRQ]))?$")
+
+
+def _drop_letter(piece_type: PieceType) -> str:
+    return piece_type.algebraic or "P"
+
+
+def to_san(state: GameState, move: Move, moves: list[Move] | None = None) -> str:
+    """Writes a legal move of the side to move in SAN. moves can pass the
+    legal moves of the position when the caller has them already, they are
+    needed for disambiguation."""
+    board = state.board
+    move = move.for_size(board.size)
+    target = move.to_pos.algebraic()
+
+    if move.drop is not None:
+        san = f"{_drop_letter(move.drop)}@{target}"
+    else:
+        piece = board.get_piece(move.from_pos)
+        if piece is None:
+            raise InvalidMoveError(f"No piece to move for {move}")
+        capture = board.get_piece(move.to_pos) is not None
+        if piece.type == PieceType.KING and abs(move.to_pos.col - move.from_pos.col) == 2:
+            san = "O-O" if move.to_pos.col > move.from_pos.col else "O-O-O"
+        elif piece.type == PieceType.PAWN:
+            # a diagonal pawn move is a capture, en passant included
+            capture = move.from_pos.col != move.to_pos.col
+            san = f"{move.from_pos.algebraic()[0]}x{target}" if capture else target
+            if move.promotion is not None:
+                san += f"={move.promotion.algebraic}"
+        else:
+            san = piece.type.algebraic + _disambiguation(state, move, moves) + ("x" if capture else "") + target
+
+    state.play(move)
+    try:
+        if is_in_check(state):
+            san += "+" if has_legal_move(state) else "#"
+    finally:
+        state.unmake_move()
+    return san
+
+
+def _disambiguation(state: GameState, move: Move, moves: list[Move] | None) -> str:
+    """File, rank or square of the moving piece when another piece of the
+    same kind can reach the same square."""
+    board = state.board
+    code = board.code_at(board.square_index(move.from_pos))
+    if moves is None:
+        moves = legal_moves(state, placements=False)
+    rivals = [
+        other.from_pos for other in moves
+        if other.drop is None and other.to_pos == move.to_pos and other.from_pos != move.from_pos
+        and board.code_at(board.square_index(other.from_pos)) == code
+    ]
+    if not rivals:
+        return ""
+    square = move.from_pos.algebraic()
+    file, rank = square[0], square[1:]
+    if all(rival.col != move.from_pos.col for rival in rivals):
+        return file
+    if all(rival.row != move.from_pos.row for rival in rivals):
+        return rank
+    return square
+
+
+def from_san(state: GameState, san: str) -> Move:
+    """Reads a SAN move or placement of the side to move, checking it is legal."""
+    size = state.board.size
+    text = san.rstrip("+#!?")
+    moves = legal_moves(state)
+
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        king_square = state.board.king_square(state.current_player_color)
+        step = 2 if len(text) == 3 else -2
+        candidates = [
+            move for move in moves
+            if king_square is not None and move.drop is None
+            and state.board.square_index(move.from_pos) == king_square and move.to_pos.col - move.from_pos.col == step
+        ]
+    elif "@" in text:
+        letter, _, square = text.partition("@")
+        # black placements are sometimes written in lower case
+        letter = letter.upper()
+        piece_type = PieceType.PAWN if letter in ("", "P") else _PIECE_LETTERS.get(letter)
+        target = Position.from_algebraic(square, size)
+        candidates = [move for move in moves if move.drop == piece_type and move.to_pos == target]
+    else:
+        match = _SAN.match(text)
+        if match is None:
+            raise InvalidMoveError(f"Invalid SAN: {san}")
+        letter, file, rank, square, promotion = match.groups()
+        piece_type = _PIECE_LETTERS[letter] if letter else PieceType.PAWN
+        target = Position.from_algebraic(square, size)
+        promotion_type = _PIECE_LETTERS[promotion] if promotion else None
+        board = state.board
+        candidates = [
+            move for move in moves
+            if move.drop is None and move.to_pos == target
+            and board.piece_at(board.square_index(move.from_pos)).type == piece_type
+            and move.promotion == promotion_type
+            and (file is None or move.from_pos.algebraic()[0] == file)
+            and (rank is None or move.from_pos.algebraic()[1:] == rank)
+        ]
+
+    if len(candidates) != 1:
+        problem = "Ambiguous" if candidates else "Illegal"
+        raise InvalidMoveError(f"{problem} move: {san}")
+    return candidates[0]
+
+
+def record_to_san(record: GameRecord) -> list[str]:
+    """Writes the moves of a game in SAN, replaying them from its position."""
+    state = GameState.from_fen(record.fen)
+    sans = []
+    for move in record.moves:
+        sans.append(to_san(state, move))
+        state.play(move)
+    return sans
+
+
+def replay(record: GameRecord) -> Iterator[tuple[GameState, Move]]:
+    """Replays a game, yielding the state before every move along with the
+    move. The same state object is updated in place between moves, as live
+    play does (see services.replay)."""
+    state = GameState.from_fen(record.fen)
+    for move in record.moves:
+        yield state, move
+        apply_moves(state, (move,))
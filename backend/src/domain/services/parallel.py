@@ -0,0 +1,182 @@
+"""Parallel search over several processes.
+
+Python threads share one interpreter lock, so the search is spread over worker
+processes instead, splitting the root moves: every worker searches its share
+of the legal moves by iterative deepening, and the best move is picked among
+the workers' results at the deepest depth all of them completed. Root moves
+are dealt round-robin, so the many placements of the opening phase (where the
+branching factor is huge) are split evenly.
+
+Positions go to the workers in their compact binary encoding (see
+entities.codec) along with the game config, moves as packed ints. Each worker
+keeps its own transposition table between searches.
+
+With a single worker (or a single core) the plain search runs in-process,
+which is deterministic.
+
+Run ``python -m src.domain.services.parallel <position> <depth>`` from
+``backend`` to report the speedup at 1/2/4/8/16 workers.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ..entities.codec import encode_state, decode_state
+from ..entities.game_state import GameState
+from ..value_objects.game_config import GameConfigStandard
+from ..value_objects.move import Move
+from .move_generator import legal_moves, is_in_check
+from .search import Searcher, SearchLimits, SearchResult, MATE_SCORE, MATE_THRESHOLD
+from .transposition import TranspositionTable, DEFAULT_BUDGET
+
+# --- Worker side ---
+
+# transposition table of the worker process, kept between searches
+_worker_table: TranspositionTable | None = None
+
+
+def _init_worker(table_bytes: int):
+    global _worker_table
+    _worker_table = TranspositionTable(table_bytes)
+
+
+def _search_share(encoded: bytes, config: GameConfigStandard | None,
+                  move_codes: list[int], limits: SearchLimits) -> tuple:
+    """Searches some root moves of an encoded position. Returns the nodes
+    searched and the (depth, score, pv codes) of every completed depth."""
+    state = decode_state(encoded)
+    state.config = config
+    size = state.board.size
+    table = _worker_table if _worker_table is not None else TranspositionTable()
+    searcher = Searcher(state, table)
+    iterations = []
+    result = searcher.search(
+        limits,
+        root_moves=[Move.from_code(code, size) for code in move_codes],
+        on_iteration=lambda it: iterations.append(
+            (it.depth, it.score, [move.to_code(size) for move in it.pv])
+        ),
+    )
+    return result.nodes, iterations
+
+
+# --- Main side ---
+
+
+class ParallelSearcher:
+    """Root-splitting search over a pool of worker processes.
+
+    The pool is started on the first search and reused afterwards; use the
+    searcher as a context manager (or call close()) to shut it down.
+    """
+
+    def __init__(self, workers: int | None = None, table_bytes: int = DEFAULT_BUDGET):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.table_bytes = table_bytes
+        self._pool: ProcessPoolExecutor | None = None
+        self._serial: Searcher | None = None
+
+    def __enter__(self) -> "ParallelSearcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def search(self, state: GameState, limits: SearchLimits | None = None) -> SearchResult:
+        """Searches the best move or placement of the side to move."""
+        limits = limits or SearchLimits()
+        if self.workers <= 1:
+            # deterministic single process fallback
+            if self._serial is None or self._serial.state is not state:
+                self._serial = Searcher(state, TranspositionTable(self.table_bytes))
+            return self._serial.search(limits)
+
+        start = time.perf_counter()
+        moves = legal_moves(state)
+        if not moves:
+            score = -MATE_SCORE if is_in_check(state) else 0
+            return SearchResult(None, score, 0, elapsed=time.perf_counter() - start)
+
+        shares = min(self.workers, len(moves))
+        if limits.max_nodes is not None:
+            # the node budget is shared by the workers
+            limits = SearchLimits(limits.max_depth, limits.time_limit,
+                                  max(limits.max_nodes // shares, 1))
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(self.table_bytes,)
+            )
+        encoded = encode_state(state)
+        size = state.board.size
+        futures = [
+            self._pool.submit(_search_share, encoded, state.config,
+                              [move.to_code(size) for move in moves[i::shares]], limits)
+            for i in range(shares)
+        ]
+        outcomes = [future.result() for future in futures]
+        result = _merge(outcomes, moves[0], size)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def _merge(outcomes: list[tuple], fallback: Move, size: int) -> SearchResult:
+    """Picks the best result among the workers, at the deepest depth every
+    worker completed. A worker that stopped early on a forced mate keeps its
+    result at every depth."""
+    nodes = sum(worker_nodes for worker_nodes, _ in outcomes)
+    finished = [iterations for _, iterations in outcomes if iterations]
+    if not finished:
+        return SearchResult(fallback, 0, 0, nodes=nodes)
+
+    unresolved = [its for its in finished if abs(its[-1][1]) < MATE_THRESHOLD]
+    depth = min(its[-1][0] for its in (unresolved or finished))
+    best = None
+    for iterations in finished:
+        candidates = [it for it in iterations if it[0] <= depth]
+        if candidates and (best is None or candidates[-1][1] > best[1]):
+            best = candidates[-1]
+    if best is None:
+        return SearchResult(fallback, 0, 0, nodes=nodes)
+    pv = [Move.from_code(code, size) for code in best[2]]
+    return SearchResult(pv[0] if pv else fallback, best[1], depth, pv, nodes)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .perft import REFERENCE_POSITIONS
+
+    parser = argparse.ArgumentParser(prog="parallel", description="Parallel search speedup report")
+    parser.add_argument("position", nargs="?", default="start-reserves",
+                        help=f"one of: {', '.join(REFERENCE_POSITIONS)}")
+    parser.add_argument("depth", nargs="?", type=int, default=3)
+    parser.add_argument("--workers", default="1,2,4,8,16",
+                        help="comma separated worker counts")
+    args = parser.parse_args(argv)
+
+    if args.position not in REFERENCE_POSITIONS:
+        parser.error(f"unknown position {args.position!r}")
+    counts = [int(count) for count in args.workers.split(",")]
+    print(f"position: {args.position}, depth: {args.depth}, cores: {os.cpu_count()}")
+    base = None
+    for workers in counts:
+        state = REFERENCE_POSITIONS[args.position].build()
+        with ParallelSearcher(workers) as searcher:
+            # start the pool outside of the timing
+            searcher.search(state, SearchLimits(max_depth=1))
+            start = time.perf_counter()
+            result = searcher.search(state, SearchLimits(max_depth=args.depth))
+            elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"{workers:>3} workers: {elapsed:7.3f}s  speedup {base / elapsed:5.2f}x  "
+              f"nodes {result.nodes:>9}  best {result.best_move} ({result.score})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+"""Perft: counts the leaf nodes of the legal move tree to a fixed depth.
+
+Used both as a correctness check of the move generator (the counts of the
+reference positions are known) and as its throughput benchmark.
+
+Run it with ``python backend/cli.py perft <depth> <position>`` or
+``python -m src.domain.services.perft <depth> <position>`` from ``backend``.
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, field, fields
+
+from ..entities.game_state import GameState
+from .move_generator import generate_legal_moves, legal_moves, is_in_check
+
+
+@dataclass
+class PerftStats:
+    """Leaf node counts, split by the kind of the last move."""
+    nodes: int = 0
+    captures: int = 0
+    en_passant: int = 0
+    castles: int = 0
+    promotions: int = 0
+    checks: int = 0
+    drops: int = 0
+
+    def __iadd__(self, other: "PerftStats") -> "PerftStats":
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+
+@dataclass
+class ReferencePosition:
+    """A test position with its known perft results per depth."""
+    name: str
+    fen: str  # extended FEN, see entities.fen
+    # per depth, either the full stats or only the node count
+    expected: dict[int, PerftStats | int] = field(default_factory=dict)
+
+    def expected_nodes(self, depth: int) -> int | None:
+        expected = self.expected.get(depth)
+        return expected.nodes if isinstance(expected, PerftStats) else expected
+
+    def build(self) -> GameState:
+        return GameState.from_fen(self.fen)
+
+
+REFERENCE_POSITIONS: dict[str, ReferencePosition] = {
+    position.name: position
+    for position in [
+        ReferencePosition(
+            "start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            expected={
+                1: PerftStats(20),
+                2: PerftStats(400),
+                3: PerftStats(8902, captures=34, checks=12),
+                4: PerftStats(197281, captures=1576, checks=469),
+            },
+        ),
+        ReferencePosition(
+            "kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+            expected={
+                1: PerftStats(48, captures=8, castles=2),
+                2: PerftStats(2039, captures=351, en_passant=1, castles=91, checks=3),
+                3: PerftStats(97862, captures=17102, en_passant=45, castles=3162, checks=993),
+            },
+        ),
+        ReferencePosition(
+            "endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+            expected={
+                1: PerftStats(14, captures=1, checks=2),
+                2: PerftStats(191, captures=14, checks=10),
+                3: PerftStats(2812, captures=209, en_passant=2, checks=267),
+                4: PerftStats(43238, captures=3348, en_passant=123, checks=1680),
+            },
+        ),
+        ReferencePosition(
+            "promotions", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+            expected={
+                1: PerftStats(6),
+                2: PerftStats(264, captures=87, castles=6, promotions=48, checks=10),
+                3: PerftStats(9467, captures=1021, en_passant=4, promotions=120, checks=38),
+            },
+        ),
+        ReferencePosition(
+            "talkchess", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+            # only the node counts are published for this one
+            expected={1: 44, 2: 1486, 3: 62379},
+        ),
+        # GoChess positions, the counts come from cross-checking this generator
+        # against the naive pseudo-legal + CheckNextValidator filter
+        ReferencePosition(
+            "kings", "4k3/8/8/8/8/8/8/4K3 w - - P QNP2/qnp2 0/0",
+            expected={
+                1: PerftStats(177, checks=26, drops=172),
+                2: PerftStats(26386, captures=13, checks=3802, drops=25642),
+            },
+        ),
+        ReferencePosition(
+            "start-reserves", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P NP/np 0/0",
+            expected={
+                1: PerftStats(84, checks=2, drops=64),
+                2: PerftStats(6745, captures=36, checks=165, drops=5120),
+                3: PerftStats(395773, captures=6961, en_passant=14, checks=9757, drops=251131),
+            },
+        ),
+    ]
+}
+
+def perft(state: GameState, depth: int) -> int:
+    """Counts the leaf nodes at depth, making and unmaking moves in place."""
+    if depth == 0:
+        return 1
+    if depth == 1:
+        # bulk counting, the leaves don't need to be played
+        return sum(1 for _ in generate_legal_moves(state))
+    nodes = 0
+    for move in legal_moves(state):
+        state.play(move)
+        nodes += perft(state, depth - 1)
+        state.unmake_move()
+    return nodes
+
+
+def perft_stats(state: GameState, depth: int) -> PerftStats:
+    """Like perft, but also classifies the move leading to every leaf.
+    Slower, since every leaf move is played to look for checks."""
+    stats = PerftStats()
+    if depth == 0:
+        stats.nodes = 1
+        return stats
+    for move in legal_moves(state):
+        undo = state.play(move)
+        if depth == 1:
+            stats.nodes += 1
+            if undo.is_drop:
+                stats.drops += 1
+            if undo.captured is not None:
+                stats.captures += 1
+                if undo.captured_square != undo.to_square:
+                    stats.en_passant += 1
+            if undo.rook_from >= 0:
+                stats.castles += 1
+            if undo.promotion is not None:
+                stats.promotions += 1
+            if is_in_check(state):
+                stats.checks += 1
+        else:
+            stats += perft_stats(state, depth - 1)
+        state.unmake_move()
+    return stats
+
+
+def divide(state: GameState, depth: int) -> dict[str, int]:
+    """Splits the perft count per root move."""
+    counts = {}
+    for move in legal_moves(state):
+        state.play(move)
+        counts[str(move)] = perft(state, depth - 1)
+        state.unmake_move()
+    return counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="perft", description=__doc__.splitlines()[0])
+    parser.add_argument("depth", type=int)
+    parser.add_argument("position", nargs="?", default="start",
+                        help=f"a (quoted) FEN or one of: {', '.join(REFERENCE_POSITIONS)}")
+    parser.add_argument("--divide", action="store_true", help="split the count per root move")
+    parser.add_argument("--stats", action="store_true", help="count captures, checks, etc.")
+    args = parser.parse_args(argv)
+
+    if args.position in REFERENCE_POSITIONS:
+        reference = REFERENCE_POSITIONS[args.position]
+    elif "/" in args.position:
+        reference = ReferencePosition("fen", args.position)
+    else:
+        parser.error(f"unknown position {args.position!r}")
+    state = reference.build()
+
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(state, args.depth)
+        for move, nodes in counts.items():
+            print(f"{move}: {nodes}")
+        stats = PerftStats(sum(counts.values()))
+    elif args.stats:
+        stats = perft_stats(state, args.depth)
+    else:
+        stats = PerftStats(perft(state, args.depth))
+    elapsed = time.perf_counter() - start
+
+    print(f"\nposition: {reference.name}, depth: {args.depth}")
+    for f in fields(stats):
+        if f.name == "nodes" or args.stats:
+            print(f"{f.name:>11}: {getattr(stats, f.name)}")
+    print(f"{'time':>11}: {elapsed:.3f}s")
+    print(f"{'nodes/s':>11}: {stats.nodes / elapsed if elapsed else float('inf'):,.0f}")
+
+    expected = reference.expected.get(args.depth)
+    if expected is None:
+        return 0
+    if args.stats and isinstance(expected, PerftStats):
+        matches = expected == stats
+    else:
+        matches = reference.expected_nodes(args.depth) == stats.nodes
+    print("OK" if matches else f"MISMATCH, expected {expected}")
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""Placement (drop) generation and validation.
+
+During the placement phase a player may put a piece from their reserve on an
+empty square instead of moving. The rules come from the game config:
+
+- ``allowed_pieces`` gives the reserves each player starts with,
+- ``max_placement_turns`` caps the turns a player may spend placing,
+- ``pawn_promotion_distance`` keeps pawns that many ranks away from their
+  promotion rank (pawns are never placed on their own first rank either).
+
+Free setups (a state without a config) allow placements until the reserves
+run out and only keep pawns off the first and last ranks.
+
+Targets are computed as masks: the empty squares, narrowed per piece type by
+the rank restrictions and, when the king is in check, by the squares that
+block the check. Every legal placement then comes out in one pass over the
+mask bits, no placement has to be played to be checked.
+"""
+
+from enum import Enum, auto
+from functools import lru_cache
+from typing import Iterator
+
+from ..entities.game_state import GameState, GamePhase
+from ..value_objects.move import Move
+from ..value_objects.position import Position
+from ..value_objects.piece_type import Color, PieceType
+from ..value_objects.bitboard import iter_squares, lsb
+from .attacks import attack_tables, attackers_to, is_attacked
+
+# promotion distance of free setups, pawns only stay off the last rank
+DEFAULT_PAWN_PROMOTION_DISTANCE = 1
+
+
+class PlacementStatus(Enum):
+    """Outcome of checking a placement.
+
+    ``KING_IN_CHECK`` is the only status of a placement that follows the
+    placement rules but leaves the player's own king attacked, every other
+    non-LEGAL status breaks a placement rule.
+    """
+    LEGAL = auto()
+    WRONG_PHASE = auto()
+    NO_RESERVE = auto()
+    NO_PLACEMENT_TURNS = auto()
+    OCCUPIED = auto()
+    RESTRICTED_SQUARE = auto()
+    KING_IN_CHECK = auto()
+
+    @property
+    def is_legal(self) -> bool:
+        return self is PlacementStatus.LEGAL
+
+
+@lru_cache(maxsize=None)
+def pawn_placement_mask(size: int, color: Color, promotion_distance: int) -> int:
+    """Squares a pawn of color may be placed on: not on its own first rank and
+    at least promotion_distance ranks away from its promotion rank."""
+    row_mask = (1 << size) - 1
+    mask = 0
+    for row in range(size):
+        # white promotes on row 0 and starts from the last row, black the opposite
+        distance = row if color == Color.WHITE else size - 1 - row
+        first_rank = size - 1 if color == Color.WHITE else 0
+        if distance >= promotion_distance and row != first_rank:
+            mask |= row_mask << (row * size)
+    return mask
+
+
+def placement_turns_left(state: GameState, color: Color) -> int | None:
+    """Turns color may still spend placing, None when unlimited."""
+    config = state.config
+    if config is None or config.max_placement_turns is None:
+        return None
+    return max(config.max_placement_turns - state.placement_turns[color], 0)
+
+
+def can_place(state: GameState, color: Color | None = None) -> bool:
+    """Checks if color (the current player by default) may still place pieces:
+    placement phase, tracked reserves with pieces left, and turns left."""
+    if color is None:
+        color = state.current_player_color
+    if state.phase != GamePhase.PLACEMENT or state.reserves is None:
+        return False
+    if placement_turns_left(state, color) == 0:
+        return False
+    return any(count > 0 for count in state.reserves.get(color, {}).values())
+
+
+def placement_masks(state: GameState, color: Color | None = None) -> dict[PieceType, int]:
+    """Maps every piece type color has in reserve to the mask of squares the
+    placement rules allow for it. Whether the placement leaves the own king
+    in check is not considered here."""
+    if color is None:
+        color = state.current_player_color
+    if not can_place(state, color):
+        return {}
+    board = state.board
+    empty = board.empty
+    config = state.config
+    distance = (config.pawn_promotion_distance if config is not None
+                else DEFAULT_PAWN_PROMOTION_DISTANCE)
+
+    masks = {}
+    for piece_type, count in state.reserves[color].items():
+        if count <= 0:
+            continue
+        if piece_type == PieceType.PAWN:
+            masks[piece_type] = empty & pawn_placement_mask(board.size, color, distance)
+        elif piece_type == PieceType.KING:
+            # there is only ever one king per color
+            masks[piece_type] = 0 if board.king_square(color) is not None else empty
+        else:
+            masks[piece_type] = empty
+    return masks
+
+
+def _evasion_mask(state: GameState, color: Color) -> int:
+    """Squares a placement must land on to keep the own king safe: anywhere
+    when not in check, between the king and the checker when in single check
+    from a distance, nowhere otherwise (a placement can't capture)."""
+    board = state.board
+    king_square = board.king_square(color)
+    if king_square is None:
+        return board.full_mask
+    attack_map = board.attack_map
+    if attack_map is not None:
+        # the common case, not in check, is a lookup
+        checkers = attack_map.attacker_count(king_square, ~color)
+        if checkers != 1:
+            return 0 if checkers else board.full_mask
+    checking = attackers_to(board, king_square, ~color)
+    if not checking:
+        return board.full_mask
+    if checking & (checking - 1):
+        return 0
+    return attack_tables(board.size).between(king_square, lsb(checking))
+
+
+def generate_placements(state: GameState, evasion: int | None = None) -> Iterator[Move]:
+    """Yields the legal placements of the current player.
+
+    evasion can pass the check evasion mask when the caller already has it
+    (the move generator does), it is computed otherwise.
+    """
+    color = state.current_player_color
+    masks = placement_masks(state, color)
+    if not masks:
+        return
+    board = state.board
+    positions = Position.table(board.size)
+    if evasion is None:
+        evasion = _evasion_mask(state, color)
+
+    for piece_type, mask in masks.items():
+        if piece_type == PieceType.KING:
+            # a king can't be placed in check, and without a king there is no
+            # check to evade
+            if board.attack_map is not None:
+                mask &= ~board.attack_map.attacked(~color)
+            else:
+                mask = sum(1 << sq for sq in iter_squares(mask) if not is_attacked(board, sq, ~color))
+        else:
+            mask &= evasion
+        for to in iter_squares(mask):
+            yield Move(None, positions[to], drop=piece_type)
+
+
+def check_placement(state: GameState, piece_type: PieceType, position: Position) -> PlacementStatus:
+    """Checks a placement of piece_type on position by the current player."""
+    color = state.current_player_color
+    board = state.board
+    if state.phase != GamePhase.PLACEMENT:
+        return PlacementStatus.WRONG_PHASE
+    if state.reserves is None or state.reserves.get(color, {}).get(piece_type, 0) <= 0:
+        return PlacementStatus.NO_RESERVE
+    if placement_turns_left(state, color) == 0:
+        return PlacementStatus.NO_PLACEMENT_TURNS
+    if not board.is_valid_position(position):
+        return PlacementStatus.RESTRICTED_SQUARE
+    square = board.square_index(position)
+    if board.code_at(square):
+        return PlacementStatus.OCCUPIED
+    if not placement_masks(state, color).get(piece_type, 0) >> square & 1:
+        return PlacementStatus.RESTRICTED_SQUARE
+
+    if piece_type == PieceType.KING:
+        safe = not is_attacked(board, square, ~color)
+    else:
+        safe = _evasion_mask(state, color) >> square & 1
+    return PlacementStatus.LEGAL if safe else PlacementStatus.KING_IN_CHECK
+
+
+if __name__ == "__main__":
+    from ..entities.board import Board
+    from ..entities.piece import King, Rook
+    from ..value_objects.game_config import GameConfigStandard
+
+    config = GameConfigStandard({PieceType.KNIGHT: 1, PieceType.PAWN: 2}, max_placement_turns=4)
+    board = Board()
+    board.place_piece(King(Color.WHITE), Position.from_algebraic("e1"))
+    board.place_piece(King(Color.BLACK), Position.from_algebraic("e8"))
+    board.place_piece(Rook(Color.BLACK), Position.from_algebraic("e5"))
+    state = GameState(board, Color.WHITE, reserves=config.initial_reserves(), config=config)
+
+    # in check from the rook, only e2, e3 and e4 block it
+    print([str(move) for move in generate_placements(state)])
+    print(check_placement(state, PieceType.KNIGHT, Position.from_algebraic("a3")))  # KING_IN_CHECK
+    print(check_placement(state, PieceType.PAWN, Position.from_algebraic("e1")))  # OCCUPIED
@@ -0,0 +1,108 @@
+"""Bulk replay of recorded moves.
+
+Rebuilding a position from a stored game does not need the engine's live
+validation: the moves were validated when they were played. apply_moves
+applies them straight to the state, with the same bookkeeping as live play
+(en passant, castling rights, promotions from the move record, reserves,
+placement turns and the switch to the movement phase) and nothing else: no
+pseudo-legal generation, no board copies, no prompts and no undo records.
+
+Run ``python -m src.domain.services.replay`` from ``backend`` for a
+benchmark against replaying through GoChessEngine.move_piece.
+"""
+
+from typing import Iterable
+
+from ..entities.game_state import GameState, GamePhase
+from ..entities.piece import Piece
+from ..exceptions.game_error import InvalidMoveError
+from ..value_objects.move import Move
+from ..value_objects.piece_type import Color
+from .move_generator import legal_moves
+from .placement import can_place
+
+
+def apply_moves(state: GameState, moves: Iterable[Move | int], trusted: bool = True,
+                record: bool = True) -> int:
+    """Plays moves (Move objects or Move.to_code ints) from the state, in
+    place, passing the turn after each one. Returns how many were applied.
+
+    trusted=False checks every move against the legal moves first and
+    raises InvalidMoveError at the first illegal one, the moves before it
+    staying applied. record=False leaves the move history alone.
+    """
+    size = state.board.size
+    count = 0
+    for move in moves:
+        if isinstance(move, int):
+            move = Move.from_code(move, size)
+        if not trusted and move not in legal_moves(state):
+            raise InvalidMoveError(f"Move {count + 1} ({move}) is not legal")
+        if record:
+            state.add_move_to_history(move)
+
+        if move.drop is not None:
+            state.apply_drop(Piece.create(move.drop, state.current_player_color), move.to_pos)
+            # as the engine does, the game moves on once nobody can place
+            if (state.phase == GamePhase.PLACEMENT
+                    and not can_place(state, Color.WHITE) and not can_place(state, Color.BLACK)):
+                state.switch_phase()
+        else:
+            state.apply_move(move.from_pos, move.to_pos, move.promotion)
+        state.switch_player()
+        count += 1
+    return count
+
+
+def replay_fen(fen: str, moves: Iterable[Move | int], trusted: bool = True) -> GameState:
+    """The state reached by playing moves from a position (extended FEN)."""
+    state = GameState.from_fen(fen)
+    apply_moves(state, moves, trusted)
+    return state
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from .go_chess_engine import GoChessEngine
+
+    start_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - M - 0/0"
+    rng = random.Random(0)
+    games = []
+    for _ in range(50):
+        state = GameState.from_fen(start_fen)
+        moves = []
+        for _ in range(60):
+            options = legal_moves(state)
+            if not options:
+                break
+            moves.append(rng.choice(options))
+            state.play(moves[-1])
+        games.append(moves)
+    total = sum(map(len, games))
+
+    def live(moves):
+        state = GameState.from_fen(start_fen)
+        engine = GoChessEngine(state, [])
+        for move in moves:
+            engine.move_piece(move.from_pos, move.to_pos, move.promotion)
+            state.switch_player()
+        return state
+
+    def bench(name, function):
+        begin = time.perf_counter()
+        finals = [function(moves) for moves in games]
+        elapsed = time.perf_counter() - begin
+        print(f"{name:>10}: {total / elapsed:12,.0f} moves/s")
+        return finals
+
+    codes = [[move.to_code() for move in moves] for moves in games]
+    reference = bench("live", live)
+    bench("untrusted", lambda moves: replay_fen(start_fen, moves, trusted=False))
+    trusted = bench("trusted", lambda moves: replay_fen(start_fen, moves))
+    begin = time.perf_counter()
+    for moves in codes:
+        replay_fen(start_fen, moves)
+    print(f"{'codes':>10}: {total / (time.perf_counter() - begin):12,.0f} moves/s")
+    assert [state.to_fen() for state in trusted] == [state.to_fen() for state in reference]
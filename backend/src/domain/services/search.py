@@ -0,0 +1,384 @@
+"""Alpha-beta search: finds the best move or placement of the side to move.
+
+Negamax with alpha-beta pruning, driven by iterative deepening: depth 1, 2, ...
+are searched in turn until a limit is hit, and the result of the last fully
+searched depth is kept. Every iteration reuses what the previous ones learned:
+
+- the principal variation is searched first,
+- aspiration windows narrow the first search around the previous score,
+- killer moves (quiet moves that caused a cutoff at the same ply) and the
+  history heuristic order the remaining quiet moves,
+- captures are ordered by most valuable victim, least valuable attacker.
+
+Results are kept in a transposition table, which cuts off positions already
+searched deep enough (placement orders transpose a lot) and orders their best
+move first. Leaves are resolved by a capture-only quiescence search. The search plays
+moves in place with make/unmake on the given state, which is left as it was
+found, even when a limit interrupts it. The evaluation follows the moves
+incrementally (see evaluation.IncrementalEvaluator).
+
+Limits (wall-clock time, nodes, depth) are hard: the search is interrupted
+mid-iteration when one is reached.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from ..entities.game_state import GameState
+from ..value_objects.move import Move, CAPTURE, EN_PASSANT, CODE_MASK
+from ..value_objects.piece_type import PieceType
+from .evaluation import IncrementalEvaluator, weights_of
+from .move_generator import legal_moves, is_in_check
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+MATE_SCORE = 100_000
+INFINITY = MATE_SCORE + 1
+# scores beyond this are mates, with the distance to mate in plies
+MATE_THRESHOLD = MATE_SCORE - 1000
+MAX_PLY = 128
+
+ASPIRATION_WINDOW = 50
+# how often (in nodes) the clock is read
+CHECK_EVERY = 128
+
+# move ordering scores, from first to last
+_PV_SCORE = 1 << 30
+_TT_SCORE = 1 << 29
+_CAPTURE_SCORE = 1 << 28
+_KILLER_SCORES = (1 << 27, 1 << 26)
+_HISTORY_MAX = 1 << 25
+
+
+@dataclass
+class SearchLimits:
+    """When to stop searching. None means no limit; with no limit at all the
+    search stops at DEFAULT_DEPTH."""
+    max_depth: int | None = None
+    time_limit: float | None = None  # seconds
+    max_nodes: int | None = None
+
+    DEFAULT_DEPTH = 4
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search: the best move (None when there is no legal move),
+    its score for the side to move in centipawns, and the expected line."""
+    best_move: Move | None
+    score: int
+    depth: int
+    pv: list[Move] = field(default_factory=list)
+    nodes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def is_mate(self) -> bool:
+        return abs(self.score) >= MATE_THRESHOLD
+
+
+class _SearchAborted(Exception):
+    """Raised inside the search tree when a limit is reached."""
+
+
+class Searcher:
+    """Searches positions of one game state. The transposition table, killer
+    and history tables are kept between searches, so consecutive searches of
+    the same game start from what the previous ones learned; call clear() for
+    an unrelated position. A table can also be shared between searchers."""
+
+    def __init__(self, state: GameState, table: TranspositionTable | None = None):
+        self.state = state
+        self.table = table if table is not None else TranspositionTable()
+        self.nodes = 0
+        # a table passed in keeps its entries, it may be shared between searchers
+        self._killers: list[list[Move | None]] = [[None, None] for _ in range(MAX_PLY)]
+        self._history: dict[Move, int] = {}
+        # piece values of the move ordering, those of the evaluation
+        self._values = weights_of(state).piece_values
+
+    def clear(self):
+        """Forgets the transposition table and the move ordering statistics."""
+        self.table.clear()
+        self._killers = [[None, None] for _ in range(MAX_PLY)]
+        self._history = {}
+
+    # --- Public API ---
+
+    def search(self, limits: SearchLimits | None = None,
+               root_moves: list[Move] | None = None,
+               on_iteration: Callable[[SearchResult], None] | None = None) -> SearchResult:
+        """Searches the position by iterative deepening until a limit is hit.
+
+        root_moves restricts the search to some of the legal moves of the
+        position (they must be legal, they are not checked). on_iteration is
+        called with the result of every completed depth.
+        """
+        limits = limits or SearchLimits()
+        max_depth = limits.max_depth
+        if max_depth is None:
+            no_limit = limits.time_limit is None and limits.max_nodes is None
+            max_depth = SearchLimits.DEFAULT_DEPTH if no_limit else MAX_PLY - 1
+
+        self.nodes = 0
+        self._start = time.perf_counter()
+        self._deadline = self._start + limits.time_limit if limits.time_limit is not None else None
+        self._max_nodes = limits.max_nodes
+        self._pv_table: list[list[Move]] = [[] for _ in range(MAX_PLY + 1)]
+        self._path: list[int] = []
+        self.table.new_search()
+        self._evaluator = IncrementalEvaluator(self.state)
+        self._values = self._evaluator.weights.piece_values
+        base = len(self.state._undo_stack)
+
+        if root_moves is None:
+            root_moves = legal_moves(self.state)
+        self._root_moves = root_moves
+        if not root_moves:
+            score = -MATE_SCORE if is_in_check(self.state) else 0
+            return SearchResult(None, score, 0, elapsed=self._elapsed())
+
+        # the first legal move stands in until an iteration completes
+        result = SearchResult(root_moves[0], 0, 0)
+        pv: list[Move] = []
+        score = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._aspiration(depth, score, pv)
+            except _SearchAborted:
+                # take back whatever the interrupted iteration left on the board
+                while len(self.state._undo_stack) > base:
+                    self._unmake()
+                break
+            pv = list(self._pv_table[0])
+            result = SearchResult(pv[0] if pv else root_moves[0], score, depth, pv,
+                                  self.nodes, self._elapsed())
+            if on_iteration is not None:
+                on_iteration(result)
+            # a forced mate won't get any better
+            if abs(score) >= MATE_THRESHOLD:
+                break
+
+        result.nodes = self.nodes
+        result.elapsed = self._elapsed()
+        return result
+
+    # --- Search ---
+
+    def _aspiration(self, depth: int, previous: int, pv: list[Move]) -> int:
+        """Searches the root with a window around the previous score, widening
+        it on every fail until the score falls inside."""
+        if depth < 3 or abs(previous) >= MATE_THRESHOLD:
+            return self._negamax(depth, -INFINITY, INFINITY, 0, pv)
+        window = ASPIRATION_WINDOW
+        alpha, beta = previous - window, previous + window
+        while True:
+            score = self._negamax(depth, alpha, beta, 0, pv)
+            if score <= alpha:
+                alpha = max(score - window, -INFINITY)
+            elif score >= beta:
+                beta = min(score + window, INFINITY)
+            else:
+                return score
+            window *= 2
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int, pv) -> int:
+        state = self.state
+        self._pv_table[ply] = []
+        self._count_node()
+
+        key = state.zobrist_key
+        if ply and key in self._path:
+            # repeating a position of the current line, call it a draw
+            return 0
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiescence(alpha, beta, ply)
+
+        tt_move = None
+        entry = self.table.probe(key)
+        if entry is not None:
+            if entry.move:
+                tt_move = Move.from_code(entry.move, state.board.size)
+            if ply and entry.depth >= depth:
+                score = _score_from_table(entry.score, ply)
+                if (entry.bound == EXACT
+                        or (entry.bound == LOWER and score >= beta)
+                        or (entry.bound == UPPER and score <= alpha)):
+                    return score
+
+        moves = legal_moves(state) if ply else self._root_moves[:]
+        if not moves:
+            return -MATE_SCORE + ply if is_in_check(state) else 0
+
+        pv_move = pv[ply] if ply < len(pv) else None
+        self._order(moves, ply, pv_move, tt_move)
+
+        original_alpha = alpha
+        best = -INFINITY
+        best_move = None
+        self._path.append(key)
+        for move in moves:
+            # only the line of the previous principal variation follows it
+            child_pv = pv if move == pv_move else ()
+            self._make(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1, child_pv)
+            self._unmake()
+
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    best_move = move
+                    self._pv_table[ply] = [move] + self._pv_table[ply + 1]
+                    if score >= beta:
+                        self._record_cutoff(move, depth, ply)
+                        break
+        self._path.pop()
+
+        if best >= beta:
+            bound = LOWER
+        elif best > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER
+        self.table.store(key, depth, bound, _score_to_table(best, ply),
+                         best_move.to_code(state.board.size) & CODE_MASK if best_move is not None else 0)
+        return best
+
+    def _quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """Searches captures only, so that leaves are not scored in the middle
+        of an exchange. The side to move may stand pat, unless it is in check:
+        then every evasion is searched, placements included, and no evasion
+        is a mate."""
+        state = self.state
+        if ply < MAX_PLY - 1 and is_in_check(state):
+            return self._evasions(alpha, beta, ply)
+        stand_pat = self._evaluator.score()
+        if stand_pat >= beta or ply >= MAX_PLY - 1:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        captures = [move for move in legal_moves(state, placements=False) if move.flags & CAPTURE]
+        captures.sort(key=self._capture_score, reverse=True)
+        for move in captures:
+            self._count_node()
+            self._make(move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            self._unmake()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _evasions(self, alpha: int, beta: int, ply: int) -> int:
+        moves = legal_moves(self.state)
+        if not moves:
+            return -MATE_SCORE + ply
+        self._order(moves, ply, None, None)
+        for move in moves:
+            self._count_node()
+            self._make(move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            self._unmake()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _make(self, move: Move):
+        self._evaluator.push(self.state.play(move))
+
+    def _unmake(self):
+        self.state.unmake_move()
+        self._evaluator.pop()
+
+    # --- Move ordering ---
+
+    def _capture_score(self, move: Move) -> int:
+        board = self.state.board
+        values = self._values
+        attacker = board.code_at(board.square_index(move.from_pos))
+        if move.flags & EN_PASSANT:
+            return values[PieceType.PAWN.value] * 8 - values[(attacker - 1) % 6] // 8
+        victim = board.code_at(board.square_index(move.to_pos))
+        return values[(victim - 1) % 6] * 8 - values[(attacker - 1) % 6] // 8
+
+    def _order(self, moves: list[Move], ply: int, pv_move: Move | None, tt_move: Move | None):
+        killers = self._killers[ply]
+        history = self._history
+        values = self._values
+
+        def score(move: Move) -> int:
+            if move == pv_move:
+                return _PV_SCORE
+            if move == tt_move:
+                return _TT_SCORE
+            if move.flags & CAPTURE:
+                return _CAPTURE_SCORE + self._capture_score(move)
+            if move.promotion is not None:
+                return _CAPTURE_SCORE + values[move.promotion.value]
+            if move == killers[0]:
+                return _KILLER_SCORES[0]
+            if move == killers[1]:
+                return _KILLER_SCORES[1]
+            return history.get(move, 0)
+
+        moves.sort(key=score, reverse=True)
+
+    def _record_cutoff(self, move: Move, depth: int, ply: int):
+        """Remembers a quiet move that refuted the position."""
+        board = self.state.board
+        if move.drop is None and board.code_at(board.square_index(move.to_pos)):
+            return
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self._history[move] = min(self._history.get(move, 0) + depth * depth, _HISTORY_MAX)
+
+    # --- Limits ---
+
+    def _count_node(self):
+        self.nodes += 1
+        if self._max_nodes is not None and self.nodes >= self._max_nodes:
+            raise _SearchAborted
+        if self._deadline is not None and self.nodes % CHECK_EVERY == 0:
+            if time.perf_counter() >= self._deadline:
+                raise _SearchAborted
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+
+def _score_to_table(score: int, ply: int) -> int:
+    """Mate scores count plies from the root, the table stores them counted
+    from the position itself."""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_table(score: int, ply: int) -> int:
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def search(state: GameState, limits: SearchLimits | None = None) -> SearchResult:
+    """Searches the best move or placement of the side to move."""
+    return Searcher(state).search(limits)
+
+
+if __name__ == "__main__":
+    from .perft import REFERENCE_POSITIONS
+
+    for name in ("kiwipete", "kings"):
+        state = REFERENCE_POSITIONS[name].build()
+        result = search(state, SearchLimits(time_limit=2.0))
+        print(f"{name}: depth {result.depth}, score {result.score}, "
+              f"best {result.best_move}, pv {' '.join(map(str, result.pv))}, "
+              f"{result.nodes} nodes in {result.elapsed:.2f}s")
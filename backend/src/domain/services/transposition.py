@@ -0,0 +1,175 @@
+"""Transposition table: remembers search results per position hash.
+
+The table is a fixed-size, preallocated pair of flat ``array('Q')``: one for
+the 64-bit Zobrist keys, one for the packed entry data. Its size comes from a
+byte budget and never grows, however long the analysis runs.
+
+Entries are grouped in buckets of two slots:
+
+- the first slot is depth-preferred: it keeps the deepest result, unless it is
+  stale (written by an older search) or about the same position,
+- the second slot is always replaced, so recent shallow results still fit.
+
+Packed entry data (one 64-bit word)::
+
+    bits  0-23  best move (see Move.to_code, without its flags), 0 for none
+    bits 24-31  depth
+    bits 32-33  bound (EXACT, LOWER or UPPER)
+    bits 34-41  generation, the search that wrote the entry
+    bits 42-63  score, offset to be unsigned
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import NamedTuple
+
+# bound types, 0 marks an empty slot
+EXACT = 1
+LOWER = 2  # the score is at least this (fail high)
+UPPER = 3  # the score is at most this (fail low)
+
+ENTRY_BYTES = 16  # key + data
+DEFAULT_BUDGET = 8 * 1024 * 1024
+
+_MOVE_MASK = (1 << 24) - 1
+_SCORE_OFFSET = 1 << 21
+_MAX_DEPTH = 255
+_GENERATIONS = 256
+
+
+class TTEntry(NamedTuple):
+    move: int  # packed move, 0 for none
+    depth: int
+    bound: int
+    score: int
+
+
+@dataclass
+class TTStats:
+    """Counters of the table usage since the last clear."""
+    probes: int = 0
+    hits: int = 0
+    # probes that found their bucket filled by other positions
+    collisions: int = 0
+    stores: int = 0
+    # stores that evicted a different position
+    overwrites: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results keyed by Zobrist key."""
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET):
+        # the number of buckets is a power of two, so the index is a mask
+        buckets = 1
+        while buckets * 4 * ENTRY_BYTES <= budget_bytes:
+            buckets *= 2
+        if buckets * 2 * ENTRY_BYTES > budget_bytes:
+            raise ValueError(f"A budget of {budget_bytes} bytes can't hold a single bucket")
+        self._mask = buckets - 1
+        self.size = buckets * 2  # slots
+        self._keys = array("Q", bytes(8 * self.size))
+        self._data = array("Q", bytes(8 * self.size))
+        self.generation = 0
+        self.stats = TTStats()
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the slots."""
+        return self.size * ENTRY_BYTES
+
+    def new_search(self):
+        """Ages the entries written so far, making them the first to go."""
+        self.generation = (self.generation + 1) % _GENERATIONS
+
+    def clear(self):
+        """Empties the table and resets its statistics."""
+        self._keys = array("Q", bytes(8 * self.size))
+        self._data = array("Q", bytes(8 * self.size))
+        self.generation = 0
+        self.stats = TTStats()
+
+    def probe(self, key: int) -> TTEntry | None:
+        """Returns the entry stored for key, or None."""
+        stats = self.stats
+        stats.probes += 1
+        slot = (key & self._mask) << 1
+        keys = self._keys
+        if keys[slot] == key:
+            data = self._data[slot]
+        elif keys[slot + 1] == key:
+            slot += 1
+            data = self._data[slot]
+        else:
+            data = 0
+        if not (data >> 32) & 3:
+            if self._data[slot] or self._data[slot ^ 1]:
+                stats.collisions += 1
+            return None
+        stats.hits += 1
+        return TTEntry(
+            data & _MOVE_MASK,
+            (data >> 24) & 0xFF,
+            (data >> 32) & 3,
+            (data >> 42) - _SCORE_OFFSET,
+        )
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int = 0):
+        """Stores a search result for key. move is a packed move (Move.to_code)."""
+        slot = (key & self._mask) << 1
+        keys = self._keys
+        data = self._data
+        old = data[slot]
+        # the depth-preferred slot takes the entry if it is empty, about the
+        # same position, written by an older search or shallower
+        if (not old or keys[slot] == key
+                or (old >> 34) & 0xFF != self.generation
+                or depth >= (old >> 24) & 0xFF):
+            if old and keys[slot] != key:
+                # the demoted entry still gets the always-replace slot
+                self._count_overwrite(slot + 1, key)
+                keys[slot + 1] = keys[slot]
+                data[slot + 1] = old
+        else:
+            slot += 1
+            self._count_overwrite(slot, key)
+
+        if not move and keys[slot] == key:
+            # keep the best move of a previous search of the position
+            move = data[slot] & _MOVE_MASK
+        keys[slot] = key
+        data[slot] = (
+            (move & _MOVE_MASK)
+            | min(max(depth, 0), _MAX_DEPTH) << 24
+            | bound << 32
+            | self.generation << 34
+            | (score + _SCORE_OFFSET) << 42
+        )
+        self.stats.stores += 1
+
+    def _count_overwrite(self, slot: int, key: int):
+        if self._data[slot] and self._keys[slot] != key:
+            self.stats.overwrites += 1
+
+    def hashfull(self) -> int:
+        """Permille of the slots used by the current search, sampled over the
+        first thousand slots."""
+        sample = min(self.size, 1000)
+        used = sum(
+            1 for slot in range(sample)
+            if self._data[slot] and (self._data[slot] >> 34) & 0xFF == self.generation
+        )
+        return used * 1000 // sample
+
+
+if __name__ == "__main__":
+    table = TranspositionTable(1024 * 1024)
+    print(f"{table.size} slots, {table.nbytes} bytes")
+    table.store(0x1234, depth=3, bound=EXACT, score=-42, move=0x0C34)
+    print(table.probe(0x1234))  # TTEntry(move=3124, depth=3, bound=1, score=-42)
+    print(table.probe(0x5678))  # None
+    print(table.stats)
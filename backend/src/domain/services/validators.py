@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
-from ..entities.board import Board
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from time import perf_counter
 from ..entities.game_state import GameState
+from ..exceptions.game_error import InvalidMoveError, IllegalMoveError
+from ..value_objects.game_config import GameConfigStandard
 from ..value_objects.position import Position
 from ..value_objects.piece_type import PieceType, Color
+from .attacks import is_attacked
+from .placement import PlacementStatus, check_placement
 
 
 class Validator(ABC):
@@ -18,46 +24,19 @@ class Validator(ABC):
 def find_king(game_state: GameState, color: Color) -> Position | None:
     """Finds the position of the king of a given color on the board."""
     board = game_state.board
-    for r in range(board.size):
-        for c in range(board.size):
-            pos = Position(r, c)
-            piece = board.get_piece(pos)
-            if piece and piece.type == PieceType.KING and piece.color == color:
-                return pos
-    return None
+    square = board.king_square(color)
+    return board.position_of(square) if square is not None else None
 
 
 def is_square_attacked_by(
     game_state: GameState, position: Position, attacker_color: Color
 ) -> bool:
     """Checks if a square is under attack by any piece of the attacker's color."""
-    # scan all pieces of the attacker color
-    # and check if any can move to the position
+    # look backwards from the square through the precomputed attack tables
     board = game_state.board
-    for r in range(board.size):
-        for c in range(board.size):
-            attacker_pos = Position(r, c)
-            piece = board.get_piece(attacker_pos)
-
-            if piece is None or piece.color != attacker_color:
-                continue
-
-            # don't consider castling as an attack move to remove recursion error
-            if piece.type == PieceType.KING:
-                possible_moves = piece.get_possible_moves(
-                    attacker_pos, game_state, include_castling=False
-                )
-            else:
-                possible_moves = piece.get_possible_moves(attacker_pos, game_state)
-
-            if position in possible_moves:
-                if piece.type == PieceType.PAWN:
-                    # A pawn only attacks diagonally.
-                    if attacker_pos.col != position.col:
-                        return True
-                else:
-                    return True
-    return False
+    if not board.is_valid_position(position):
+        return False
+    return is_attacked(board, board.square_index(position), attacker_color)
 
 
 def is_capture(
@@ -113,23 +92,215 @@ class CheckNextValidator(Validator):
         player_color: Color,
     ) -> bool:
         """Checks if moving a piece from from_pos to to_pos would leave the king in check."""
-        # Make the move on a copy of the board
-        temp_board = game_state.board.copy()
-        piece = temp_board.get_piece(from_pos)
+        piece = game_state.board.get_piece(from_pos)
         if not piece or piece.color != player_color:
             return False  # Invalid move
-        temp_board.move_piece(from_pos, to_pos)
-
-        # Create a temporary game state for validation
-        temp_game_state = GameState(
-            board=temp_board,
-            current_player_color=game_state.current_player_color,
-            en_passant_target=game_state.en_passant_target,
-            castling_rights=game_state.castling_rights,
-        )
-
-        check = CheckNowValidator()
-        return check.validate(temp_game_state, player_color)
+
+        # Make the move in place and take it back after looking at the king
+        undo = game_state.apply_move(from_pos, to_pos)
+        try:
+            board = game_state.board
+            king_square = board.king_square(player_color)
+            return king_square is not None and is_attacked(board, king_square, ~player_color)
+        finally:
+            game_state.revert_move(undo)
+
+
+# --- Validator pipeline ---
+#
+# Rules get a uniform ValidationContext and reject a move by returning the
+# reason, None letting it through. A pipeline is compiled once per variant
+# (see compile_pipeline): its rules are picked from the game config and
+# sorted by cost, so the cheap ones run first and the first rejection stops
+# the evaluation.
+
+
+@dataclass(slots=True)
+class ValidationContext:
+    """A move or placement to validate. The pseudo-legal destinations of the
+    moving piece are generated on demand, once."""
+    state: GameState
+    to_pos: Position
+    from_pos: Position | None = None
+    piece: object = None
+    drop: PieceType | None = None
+    _destinations: list | None = None
+    _placement_status: PlacementStatus | None = None
+    # time spent generating the destinations, in seconds
+    generation_time: float = 0.0
+
+    @property
+    def color(self) -> Color:
+        return self.state.current_player_color
+
+    def destinations(self) -> list[Position]:
+        if self._destinations is None:
+            start = perf_counter()
+            self._destinations = self.piece.get_possible_moves(self.from_pos, self.state)
+            self.generation_time = perf_counter() - start
+        return self._destinations
+
+    def placement_status(self) -> PlacementStatus:
+        if self._placement_status is None:
+            self._placement_status = check_placement(self.state, self.drop, self.to_pos)
+        return self._placement_status
+
+
+class Rule(ABC):
+    """A rule of a validator pipeline. cost ranks the rules, cheapest first;
+    error is the exception raised when the rule rejects a move."""
+
+    name: str = "rule"
+    cost: int = 10
+    error: type[Exception] = InvalidMoveError
+
+    @abstractmethod
+    def check(self, context: ValidationContext) -> str | None:
+        """Returns why the move is rejected, None when it is allowed."""
+
+
+class PieceOwnershipRule(Rule):
+    name = "piece_ownership"
+    cost = 1
+
+    def check(self, context: ValidationContext) -> str | None:
+        if context.piece is None:
+            return "No piece at the source position"
+        if context.piece.color != context.color:
+            return "It's not your turn to move this piece"
+        return None
+
+
+class NoCastlingRule(Rule):
+    """For variants without castling."""
+    name = "no_castling"
+    cost = 2
+
+    def check(self, context: ValidationContext) -> str | None:
+        if context.piece.type == PieceType.KING and abs(context.to_pos.col - context.from_pos.col) == 2:
+            return "Castling is disabled in this game"
+        return None
+
+
+class PieceMovementRule(Rule):
+    name = "piece_movement"
+    cost = 20
+
+    def check(self, context: ValidationContext) -> str | None:
+        if context.to_pos not in context.destinations():
+            return "Invalid move for this piece"
+        return None
+
+
+class KingSafetyRule(Rule):
+    name = "king_safety"
+    cost = 50
+
+    def check(self, context: ValidationContext) -> str | None:
+        # simulate the move and check if the current player's king would be in check
+        if CheckNextValidator().validate(context.state, context.from_pos, context.to_pos, context.color):
+            return "Move would leave king in check"
+        return None
+
+
+class PlacementTurnRule(Rule):
+    name = "placement_turn"
+    cost = 1
+
+    def check(self, context: ValidationContext) -> str | None:
+        if context.piece.color != context.color:
+            return "It's not your turn to place this piece"
+        return None
+
+
+class PlacementRule(Rule):
+    """Phase, reserve, turn limit and square of a placement."""
+    name = "placement"
+    cost = 30
+
+    def check(self, context: ValidationContext) -> str | None:
+        status = context.placement_status()
+        if status.is_legal or status is PlacementStatus.KING_IN_CHECK:
+            return None
+        return f"Invalid placement: {status.name.lower().replace('_', ' ')}"
+
+
+class PlacementKingSafetyRule(Rule):
+    """The king safety part of check_placement, which looks at the king
+    last, after the checks of PlacementRule. An illegal rather than invalid
+    placement."""
+    name = "placement_king_safety"
+    cost = 31
+    error = IllegalMoveError
+
+    def check(self, context: ValidationContext) -> str | None:
+        if context.placement_status() is PlacementStatus.KING_IN_CHECK:
+            return "This placement leaves your king in check"
+        return None
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    rejections: int = 0
+    time: float = 0.0  # seconds
+
+
+class ValidatorPipeline:
+    """Rules sorted by cost, run in order until one rejects the move.
+
+    Every rule reports its calls, rejections and time. Pipelines are shared
+    by the games of a variant, so under threads the counts are approximate.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rules: tuple[Rule, ...] = tuple(sorted(rules, key=lambda rule: rule.cost))
+        self.stats: dict[str, RuleStats] = {rule.name: RuleStats() for rule in self.rules}
+        self._steps = tuple((rule.check, rule.error, self.stats[rule.name]) for rule in self.rules)
+
+    def validate(self, context: ValidationContext):
+        """Raises the error of the first rule rejecting the move."""
+        for check, error, stats in self._steps:
+            start = perf_counter()
+            reason = check(context)
+            stats.time += perf_counter() - start
+            stats.calls += 1
+            if reason is not None:
+                stats.rejections += 1
+                raise error(reason)
+
+    def __repr__(self) -> str:
+        return f"ValidatorPipeline({', '.join(rule.name for rule in self.rules)})"
+
+
+@dataclass(frozen=True)
+class Variant:
+    """The config fields that decide which rules a game runs."""
+    movement: bool = True
+    enable_castling: bool = True
+
+
+def variant_of(config: GameConfigStandard | None) -> Variant:
+    if config is None:
+        return Variant()
+    return Variant(enable_castling=config.enable_castling)
+
+
+@lru_cache(maxsize=None)
+def _compile(variant: Variant) -> ValidatorPipeline:
+    if variant.movement:
+        rules = [PieceOwnershipRule(), PieceMovementRule(), KingSafetyRule()]
+        if not variant.enable_castling:
+            rules.append(NoCastlingRule())
+    else:
+        rules = [PlacementTurnRule(), PlacementRule(), PlacementKingSafetyRule()]
+    return ValidatorPipeline(rules)
+
+
+def compile_pipeline(config: GameConfigStandard | None, placements: bool = False) -> ValidatorPipeline:
+    """The pipeline validating the moves (or the placements) of a variant,
+    compiled on the first call and shared afterwards."""
+    return _compile(replace(variant_of(config), movement=not placements))
 
 
 # TODO: Implement other specific rule validators
@@ -0,0 +1,44 @@
+"""Helpers for working with bitboards.
+
+A bitboard is a plain python int used as a set of squares: bit ``i`` is set
+when square ``i`` belongs to the set. Squares are numbered row-major,
+``index = row * size + col``, so square 0 is the top-left corner (a8 on a
+standard board).
+"""
+
+from typing import Iterator
+
+
+def square_bit(square: int) -> int:
+    """Returns the mask with only the given square set."""
+    return 1 << square
+
+
+def popcount(mask: int) -> int:
+    """Returns the number of squares in the mask."""
+    return mask.bit_count()
+
+
+def lsb(mask: int) -> int:
+    """Returns the index of the lowest set square. The mask must not be empty."""
+    return (mask & -mask).bit_length() - 1
+
+
+def msb(mask: int) -> int:
+    """Returns the index of the highest set square. The mask must not be empty."""
+    return mask.bit_length() - 1
+
+
+def iter_squares(mask: int) -> Iterator[int]:
+    """Yields the index of every set square, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+if __name__ == "__main__":
+    mask = square_bit(0) | square_bit(9) | square_bit(63)
+    print(popcount(mask))  # Output: 3
+    print(lsb(mask), msb(mask))  # Output: 0 63
+    print(list(iter_squares(mask)))  # Output: [0, 9, 63]
@@ -1,14 +1,61 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
 from typing import Dict, Optional
-from ..value_objects.piece_type import PieceType
+from ..value_objects.piece_type import Color, PieceType
 
- 
-@dataclass 
+
+@dataclass(frozen=True)
+class EvaluationWeights:
+    """Weights of the static evaluation (see services.evaluation), per piece
+    type indexed by PieceType value, in centipawns."""
+    piece_values: tuple[int, ...] = (100, 320, 330, 500, 900, 0)
+    # pieces in hand count for this share of their value
+    reserve_percent: int = 90
+    # bonus per step from the edge towards the center
+    center_bonus: tuple[int, ...] = (2, 5, 3, 0, 0, 0)
+    # bonus per square a piece would reach on an empty board, a cheap
+    # stand-in for mobility
+    mobility: tuple[int, ...] = (0, 1, 1, 0, 1, 0)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EvaluationWeights":
+        """Reads weights from a variant's configuration, e.g.
+        ``{"piece_values": {"N": 300}, "reserve_percent": 80}``. Per piece
+        weights are keyed by letter (P, N, B, R, Q, K), missing ones keep
+        their default."""
+        weights = cls()
+        changes = {}
+        for name, value in data.items():
+            if name not in {field.name for field in fields(cls)}:
+                raise ValueError(f"Unknown evaluation weight: {name}")
+            if isinstance(value, dict):
+                per_piece = list(getattr(weights, name))
+                for letter, weight in value.items():
+                    if letter not in _LETTERS:
+                        raise ValueError(f"Unknown piece in evaluation weights: {letter}")
+                    per_piece[_LETTERS[letter].value] = int(weight)
+                value = tuple(per_piece)
+            elif isinstance(value, list):
+                value = tuple(value)
+            changes[name] = value
+        return replace(weights, **changes)
+
+
+_LETTERS = {piece_type.algebraic or "P": piece_type for piece_type in PieceType}
+DEFAULT_WEIGHTS = EvaluationWeights()
+
+
+@dataclass
 class GameConfigStandard:
     allowed_pieces: Dict[PieceType, int]
     max_placement_turns: Optional[int] = None
     pawn_promotion_distance: int = 2
     enable_castling: bool = True
+    # weights of the bots' evaluation, the defaults when None
+    evaluation: Optional[EvaluationWeights] = None
+
+    def initial_reserves(self) -> Dict[Color, Dict[PieceType, int]]:
+        """Pieces each player starts with in hand, the same for both colors."""
+        return {color: dict(self.allowed_pieces) for color in Color}
 
 # TODO it would be optimal to have the GameConfig as a base class that has
 # all the possible attributes, and then have inherited specific modes like
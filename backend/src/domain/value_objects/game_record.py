@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+from .move import Move, MoveList
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+
+@dataclass
+class GameRecord:
+    """A played game: the starting position (extended FEN), the moves and
+    placements in order (a list, or a MoveList as read from a database), the
+    result and free-form headers (event, players...)."""
+    fen: str
+    moves: list[Move] | MoveList = field(default_factory=list)
+    result: str = "*"
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.result not in RESULTS:
+            raise ValueError(f"Invalid game result: {self.result}")
@@ -0,0 +1,80 @@
+"""Board geometry: the rows and columns the rules depend on, per board size.
+
+On an n x n board white starts on the last two rows and black on the first
+two, as in chess. Pawns start on the second row of their side, promote on
+the far row and can be taken en passant by a pawn standing two rows past
+their start. The king starts on column n // 2 (the e-file on 8x8) and castles
+two squares towards a corner rook, which lands on the square it crossed.
+
+Tuples indexed by ``color.value`` give the value of each color.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .piece_type import Color
+
+
+@dataclass(frozen=True, slots=True)
+class CastlingPath:
+    """Squares (indices) of one castling move of one color."""
+    king_from: int
+    king_to: int
+    rook_from: int
+    rook_to: int
+    # squares between the king and the rook, which must be empty
+    empty: int
+    # the squares the king crosses and lands on, which must not be attacked
+    passes: tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class Geometry:
+    size: int
+    home_row: tuple[int, int]
+    pawn_row: tuple[int, int]
+    promotion_row: tuple[int, int]
+    # the row a pawn stands on to take en passant
+    en_passant_row: tuple[int, int]
+    # forward step of the pawns in square indices
+    pawn_step: tuple[int, int]
+    king_column: int
+    # castling[color.value] is {'kingside': path, 'queenside': path}
+    castling: tuple[dict[str, CastlingPath], dict[str, CastlingPath]]
+
+
+def _castling(size: int, row: int, king_column: int) -> dict[str, CastlingPath]:
+    row_start = row * size
+    king = row_start + king_column
+    paths = {}
+    for side, rook, step in (('kingside', row_start + size - 1, 1), ('queenside', row_start, -1)):
+        low, high = min(king, rook), max(king, rook)
+        empty = sum(1 << square for square in range(low + 1, high))
+        paths[side] = CastlingPath(king, king + 2 * step, rook, king + step, empty,
+                                   (king + step, king + 2 * step))
+    return paths
+
+
+@lru_cache(maxsize=None)
+def geometry(size: int) -> Geometry:
+    """The geometry of a board of the given size."""
+    last = size - 1
+    king_column = size // 2
+    return Geometry(
+        size=size,
+        home_row=(last, 0),
+        pawn_row=(last - 1, 1),
+        promotion_row=(0, last),
+        en_passant_row=(3, last - 3),
+        pawn_step=(-size, size),
+        king_column=king_column,
+        castling=(_castling(size, last, king_column), _castling(size, 0, king_column)),
+    )
+
+
+if __name__ == "__main__":
+    for size in (8, 10, 12):
+        g = geometry(size)
+        white = g.castling[Color.WHITE.value]
+        print(size, "pawns", g.pawn_row, "en passant", g.en_passant_row,
+              "O-O", white['kingside'].king_from, "->", white['kingside'].king_to)
@@ -0,0 +1,172 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+from .position import Position
+from .piece_type import PieceType
+
+# What a move does besides going from a square to another, known to the
+# generator that makes it. En passant moves are captures as well.
+CAPTURE = 1
+EN_PASSANT = 2
+CASTLE = 4
+DOUBLE_PUSH = 8
+
+_FLAGS_SHIFT = 22
+# the bits of a packed move that identify it, flags left out
+CODE_MASK = (1 << _FLAGS_SHIFT) - 1
+
+
+def _square(position: Position, size: int | None) -> int:
+    # positions made without a size are 8x8 ones, their index is off on other boards
+    if size is None or position.size == size:
+        return position.index
+    return position.row * size + position.col
+
+
+@dataclass(frozen=True, slots=True)
+class Move:
+    """Represents a move or a placement (drop) of a piece from the reserves.
+    Placements have no source position and carry the type of the dropped piece.
+
+    flags (CAPTURE, EN_PASSANT, CASTLE, DOUBLE_PUSH) are set by the move
+    generator and left out of comparisons: a move typed by a player equals
+    the generated one."""
+    from_pos: Position | None
+    to_pos: Position
+    promotion: PieceType | None = None
+    drop: PieceType | None = None
+    flags: int = field(default=0, compare=False)
+
+    @property
+    def is_drop(self) -> bool:
+        return self.drop is not None
+
+    @property
+    def is_capture(self) -> bool:
+        return bool(self.flags & CAPTURE)
+
+    @property
+    def is_en_passant(self) -> bool:
+        return bool(self.flags & EN_PASSANT)
+
+    @property
+    def is_castle(self) -> bool:
+        return bool(self.flags & CASTLE)
+
+    @property
+    def is_double_push(self) -> bool:
+        return bool(self.flags & DOUBLE_PUSH)
+
+    def to_code(self, size: int | None = None) -> int:
+        """Packs the move in an int: target square in bits 0-7, source square
+        in bits 8-15, then promotion and dropped piece type (plus one, 0 for
+        none) in 3 bits each and the flags in bits 22-25. No real move packs
+        to 0, and code & CODE_MASK identifies the move.
+
+        Squares are indexed on a board of the given size, by default the
+        size the positions were made for."""
+        code = _square(self.to_pos, size) | self.flags << _FLAGS_SHIFT
+        if self.from_pos is not None:
+            code |= _square(self.from_pos, size) << 8
+        if self.promotion is not None:
+            code |= (self.promotion.value + 1) << 16
+        if self.drop is not None:
+            code |= (self.drop.value + 1) << 19
+        return code
+
+    def for_size(self, size: int) -> "Move":
+        """The same move with the positions of a board of the given size,
+        which name its squares right (a position made without a size names
+        them as on an 8x8 board)."""
+        if self.to_pos.size == size and (self.from_pos is None or self.from_pos.size == size):
+            return self
+        return Move.from_code(self.to_code(size), size)
+
+    @classmethod
+    def from_code(cls, code: int, size: int = 8) -> "Move":
+        """Unpacks a move packed by to_code, for a board of the given size."""
+        positions = Position.table(size)
+        promotion = (code >> 16) & 7
+        drop = (code >> 19) & 7
+        return cls(
+            None if drop else positions[(code >> 8) & 0xFF],
+            positions[code & 0xFF],
+            PieceType(promotion - 1) if promotion else None,
+            PieceType(drop - 1) if drop else None,
+            code >> _FLAGS_SHIFT,
+        )
+
+    def __str__(self) -> str:
+        """Coordinate notation, e.g. 'e2e4', 'e7e8q' or 'N@e4'."""
+        if self.drop is not None:
+            return f"{self.drop.algebraic or 'P'}@{self.to_pos.algebraic()}"
+        promotion = self.promotion.algebraic.lower() if self.promotion else ""
+        return f"{self.from_pos.algebraic()}{self.to_pos.algebraic()}{promotion}"
+
+
+class MoveList:
+    """A list of moves stored packed, 4 bytes a move, in an array('I').
+    Moves are decoded on access; codes gives the packed moves themselves,
+    to store or compare them without decoding."""
+
+    __slots__ = ("codes", "size")
+
+    def __init__(self, moves: Iterable[Move] = (), size: int = 8):
+        self.codes = array("I", (move.to_code(size) for move in moves))
+        self.size = size
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[int], size: int = 8) -> "MoveList":
+        moves = cls(size=size)
+        moves.codes.extend(codes)
+        return moves
+
+    def append(self, move: Move):
+        self.codes.append(move.to_code(self.size))
+
+    def extend(self, moves: Iterable[Move]):
+        size = self.size
+        self.codes.extend(move.to_code(size) for move in moves)
+
+    def pop(self) -> Move:
+        return Move.from_code(self.codes.pop(), self.size)
+
+    def clear(self):
+        del self.codes[:]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MoveList.from_codes(self.codes[index], self.size)
+        return Move.from_code(self.codes[index], self.size)
+
+    def __iter__(self) -> Iterator[Move]:
+        size = self.size
+        return (Move.from_code(code, size) for code in self.codes)
+
+    def __contains__(self, move: Move) -> bool:
+        code = move.to_code(self.size) & CODE_MASK
+        return any(other & CODE_MASK == code for other in self.codes)
+
+    def __eq__(self, other) -> bool:
+        """Equal to the moves of another MoveList or list, flags aside."""
+        if isinstance(other, MoveList):
+            return (len(self) == len(other)
+                    and all(a & CODE_MASK == b & CODE_MASK for a, b in zip(self.codes, other.codes)))
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MoveList([{', '.join(map(str, self))}])"
+
+
+if __name__ == "__main__":
+    print(Move(Position.from_algebraic("e2"), Position.from_algebraic("e4")))  # Output: e2e4
+    print(Move(None, Position.from_algebraic("e4"), drop=PieceType.KNIGHT))  # Output: N@e4
+    moves = MoveList([Move(Position.from_algebraic("e2"), Position.from_algebraic("e4"), flags=DOUBLE_PUSH)])
+    print(moves, moves.codes.itemsize * len(moves), "bytes")  # Output: MoveList([e2e4]) 4 bytes
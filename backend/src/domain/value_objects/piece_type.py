@@ -26,7 +26,14 @@ class PieceType(Enum):
             return ""
         # For other pieces, use the first letter of their name, except for KNIGHT.
         return "N" if self == PieceType.KNIGHT else self.name[0]
-    
+
+
+def piece_code(piece_type: PieceType, color: Color) -> int:
+    """Small integer code of a (type, color) pair, from 1 to 12.
+    0 is left free to mean an empty square."""
+    return 1 + color.value * len(PieceType) + piece_type.value
+
+
 if __name__ == "__main__":
     # Example usage
     print(PieceType.PAWN.algebraic)  # Output: ""
@@ -1,35 +1,109 @@
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError
 from ..exceptions.game_error import InvalidMoveError
 
+FILES = "abcdefghijklmnop"
+
+# interned positions per board size, indexed by square, and by algebraic name
+_TABLES: dict[int, tuple["Position", ...]] = {}
+_BY_NAME: dict[int, dict[str, "Position"]] = {}
+
 
-@dataclass(frozen=True, repr=True)
 class Position:
-    """Represents a position on the board."""
-    row: int
-    col: int
+    """Represents a position on the board.
+
+    Positions are immutable flyweights: the squares of a board of a given size
+    are built once, each with its square index (``row * size + col``) and its
+    algebraic name, and ``Position(row, col)`` returns the shared instance.
+    Positions outside the board are still allowed (pieces probe them while
+    generating moves), but those are not interned.
+    """
+
+    __slots__ = ("row", "col", "size", "index", "_hash", "_algebraic")
+
+    def __new__(cls, row: int, col: int, size: int = 8) -> "Position":
+        if 0 <= row < size and 0 <= col < size:
+            table = _TABLES.get(size) or cls.table(size)
+            return table[row * size + col]
+        return cls._make(row, col, size)
+
+    @classmethod
+    def _make(cls, row: int, col: int, size: int) -> "Position":
+        self = object.__new__(cls)
+        on_board = 0 <= row < size and 0 <= col < size
+        object.__setattr__(self, "row", row)
+        object.__setattr__(self, "col", col)
+        object.__setattr__(self, "size", size)
+        object.__setattr__(self, "index", row * size + col if on_board else -1)
+        object.__setattr__(self, "_hash", hash((row, col)))
+        object.__setattr__(self, "_algebraic", f"{FILES[col]}{size - row}" if on_board else None)
+        return self
+
+    @classmethod
+    def table(cls, size: int = 8) -> tuple["Position", ...]:
+        """Returns the interned positions of a board of the given size,
+        indexed by square index."""
+        table = _TABLES.get(size)
+        if table is None:
+            if size > len(FILES):
+                raise ValueError(f"Boards bigger than {len(FILES)}x{len(FILES)} are not supported")
+            table = tuple(cls._make(sq // size, sq % size, size) for sq in range(size * size))
+            _TABLES[size] = table
+            _BY_NAME[size] = {pos._algebraic: pos for pos in table}
+        return table
+
+    @classmethod
+    def from_index(cls, index: int, size: int = 8) -> "Position":
+        """Returns the interned position of a square index."""
+        return (_TABLES.get(size) or cls.table(size))[index]
 
     def algebraic(self) -> str:
         """Returns the algebraic notation of the position."""
-        file = "abcdefgh"[self.col]
-        rank = 8 - self.row
+        if self._algebraic is not None:
+            return self._algebraic
+        file = FILES[self.col]
+        rank = self.size - self.row
         return f"{file}{rank}"
 
     @classmethod
-    def from_algebraic(cls, notation: str) -> "Position":
+    def from_algebraic(cls, notation: str, size: int = 8) -> "Position":
         """Creates a Position object from algebraic notation (e.g., 'e4').
         Useful as an alternative constructor.
         """
-        if not (
-            isinstance(notation, str)
-            and len(notation) == 2
-            and "a" <= notation[0] <= "h"
-            and "1" <= notation[1] <= "8"
-        ):
+        if size not in _BY_NAME:
+            cls.table(size)
+        position = _BY_NAME[size].get(notation) if isinstance(notation, str) else None
+        if position is None:
             raise InvalidMoveError(f"Invalid algebraic notation: {notation}")
+        return position
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other) -> bool:
+        if other is self:
+            return True
+        if isinstance(other, Position):
+            return self.row == other.row and self.col == other.col
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Position(row={self.row}, col={self.col})"
+
+    def __reduce__(self):
+        # unpickled positions come back as the interned instances
+        return (Position, (self.row, self.col, self.size))
+
+    def __copy__(self):
+        return self
 
-        col = "abcdefgh".index(notation[0])
-        row = 8 - int(notation[1])
-        return cls(row, col)
+    def __deepcopy__(self, memo):
+        return self
 
 
 if __name__ == "__main__":
@@ -48,3 +122,4 @@ if __name__ == "__main__":
     pos_from_alg = Position.from_algebraic("e5")
     print(f"Position from 'e5': {pos_from_alg}")
     print(f"Are pos3 and pos_from_alg the same? {pos3 == pos_from_alg}")
+    print(f"Are they the same object? {pos3 is pos_from_alg}")  # Output: True
@@ -0,0 +1,115 @@
+"""Fan-out of game updates to their subscribers (players and spectators).
+
+Every update is encoded once by the publisher and the same message object
+is queued for every subscriber of the game, so the cost of a move does not
+grow with the serialization work per spectator, only with a queue put each.
+
+Each subscriber has a bounded queue. Publishing never waits: when a slow
+consumer's queue is full, its pending updates are dropped and replaced by a
+single RESYNC marker, telling it to fetch the full state and carry on from
+there. Until it does, nothing more is queued for it, the state covers it.
+A stalled connection therefore costs a bounded amount of memory and never
+holds back the others.
+
+Queues are asyncio queues, publish and subscribe on the event loop thread.
+"""
+
+import asyncio
+from collections import defaultdict
+
+DEFAULT_MAX_PENDING = 64
+
+
+class _Marker:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+# the subscriber fell behind and must fetch the full state
+RESYNC = _Marker("RESYNC")
+# the game is over for the subscriber, no more updates will come
+CLOSED = _Marker("CLOSED")
+
+
+class Subscription:
+    """The queue of updates of one subscriber to one game."""
+
+    def __init__(self, broadcaster: "Broadcaster", game_id: str, max_pending: int):
+        self.game_id = game_id
+        self._broadcaster = broadcaster
+        self._queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self._resync_pending = False
+        # times the subscriber fell behind
+        self.resyncs = 0
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def _offer(self, message):
+        if self._resync_pending and message is not CLOSED:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            if message is CLOSED:
+                self._queue.put_nowait(CLOSED)
+            else:
+                self._queue.put_nowait(RESYNC)
+                self._resync_pending = True
+                self.resyncs += 1
+
+    async def get(self):
+        """The next message, RESYNC or CLOSED."""
+        message = await self._queue.get()
+        if message is RESYNC:
+            self._resync_pending = False
+        return message
+
+    def close(self):
+        self._broadcaster.unsubscribe(self)
+
+
+class Broadcaster:
+    """Subscriptions to the updates of every game, by game id."""
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, game_id: str) -> Subscription:
+        subscription = Subscription(self, game_id, self.max_pending)
+        self._subscriptions[game_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.game_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.game_id]
+
+    def subscribers(self, game_id: str) -> int:
+        subscriptions = self._subscriptions.get(game_id)
+        return len(subscriptions) if subscriptions else 0
+
+    def publish(self, game_id: str, message) -> int:
+        """Queues an encoded message for every subscriber of a game, returns
+        how many got it."""
+        subscriptions = self._subscriptions.get(game_id)
+        if not subscriptions:
+            return 0
+        for subscription in subscriptions:
+            subscription._offer(message)
+        return len(subscriptions)
+
+    def close(self, game_id: str):
+        """Ends the subscriptions of a game, their subscribers get CLOSED."""
+        for subscription in self._subscriptions.pop(game_id, ()):
+            subscription._offer(CLOSED)
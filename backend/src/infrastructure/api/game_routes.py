@@ -0,0 +1,218 @@
+"""Game routes of the API, backed by the in-memory SessionManager.
+
+    POST   /games              start a game
+    GET    /games/{id}         state of a game
+    DELETE /games/{id}         end a game, returns its record in SAN
+    GET    /games/{id}/moves   legal moves and placements of the side to move,
+                               ?square=e2 for the moves of one piece
+    POST   /games/{id}/moves   play a move (e2e4, e7e8q, N@e4 or SAN)
+    POST   /games/{id}/bot     let the computer play the side to move
+    WS     /games/{id}/ws      live updates, and moves from players
+    GET    /games/stats/move-cache   hit rate of the legal move cache
+    GET    /games/stats/engine       move event counters and phase timers
+
+The WebSocket first sends the state of the game ({"type": "state", ...}),
+then a delta for every move ({"type": "move", ...}, see
+session_manager.move_delta). A client that falls behind gets the full state
+again instead of the deltas it missed; deltas carry the version of the game
+after the move, those not newer than the last state received are stale.
+Clients can send moves as {"move": "e2e4"}, errors come back as
+{"type": "error", "detail": ...}.
+"""
+
+import asyncio
+import json
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field
+
+from src.domain.entities.zobrist import MAX_COUNT
+from src.domain.exceptions.game_error import GameError
+from src.domain.services.notation import record_to_san
+from src.domain.services.instrumentation import MetricsInstrumentation
+from src.domain.services.search import SearchLimits
+from src.domain.value_objects.game_config import GameConfigStandard
+from src.domain.value_objects.piece_type import PieceType
+from .broadcast import RESYNC, CLOSED
+from .session_manager import SessionManager, SessionNotFoundError, SessionLimitError
+
+_PIECE_LETTERS = {piece_type.algebraic or "P": piece_type for piece_type in PieceType}
+
+# reserve and placement turn counters are hashed with one key per value
+_Count = Annotated[int, Field(ge=0, lt=MAX_COUNT)]
+
+router = APIRouter(prefix="/games", tags=["games"])
+metrics = MetricsInstrumentation()
+manager = SessionManager(instrumentation=metrics)
+
+
+def get_manager() -> SessionManager:
+    return manager
+
+
+class CreateGameRequest(BaseModel):
+    fen: str | None = None
+    # pieces each player gets to place, by letter, e.g. {"Q": 1, "N": 2, "P": 2}
+    reserves: dict[str, _Count] | None = None
+    max_placement_turns: _Count | None = None
+    pawn_promotion_distance: int = 2
+    enable_castling: bool = True
+
+
+class MoveRequest(BaseModel):
+    move: str = Field(min_length=2, max_length=16)
+
+
+class BotRequest(BaseModel):
+    time_limit: float = Field(1.0, gt=0, le=30)
+    max_depth: int | None = Field(None, ge=1, le=32)
+
+
+def _not_found(error: SessionNotFoundError) -> HTTPException:
+    return HTTPException(status_code=404, detail=str(error))
+
+
+@router.post("", status_code=201)
+async def create_game(request: CreateGameRequest, sessions: SessionManager = Depends(get_manager)):
+    config = None
+    if request.reserves is not None:
+        unknown = set(request.reserves) - set(_PIECE_LETTERS)
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown pieces: {', '.join(sorted(unknown))}")
+        config = GameConfigStandard(
+            {_PIECE_LETTERS[letter]: count for letter, count in request.reserves.items()},
+            request.max_placement_turns, request.pawn_promotion_distance, request.enable_castling,
+        )
+    try:
+        session = sessions.create(request.fen, config)
+    except (ValueError, GameError) as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    except SessionLimitError as error:
+        raise HTTPException(status_code=503, detail=str(error))
+    return await sessions.snapshot(session.id)
+
+
+@router.get("/stats/move-cache")
+async def move_cache_stats(sessions: SessionManager = Depends(get_manager)):
+    cache = sessions.move_cache
+    return {"positions": len(cache), "capacity": cache.capacity, **cache.stats.as_dict()}
+
+
+@router.get("/stats/engine")
+async def engine_stats():
+    return metrics.snapshot().as_dict()
+
+
+@router.get("/{game_id}")
+async def get_game(game_id: str, sessions: SessionManager = Depends(get_manager)):
+    try:
+        return await sessions.snapshot(game_id)
+    except SessionNotFoundError as error:
+        raise _not_found(error)
+
+
+@router.delete("/{game_id}")
+async def end_game(game_id: str, sessions: SessionManager = Depends(get_manager)):
+    try:
+        record = sessions.remove(game_id)
+    except SessionNotFoundError as error:
+        raise _not_found(error)
+    return {"fen": record.fen, "moves": record_to_san(record), "result": record.result}
+
+
+@router.get("/{game_id}/moves")
+async def get_legal_moves(game_id: str, square: str | None = None,
+                          sessions: SessionManager = Depends(get_manager)):
+    try:
+        return {"moves": await sessions.legal_moves(game_id, square)}
+    except SessionNotFoundError as error:
+        raise _not_found(error)
+    except GameError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+
+
+@router.post("/{game_id}/moves")
+async def play_move(game_id: str, request: MoveRequest, sessions: SessionManager = Depends(get_manager)):
+    try:
+        san, game = await sessions.play(game_id, request.move)
+    except SessionNotFoundError as error:
+        raise _not_found(error)
+    except GameError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    return {"san": san, "game": game}
+
+
+@router.post("/{game_id}/bot")
+async def play_bot(game_id: str, request: BotRequest, sessions: SessionManager = Depends(get_manager)):
+    limits = SearchLimits(max_depth=request.max_depth, time_limit=request.time_limit)
+    try:
+        san, game = await sessions.play_bot(game_id, limits)
+    except SessionNotFoundError as error:
+        raise _not_found(error)
+    except GameError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    return {"san": san, "game": game}
+
+
+@router.websocket("/{game_id}/ws")
+async def game_updates(websocket: WebSocket, game_id: str, sessions: SessionManager = Depends(get_manager)):
+    try:
+        subscription, game = await sessions.subscribe(game_id)
+    except SessionNotFoundError:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    tasks = [
+        asyncio.create_task(_send_updates(websocket, subscription, game, sessions)),
+        asyncio.create_task(_receive_moves(websocket, game_id, sessions)),
+    ]
+    try:
+        # either side ending (disconnect, game over) ends the connection
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        subscription.close()
+        for task in tasks:
+            task.cancel()
+
+
+async def _send_updates(websocket: WebSocket, subscription, game: dict, sessions: SessionManager):
+    try:
+        await websocket.send_json({"type": "state", **game})
+        while True:
+            message = await subscription.get()
+            if message is CLOSED:
+                await websocket.close()
+                return
+            if message is RESYNC:
+                # the subscriber missed updates, send the whole game again
+                try:
+                    game = await sessions.snapshot(subscription.game_id)
+                except SessionNotFoundError:
+                    await websocket.close()
+                    return
+                await websocket.send_json({"type": "state", **game})
+            else:
+                # encoded once by the publisher for every subscriber
+                await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+
+
+async def _receive_moves(websocket: WebSocket, game_id: str, sessions: SessionManager):
+    """Plays the moves a player sends over the socket, the resulting deltas
+    come back through the subscription like for everyone else."""
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                move = json.loads(text)["move"]
+                if not isinstance(move, str):
+                    raise TypeError("move must be a string")
+                await sessions.play(game_id, move)
+            except (ValueError, KeyError, TypeError):
+                await websocket.send_json({"type": "error", "detail": "Expected {\"move\": ...}"})
+            except (GameError, SessionNotFoundError) as error:
+                await websocket.send_json({"type": "error", "detail": str(error)})
+    except WebSocketDisconnect:
+        pass
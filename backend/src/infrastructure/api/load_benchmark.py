@@ -0,0 +1,247 @@
+"""Local load test of the game API.
+
+Simulated clients each start a game and play it out with random legal moves
+(listing the moves, playing one, reading the state back), starting a new
+game when one ends, until the request budget is spent. Reports the
+requests per second and the latency percentiles per route.
+
+Run from ``backend``::
+
+    python -m src.infrastructure.api.load_benchmark                # app in-process, over ASGI
+    python -m src.infrastructure.api.load_benchmark --direct       # session manager only
+    python -m src.infrastructure.api.load_benchmark --url http://127.0.0.1:8000
+
+The ASGI mode drives the FastAPI app without a network, the URL mode talks
+HTTP/1.1 with keep-alive to a running server (``uvicorn main:app``).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from src.domain.exceptions.game_error import GameError
+from .session_manager import SessionManager, DEFAULT_MAX_SESSIONS
+
+PREFIX = "/api/v1/games"
+
+
+class _DirectClient:
+    """Calls the session manager itself, without HTTP."""
+
+    def __init__(self, manager: SessionManager):
+        self.manager = manager
+
+    async def create(self) -> str:
+        return self.manager.create().id
+
+    async def moves(self, game_id: str) -> list[str]:
+        return await self.manager.legal_moves(game_id)
+
+    async def play(self, game_id: str, move: str) -> bool:
+        try:
+            _, game = await self.manager.play(game_id, move)
+        except GameError:
+            return False
+        return game["status"] == "active"
+
+    async def state(self, game_id: str):
+        return await self.manager.snapshot(game_id)
+
+    async def end(self, game_id: str):
+        self.manager.remove(game_id)
+
+
+class _HttpClient:
+    """Calls the API routes through a request(method, path, body) function."""
+
+    def __init__(self, request):
+        self.request = request
+
+    async def create(self) -> str:
+        status, body = await self.request("POST", PREFIX, {})
+        if status != 201:
+            raise RuntimeError(f"create failed with {status}: {body}")
+        return body["id"]
+
+    async def moves(self, game_id: str) -> list[str]:
+        _, body = await self.request("GET", f"{PREFIX}/{game_id}/moves", None)
+        return body["moves"]
+
+    async def play(self, game_id: str, move: str) -> bool:
+        status, body = await self.request("POST", f"{PREFIX}/{game_id}/moves", {"move": move})
+        return status == 200 and body["game"]["status"] == "active"
+
+    async def state(self, game_id: str):
+        return await self.request("GET", f"{PREFIX}/{game_id}", None)
+
+    async def end(self, game_id: str):
+        await self.request("DELETE", f"{PREFIX}/{game_id}", None)
+
+
+def _asgi_requester(app):
+    """Sends requests straight to an ASGI app."""
+
+    async def request(method: str, path: str, body) -> tuple[int, object]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+            "query_string": b"", "root_path": "",
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(payload)).encode())],
+            "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+        }
+        received = False
+        status = 0
+        chunks = []
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            # the client never disconnects
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await app(scope, receive, send)
+        data = b"".join(chunks)
+        return status, json.loads(data) if data else None
+
+    return request
+
+
+class _Connection:
+    """A keep-alive HTTP/1.1 connection, responses with a Content-Length only."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, path: str, body) -> tuple[int, object]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while (line := await self._reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        data = await self._reader.readexactly(length)
+        return status, json.loads(data) if data else None
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+async def _client(api, budget: list[int], latencies: dict[str, list[float]], rng: random.Random):
+    """Plays random games until the shared request budget runs out."""
+
+    async def timed(route: str, call):
+        budget[0] -= 1
+        start = time.perf_counter()
+        result = await call
+        latencies[route].append(time.perf_counter() - start)
+        return result
+
+    while budget[0] > 0:
+        game_id = await timed("create", api.create())
+        active = True
+        while active and budget[0] > 0:
+            moves = await timed("moves", api.moves(game_id))
+            if not moves:
+                break
+            active = await timed("play", api.play(game_id, rng.choice(moves)))
+            await timed("state", api.state(game_id))
+        await timed("end", api.end(game_id))
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+async def run(mode: str, clients: int, requests: int, url: str | None = None, seed: int = 0) -> dict:
+    """Runs the load test, returns the report."""
+    latencies: dict[str, list[float]] = defaultdict(list)
+    budget = [requests]
+    rng = random.Random(seed)
+    connections = []
+    manager = None
+
+    if mode == "direct":
+        manager = SessionManager(max(DEFAULT_MAX_SESSIONS, clients))
+        apis = [_DirectClient(manager)] * clients
+    elif mode == "asgi":
+        from main import app
+        apis = [_HttpClient(_asgi_requester(app))] * clients
+    else:
+        parts = urlsplit(url)
+        connections = [_Connection(parts.hostname, parts.port or 80) for _ in range(clients)]
+        apis = [_HttpClient(connection.request) for connection in connections]
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _client(api, budget, latencies, random.Random(rng.random())) for api in apis
+        ))
+    finally:
+        elapsed = time.perf_counter() - start
+        for connection in connections:
+            connection.close()
+        if manager is not None:
+            manager.close()
+
+    every = [latency for values in latencies.values() for latency in values]
+    return {
+        "requests": len(every),
+        "elapsed": elapsed,
+        "rps": len(every) / elapsed,
+        "routes": {
+            route: (len(values), _percentile(values, 50), _percentile(values, 99))
+            for route, values in sorted(latencies.items())
+        },
+        "p99": _percentile(every, 99),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="load_benchmark", description="Game API load test")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent games")
+    parser.add_argument("--requests", type=int, default=20_000, help="total requests")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--direct", action="store_true", help="call the session manager itself")
+    target.add_argument("--url", help="base URL of a running server")
+    args = parser.parse_args(argv)
+
+    mode = "direct" if args.direct else "http" if args.url else "asgi"
+    report = asyncio.run(run(mode, args.clients, args.requests, args.url))
+    print(f"{mode}: {report['requests']} requests from {args.clients} clients "
+          f"in {report['elapsed']:.2f}s, {report['rps']:,.0f} req/s, p99 {report['p99'] * 1000:.1f} ms")
+    print(f"{'route':>8} {'count':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for route, (count, p50, p99) in report["routes"].items():
+        print(f"{route:>8} {count:>8} {p50 * 1000:8.1f} {p99 * 1000:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,367 @@
+"""In-memory game sessions for the API.
+
+The manager holds the state and engine of every running game, keyed by id.
+Every game has its own asyncio lock, so requests on one game are applied one
+at a time while different games proceed concurrently. Nothing on the request
+path prompts or prints: moves come in as text, are matched against the legal
+moves and played through the engine, and the engine work runs in executors
+so the event loop stays responsive:
+
+- move generation and play run in a thread pool, since they mutate the
+  session's state in place;
+- searches for the computer's moves run in a process pool, the position
+  going over in its compact binary encoding (see entities.codec), so they
+  run in parallel with everything else.
+
+Every move played is published to the game's subscribers as a compact JSON
+delta (see move_delta), encoded once for all of them.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+
+from src.domain.entities.codec import encode_state, decode_state
+from src.domain.entities.fen import STARTING_FEN
+from src.domain.entities.game_state import GameState, MoveUndo
+from src.domain.exceptions.game_error import InvalidMoveError
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from src.domain.services.move_cache import LegalMoveCache
+from src.domain.services.notation import to_san, from_san
+from src.domain.services.replay import apply_moves
+from src.domain.services.search import Searcher, SearchLimits
+from src.domain.value_objects.game_config import GameConfigStandard
+from src.domain.value_objects.game_record import GameRecord
+from src.domain.value_objects.move import Move
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color
+from .broadcast import Broadcaster, Subscription
+
+DEFAULT_MAX_SESSIONS = 10_000
+# the computer's thinking time when the request does not limit it
+DEFAULT_BOT_LIMITS = SearchLimits(time_limit=1.0)
+
+
+class SessionNotFoundError(LookupError):
+    """Raised when no game has the requested id."""
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when the manager already holds its maximum number of games."""
+
+
+class GameStatus(Enum):
+    ACTIVE = "active"
+    CHECKMATE = "checkmate"
+    STALEMATE = "stalemate"
+
+
+@dataclass
+class GameSession:
+    """A running game. Only touch the state while holding the lock."""
+    id: str
+    state: GameState
+    engine: GoChessEngine
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    status: GameStatus = GameStatus.ACTIVE
+    # bumped by every move, clients can tell when their copy is stale
+    version: int = 0
+    last_move: str | None = None
+    updated: float = field(default_factory=time.monotonic)
+
+    def snapshot(self) -> dict:
+        """JSON-ready view of the game."""
+        state = self.state
+        reserves = None
+        if state.reserves is not None:
+            reserves = {
+                color.name.lower(): {
+                    (piece_type.algebraic or "P"): count
+                    for piece_type, count in counts.items() if count > 0
+                }
+                for color, counts in state.reserves.items()
+            }
+        return {
+            "id": self.id,
+            "version": self.version,
+            "fen": state.to_fen(),
+            "turn": state.current_player_color.name.lower(),
+            "phase": state.phase.name.lower(),
+            "reserves": reserves,
+            "status": self.status.value,
+            "winner": state.winner.name.lower() if state.winner is not None else None,
+            "last_move": self.last_move,
+            "moves_played": len(state.move_history),
+        }
+
+    def record(self) -> GameRecord:
+        if self.state.winner is not None:
+            result = "1-0" if self.state.winner == Color.WHITE else "0-1"
+        else:
+            result = "1/2-1/2" if self.status == GameStatus.STALEMATE else "*"
+        fen = self.state.initial_fen or self.state.to_fen()
+        return GameRecord(fen, self.state.move_history[:], result, {"Site": self.id})
+
+
+def _letter(piece) -> str:
+    """FEN letter of a piece, upper case for white."""
+    letter = piece.type.algebraic or "P"
+    return letter if piece.color == Color.WHITE else letter.lower()
+
+
+def move_delta(session: GameSession, undo: MoveUndo, san: str) -> dict:
+    """What a move changed, for clients that hold the position already: the
+    squares it moved between (or the square and piece of a placement), the
+    captured piece and its square (they differ on en passant), the castling
+    rook's squares and the promotion. Fields that do not apply are left out.
+    code is the move packed in an int (see Move.to_code), for clients that
+    keep move lists packed."""
+    state = session.state
+    squares = Position.table(state.board.size)
+    delta = {"type": "move", "version": session.version, "san": san, "code": state.move_history.codes[-1]}
+    if undo.is_drop:
+        delta["drop"] = _letter(undo.piece)
+    else:
+        delta["from"] = squares[undo.from_square].algebraic()
+    delta["to"] = squares[undo.to_square].algebraic()
+    if undo.captured is not None:
+        delta["captured"] = _letter(undo.captured)
+        if undo.captured_square != undo.to_square:
+            delta["captured_square"] = squares[undo.captured_square].algebraic()
+    if undo.rook_from >= 0:
+        delta["rook"] = [squares[undo.rook_from].algebraic(), squares[undo.rook_to].algebraic()]
+    if undo.promotion is not None:
+        delta["promotion"] = _letter(undo.promotion)
+    delta["turn"] = state.current_player_color.name.lower()
+    delta["phase"] = state.phase.name.lower()
+    if session.status != GameStatus.ACTIVE:
+        delta["status"] = session.status.value
+    return delta
+
+
+def _parse_move(state: GameState, text: str, moves: list[Move]) -> Move:
+    """A move in coordinate notation (e2e4, e7e8q, N@e4) or in SAN."""
+    text = text.strip()
+    for move in moves:
+        if str(move) == text:
+            return move
+    return from_san(state, text)
+
+
+def _play(session: GameSession, cache: LegalMoveCache, text: str | None,
+          move: Move | None = None) -> tuple[str, MoveUndo]:
+    """Plays a move of the side to move and passes the turn, returns its SAN
+    and undo record. Runs in a worker thread, with the session lock held."""
+    state = session.state
+    if session.status != GameStatus.ACTIVE:
+        raise InvalidMoveError("The game is over")
+    moves = cache.get(state).moves
+    if move is None:
+        move = _parse_move(state, text, moves)
+    elif move not in moves:
+        raise InvalidMoveError(f"Illegal move: {move}")
+    san = to_san(state, move, moves)
+
+    color = state.current_player_color
+    undo = session.engine.play_move(move)
+    state.switch_player()
+    if state.is_checkmate():
+        state.winner = color
+        session.status = GameStatus.CHECKMATE
+    elif state.is_stalemate():
+        session.status = GameStatus.STALEMATE
+    session.version += 1
+    session.last_move = san
+    session.updated = time.monotonic()
+    return san, undo
+
+
+def _search_position(encoded: bytes, config: GameConfigStandard | None, limits: SearchLimits) -> int:
+    """Searches an encoded position in a worker process, returns the best
+    move as a packed int, 0 when there is no legal move."""
+    state = decode_state(encoded)
+    state.config = config
+    result = Searcher(state).search(limits)
+    return result.best_move.to_code(state.board.size) if result.best_move is not None else 0
+
+
+class SessionManager:
+    """Holds the running games and applies requests to them.
+
+    The executors are created on first use unless given; close() shuts down
+    the ones the manager created.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 executor: Executor | None = None,
+                 search_executor: Executor | None = None,
+                 broadcaster: Broadcaster | None = None,
+                 move_cache: LegalMoveCache | None = None,
+                 instrumentation: Instrumentation = NULL_INSTRUMENTATION):
+        self.max_sessions = max_sessions
+        # given to the engine of every game
+        self.instrumentation = instrumentation
+        # legal moves by position, shared by the games
+        self.move_cache = move_cache or LegalMoveCache()
+        # live updates of the games, for players and spectators
+        self.broadcaster = broadcaster or Broadcaster()
+        self._sessions: dict[str, GameSession] = {}
+        self._executor = executor
+        self._search_executor = search_executor
+        self._owned: list[Executor] = []
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def close(self):
+        for executor in self._owned:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._owned.clear()
+
+    def _thread_pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="game")
+            self._owned.append(self._executor)
+        return self._executor
+
+    def _process_pool(self) -> Executor:
+        if self._search_executor is None:
+            self._search_executor = ProcessPoolExecutor(os.cpu_count() or 1)
+            self._owned.append(self._search_executor)
+        return self._search_executor
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._thread_pool(), function, *args)
+
+    # --- Sessions ---
+
+    def create(self, fen: str | None = None, config: GameConfigStandard | None = None) -> GameSession:
+        """Starts a game from a position (extended FEN, the standard start by
+        default). With a config, both players get its reserves to place."""
+        if len(self._sessions) >= self.max_sessions:
+            raise SessionLimitError("Too many games in progress")
+        state = GameState.from_fen(fen or STARTING_FEN)
+        if config is not None:
+            state.config = config
+            state.reserves = config.initial_reserves()
+            if not config.enable_castling:
+                state.castling = 0
+        engine = GoChessEngine(state, [], self.instrumentation)
+        session = GameSession(uuid.uuid4().hex, state, engine)
+        self._sessions[session.id] = session
+        return session
+
+    def restore(self, record: GameRecord, config: GameConfigStandard | None = None,
+                game_id: str | None = None) -> GameSession:
+        """Brings back a game from its record (after a restart, say), replaying
+        its moves without validating them again."""
+        session = self.create(record.fen, None)
+        state = session.state
+        if config is not None:
+            state.config = config
+        apply_moves(state, record.moves)
+        if state.is_checkmate():
+            state.winner = ~state.current_player_color
+            session.status = GameStatus.CHECKMATE
+        elif state.is_stalemate():
+            session.status = GameStatus.STALEMATE
+        session.version = len(record.moves)
+        if game_id is not None:
+            del self._sessions[session.id]
+            session.id = game_id
+            self._sessions[game_id] = session
+        return session
+
+    def get(self, game_id: str) -> GameSession:
+        session = self._sessions.get(game_id)
+        if session is None:
+            raise SessionNotFoundError(f"No game with id {game_id}")
+        return session
+
+    def remove(self, game_id: str) -> GameRecord:
+        """Ends a session, returns the record of the game."""
+        session = self.get(game_id)
+        del self._sessions[game_id]
+        self.broadcaster.close(game_id)
+        return session.record()
+
+    def evict_idle(self, max_idle: float) -> int:
+        """Drops the games without a move for max_idle seconds, returns how many."""
+        deadline = time.monotonic() - max_idle
+        idle = [game_id for game_id, session in self._sessions.items()
+                if session.updated < deadline and not session.lock.locked()]
+        for game_id in idle:
+            del self._sessions[game_id]
+            self.broadcaster.close(game_id)
+        return len(idle)
+
+    # --- Requests ---
+
+    async def snapshot(self, game_id: str) -> dict:
+        session = self.get(game_id)
+        async with session.lock:
+            return session.snapshot()
+
+    async def subscribe(self, game_id: str) -> tuple[Subscription, dict]:
+        """Subscribes to the moves of a game. Returns the subscription along
+        with the snapshot its first delta applies to."""
+        session = self.get(game_id)
+        async with session.lock:
+            return self.broadcaster.subscribe(game_id), session.snapshot()
+
+    async def legal_moves(self, game_id: str, square: str | None = None) -> list[str]:
+        """The legal moves and placements of the side to move, or only the
+        moves of the piece on a square, in coordinate notation. Raises
+        InvalidMoveError for a square that is not on the board."""
+        session = self.get(game_id)
+        async with session.lock:
+            if session.status != GameStatus.ACTIVE:
+                return []
+            state = session.state
+            position = Position.from_algebraic(square, state.board.size) if square else None
+            # hits are answered right away, misses generate in the pool
+            moves = self.move_cache.peek(state)
+            if moves is None:
+                moves = await self._run(self.move_cache.get, state)
+            if position is not None:
+                return [str(move) for move in moves.from_square(position)]
+            return [str(move) for move in moves]
+
+    async def play(self, game_id: str, move: str) -> tuple[str, dict]:
+        """Plays a move (coordinate notation or SAN) for the side to move.
+        Returns its SAN and the new snapshot, raises InvalidMoveError when the
+        move is not legal."""
+        session = self.get(game_id)
+        async with session.lock:
+            san, undo = await self._run(_play, session, self.move_cache, move)
+            self._publish(session, undo, san)
+            return san, session.snapshot()
+
+    async def play_bot(self, game_id: str, limits: SearchLimits | None = None) -> tuple[str, dict]:
+        """Lets the computer search and play the move of the side to move."""
+        session = self.get(game_id)
+        async with session.lock:
+            if session.status != GameStatus.ACTIVE:
+                raise InvalidMoveError("The game is over")
+            state = session.state
+            code = await asyncio.get_running_loop().run_in_executor(
+                self._process_pool(), _search_position,
+                encode_state(state), state.config, limits or DEFAULT_BOT_LIMITS,
+            )
+            if not code:
+                raise InvalidMoveError("No legal move to play")
+            move = Move.from_code(code, state.board.size)
+            san, undo = await self._run(_play, session, self.move_cache, None, move)
+            self._publish(session, undo, san)
+            return san, session.snapshot()
+
+    def _publish(self, session: GameSession, undo: MoveUndo, san: str):
+        if self.broadcaster.subscribers(session.id):
+            message = json.dumps(move_delta(session, undo, san), separators=(",", ":"))
+            self.broadcaster.publish(session.id, message)
@@ -0,0 +1,186 @@
+"""Indexed binary game database.
+
+Games are appended to a single file and fetched by id (their insertion
+order) through a memory map, without parsing the rest of the file, so batch
+analyses can walk millions of games while only the pages touched are read.
+The layout, all integers little-endian::
+
+    8 bytes     magic ``GCDB`` and format version (u32)
+    records     one per game:
+                  u16 headers length, the headers as UTF-8 JSON
+                  u8 result (index in GameRecord RESULTS)
+                  the starting position, encoded by entities.codec
+                  u32 move count, then every move as a u32 (Move.to_code)
+    index       u64 file offset of every record
+    24 bytes    footer: u64 index offset, u64 game count, magic ``GCDX``
+                and 4 bytes of padding
+
+The index is written when the writer is closed; reopening a database to
+append reads it back and writes it again after the new games.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+from src.domain.entities.codec import encode_state, decode_state, record_size
+from src.domain.entities.game_state import GameState
+from src.domain.value_objects.game_record import GameRecord, RESULTS
+from src.domain.value_objects.move import MoveList
+
+MAGIC = b"GCDB"
+INDEX_MAGIC = b"GCDX"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sI")
+_FOOTER = struct.Struct("<QQ4s4x")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _encode_record(record: GameRecord) -> bytes:
+    headers = json.dumps(record.headers, ensure_ascii=False, separators=(",", ":")).encode()
+    if len(headers) > 0xFFFF:
+        raise ValueError("Game headers are too long")
+    state = GameState.from_fen(record.fen)
+    if isinstance(record.moves, MoveList):
+        moves = array("I", record.moves.codes)
+    else:
+        size = state.board.size
+        moves = array("I", (move.to_code(size) for move in record.moves))
+    if _BIG_ENDIAN:
+        moves.byteswap()
+    return b"".join((
+        _U16.pack(len(headers)), headers,
+        bytes((RESULTS.index(record.result),)),
+        encode_state(state),
+        _U32.pack(len(moves)), moves.tobytes(),
+    ))
+
+
+class GameDatabaseWriter:
+    """Appends games to a database file. Use it as a context manager, or
+    call close(), to write the index."""
+
+    def __init__(self, path, append: bool = False):
+        self.path = path
+        self._offsets = array("Q")
+        if append:
+            self._file = open(path, "r+b")
+            index_offset, count = _read_footer(self._file)
+            self._file.seek(index_offset)
+            self._offsets.frombytes(self._file.read(count * _U64.size))
+            if _BIG_ENDIAN:
+                self._offsets.byteswap()
+            # the new records replace the old index
+            self._file.seek(index_offset)
+            self._file.truncate()
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_HEADER.pack(MAGIC, VERSION))
+
+    def __enter__(self) -> "GameDatabaseWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def add(self, record: GameRecord) -> int:
+        """Appends a game, returns its id."""
+        self._offsets.append(self._file.tell())
+        self._file.write(_encode_record(record))
+        return len(self._offsets) - 1
+
+    def add_many(self, records: Iterable[GameRecord]) -> int:
+        """Appends games, returns how many were added."""
+        count = 0
+        for record in records:
+            self.add(record)
+            count += 1
+        return count
+
+    def close(self):
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        offsets = array("Q", self._offsets)
+        if _BIG_ENDIAN:
+            offsets.byteswap()
+        self._file.write(offsets.tobytes())
+        self._file.write(_FOOTER.pack(index_offset, len(self._offsets), INDEX_MAGIC))
+        self._file.close()
+
+
+def _read_footer(file) -> tuple[int, int]:
+    file.seek(0)
+    magic, version = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a GoChess game database")
+    file.seek(-_FOOTER.size, 2)
+    index_offset, count, index_magic = _FOOTER.unpack(file.read(_FOOTER.size))
+    if index_magic != INDEX_MAGIC:
+        raise ValueError("Game database has no index, was its writer closed?")
+    return index_offset, count
+
+
+class GameDatabase:
+    """Read-only, memory-mapped view of a database file. Games are fetched
+    by id (database[42]) or iterated in order."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._index_offset, self._count = _read_footer(file)
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> "GameDatabase":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset(self, game_id: int) -> int:
+        if game_id < 0:
+            game_id += self._count
+        if not 0 <= game_id < self._count:
+            raise IndexError("Game id out of range")
+        return _U64.unpack_from(self._map, self._index_offset + game_id * _U64.size)[0]
+
+    def __getitem__(self, game_id: int) -> GameRecord:
+        data = self._map
+        offset = self._offset(game_id)
+        (headers_length,) = _U16.unpack_from(data, offset)
+        offset += _U16.size
+        headers = json.loads(data[offset:offset + headers_length])
+        offset += headers_length
+        result = RESULTS[data[offset]]
+        offset += 1
+        state = decode_state(data, offset)
+        size = state.board.size
+        offset += record_size(size)
+        (count,) = _U32.unpack_from(data, offset)
+        offset += _U32.size
+        codes = array("I")
+        codes.frombytes(data[offset:offset + count * _U32.size])
+        if _BIG_ENDIAN:
+            codes.byteswap()
+        # decoded as they are read
+        return GameRecord(state.to_fen(), MoveList.from_codes(codes, size), result, headers)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for game_id in range(self._count):
+            yield self[game_id]
@@ -0,0 +1,132 @@
+"""PGN-like text format for GoChess games.
+
+A game is a block of tag pairs followed by its movetext in SAN (placements
+written ``N@e4``, see domain.services.notation) and the result::
+
+    [Event "Casual game"]
+    [White "alice"]
+    [Black "bob"]
+    [FEN "4k3/8/8/8/8/8/8/4K3 w - - P QNP2/qnp2 0/0"]
+    [Result "*"]
+
+    1. Q@d4 Q@d5 2. N@f3 N@f6 *
+
+The FEN tag holds the extended FEN of the starting position. Games are blank
+line separated, and files are read and written one game at a time, so a file
+never has to fit in memory.
+"""
+
+import re
+from typing import Iterable, Iterator, TextIO
+
+from src.domain.entities.game_state import GameState
+from src.domain.exceptions.game_error import InvalidMoveError
+from src.domain.services.notation import to_san, from_san
+from src.domain.value_objects.game_record import GameRecord, RESULTS
+from src.domain.value_objects.piece_type import Color
+
+LINE_WIDTH = 80
+
+_TAG = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]$')
+_MOVE_NUMBER = re.compile(r"^\d+\.+")
+_COMMENT = re.compile(r"\{[^}]*\}|;.*$")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def format_game(record: GameRecord) -> str:
+    """Writes a game as tag pairs and movetext, ending with a blank line."""
+    tags = {**record.headers, "FEN": record.fen, "Result": record.result}
+    lines = [f'[{key} "{_escape(value)}"]' for key, value in tags.items()]
+    lines.append("")
+
+    state = GameState.from_fen(record.fen)
+    number = 1
+    tokens = []
+    for move in record.moves:
+        if state.current_player_color == Color.WHITE:
+            tokens.append(f"{number}.")
+        elif not tokens:
+            tokens.append(f"{number}...")
+        tokens.append(to_san(state, move))
+        state.play(move)
+        if state.current_player_color == Color.WHITE:
+            number += 1
+    tokens.append(record.result)
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n\n"
+
+
+def write_game(file: TextIO, record: GameRecord):
+    file.write(format_game(record))
+
+
+def write_games(file: TextIO, records: Iterable[GameRecord]) -> int:
+    """Writes games one after the other, returns how many were written."""
+    count = 0
+    for record in records:
+        write_game(file, record)
+        count += 1
+    return count
+
+
+def read_games(lines: Iterable[str]) -> Iterator[GameRecord]:
+    """Reads the games of a text file (or any iterable of lines) lazily. Moves
+    are replayed as they are read, so illegal movetext raises
+    InvalidMoveError (or ValueError for a malformed tag or FEN)."""
+    headers: dict[str, str] = {}
+    movetext: list[str] = []
+    for raw in lines:
+        line = raw.strip()
+        if line.startswith("[") and not movetext:
+            match = _TAG.match(line)
+            if match is None:
+                raise ValueError(f"Invalid tag pair: {line!r}")
+            headers[match.group(1)] = _unescape(match.group(2))
+            continue
+        line = _COMMENT.sub("", line).strip()
+        if not line:
+            continue
+        movetext += line.split()
+        if movetext[-1] in RESULTS:
+            yield _parse_game(headers, movetext)
+            headers, movetext = {}, []
+    if headers or movetext:
+        yield _parse_game(headers, movetext)
+
+
+def _parse_game(headers: dict[str, str], tokens: list[str]) -> GameRecord:
+    from src.domain.entities.fen import STARTING_FEN
+
+    fen = headers.pop("FEN", STARTING_FEN)
+    result = headers.pop("Result", "*")
+    state = GameState.from_fen(fen)
+    moves = []
+    for token in tokens:
+        if token in RESULTS:
+            result = token
+            break
+        token = _MOVE_NUMBER.sub("", token)
+        if not token:
+            continue
+        try:
+            move = from_san(state, token)
+        except InvalidMoveError as error:
+            raise InvalidMoveError(f"Move {len(moves) + 1}: {error}") from error
+        moves.append(move)
+        state.play(move)
+    return GameRecord(fen, moves, result, headers)
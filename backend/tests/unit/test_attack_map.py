@@ -0,0 +1,97 @@
+import random
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Rook, Queen
+from src.domain.services.attack_map import AttackMap
+from src.domain.services.attacks import attackers_to, is_attacked
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.move_generator import legal_moves
+from src.domain.services.perft import REFERENCE_POSITIONS, perft
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0"
+RESERVES = "8/8/8/8/8/8/8/8 w - - P KQRNP2/kqrnp2 0/0"
+
+
+def assert_matches_board(state: GameState):
+    board = state.board
+    attack_map = state.attack_map
+    for color in Color:
+        for square in range(board.num_squares):
+            attackers = attackers_to(board, square, color)
+            assert attack_map.attacker_count(square, color) == attackers.bit_count()
+            assert attack_map.is_attacked(square, color) == bool(attackers)
+
+
+@pytest.mark.parametrize("fen", [KIWIPETE, RESERVES])
+def test_map_follows_moves_placements_and_takebacks(fen):
+    rng = random.Random(7)
+    state = GameState.from_fen(fen)
+    state.track_attacks()
+    assert_matches_board(state)
+    for _ in range(4):
+        played = 0
+        for _ in range(12):
+            moves = legal_moves(state)
+            if not moves:
+                break
+            state.play(rng.choice(moves))
+            played += 1
+            assert_matches_board(state)
+        # back half way, a move taken back before a query is never seen
+        for _ in range(played // 2):
+            state.unmake_move()
+        assert_matches_board(state)
+
+
+def test_map_sees_free_setup():
+    state = GameState.from_fen("4k3/8/8/8/8/8/8/4K3 w - - M - 0/0")
+    attack_map = state.track_attacks()
+    assert not attack_map.is_attacked(4, Color.WHITE)
+    engine = GoChessEngine(state, [])
+    engine.place_piece(Rook(Color.WHITE), Position.from_algebraic("a8"))
+    assert attack_map.is_attacked(4, Color.WHITE)
+    assert attack_map.attacker_count(3, Color.WHITE) == 1
+    engine.place_piece(Queen(Color.WHITE), Position.from_algebraic("d1"))
+    assert attack_map.attacker_count(3, Color.WHITE) == 2
+    # a piece stepping in cuts the rook's ray
+    engine.place_piece(Rook(Color.BLACK), Position.from_algebraic("c8"))
+    assert not attack_map.is_attacked(4, Color.WHITE)
+    assert state.track_attacks(False) is None and state.attack_map is None
+
+
+def test_tracked_positions_generate_the_same_moves():
+    for name in ("kiwipete", "endgame", "promotions", "kings"):
+        plain = REFERENCE_POSITIONS[name].build()
+        tracked = REFERENCE_POSITIONS[name].build()
+        tracked.track_attacks()
+        assert perft(tracked, 2) == perft(plain, 2)
+        assert legal_moves(tracked) == legal_moves(plain)
+
+
+def test_king_placements_avoid_attacked_squares():
+    state = GameState.from_fen("8/8/8/8/3q4/8/8/8 w - - P K/ 0/0")
+    plain = {str(move) for move in legal_moves(state)}
+    state.track_attacks()
+    assert {str(move) for move in legal_moves(state)} == plain
+    assert "K@d1" not in plain and "K@f2" not in plain and "K@c2" in plain
+
+
+def test_map_rebuilds_on_refresh():
+    state = GameState.from_fen(KIWIPETE)
+    attack_map = AttackMap(state.board)
+    counts = [attack_map.attacker_count(square, Color.BLACK) for square in range(64)]
+    attack_map.refresh()
+    assert [attack_map.attacker_count(square, Color.BLACK) for square in range(64)] == counts
+
+
+def test_copies_start_untracked():
+    state = GameState.from_fen(KIWIPETE)
+    state.track_attacks()
+    board = state.board.copy()
+    assert board.attack_map is None
+    assert is_attacked(board, 4, Color.WHITE) == bool(attackers_to(board, 4, Color.WHITE))
+    plain = GameState.from_fen(KIWIPETE)
+    plain.board = plain.board.copy()
+    assert legal_moves(plain) == legal_moves(state)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+from src.domain.entities.board import Board
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Piece
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import PieceType, Color
+from src.domain.services.attacks import attack_tables, attackers_to, is_attacked
+from src.domain.services.validators import is_square_attacked_by
+
+
+def scan_is_attacked(state: GameState, position: Position, color: Color) -> bool:
+    """Reference implementation: ask every piece of the color for its moves."""
+    board = state.board
+    for r in range(board.size):
+        for c in range(board.size):
+            attacker_pos = Position(r, c)
+            piece = board.get_piece(attacker_pos)
+            if piece is None or piece.color != color:
+                continue
+            if piece.type == PieceType.PAWN:
+                direction = -1 if color == Color.WHITE else 1
+                if position.row == r + direction and abs(position.col - c) == 1:
+                    return True
+                continue
+            if piece.type == PieceType.KING:
+                moves = piece.get_possible_moves(attacker_pos, state, include_castling=False)
+            else:
+                moves = piece.get_possible_moves(attacker_pos, state)
+            if position in moves:
+                return True
+    return False
+
+
+def random_state(rng: random.Random, num_pieces: int) -> GameState:
+    board = Board()
+    squares = rng.sample(range(64), num_pieces)
+    for sq in squares:
+        piece_type = rng.choice(list(PieceType))
+        color = rng.choice(list(Color))
+        board.place_piece(Piece.create(piece_type, color), Position(sq // 8, sq % 8))
+    return GameState(board, Color.WHITE)
+
+
+def test_leaper_tables():
+    tables = attack_tables(8)
+    a8, e4 = 0, 36
+    assert tables.knight[a8] == (1 << 10) | (1 << 17)  # c7, b6
+    assert bin(tables.king[e4]).count("1") == 8
+    # a white pawn on e4 attacks d5 and f5, a black one d3 and f3
+    assert tables.pawn[Color.WHITE.value][e4] == (1 << 27) | (1 << 29)
+    assert tables.pawn[Color.BLACK.value][e4] == (1 << 43) | (1 << 45)
+
+
+def test_sliding_attacks_stop_at_blockers():
+    tables = attack_tables(8)
+    a1 = 56
+    assert bin(tables.rook_attacks(a1, 0)).count("1") == 14
+    blocker = 1 << 40  # a3
+    attacks = tables.rook_attacks(a1, blocker)
+    assert attacks >> 40 & 1  # the blocker itself is attacked
+    assert not attacks >> 32 & 1  # a4 is behind it
+
+
+def test_between():
+    tables = attack_tables(8)
+    a1, d4, h8, b3 = 56, 35, 7, 41
+    assert tables.between(a1, d4) == (1 << 49) | (1 << 42)  # b2, c3
+    assert tables.between(a1, h8) & (1 << 35)
+    assert tables.between(a1, b3) == 0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_is_attacked_matches_scan(seed):
+    rng = random.Random(seed)
+    state = random_state(rng, rng.randint(2, 20))
+    board = state.board
+    for sq in range(64):
+        position = Position(sq // 8, sq % 8)
+        for color in Color:
+            piece = board.piece_at(sq)
+            # the scan only sees squares the attacker could move to
+            if piece is not None and piece.color == color:
+                continue
+            expected = scan_is_attacked(state, position, color)
+            assert is_attacked(board, sq, color) == expected
+            assert is_square_attacked_by(state, position, color) == expected
+            assert bool(attackers_to(board, sq, color)) == expected
@@ -144,3 +144,73 @@ def test_board_representation():
     repr_str = str(board)
     expected_repr_with_piece = "♟ ▨\n▨ □"
     assert repr_str == expected_repr_with_piece
+
+
+def test_bitboards_track_pieces():
+    board = Board()
+    rook = Piece.create(PieceType.ROOK, Color.WHITE)
+    knight = Piece.create(PieceType.KNIGHT, Color.BLACK)
+    board.place_piece(rook, Position(7, 0))
+    board.place_piece(knight, Position(0, 1))
+
+    assert board.pieces_mask(PieceType.ROOK, Color.WHITE) == 1 << 56
+    assert board.pieces_mask(PieceType.KNIGHT, Color.BLACK) == 1 << 1
+    assert board.color_mask(Color.WHITE) == 1 << 56
+    assert board.occupied == (1 << 56) | (1 << 1)
+    assert board.empty == board.full_mask ^ board.occupied
+
+    # capturing clears the captured piece's masks
+    board.move_piece(Position(7, 0), Position(0, 1))
+    assert board.pieces_mask(PieceType.KNIGHT, Color.BLACK) == 0
+    assert board.color_mask(Color.BLACK) == 0
+    assert board.pieces_mask(PieceType.ROOK, Color.WHITE) == 1 << 1
+    assert board.occupied == 1 << 1
+
+
+def test_place_piece_replaces_existing_piece():
+    board = Board()
+    pos = Position(4, 4)
+    board.place_piece(Piece.create(PieceType.PAWN, Color.WHITE), pos)
+    board.place_piece(Piece.create(PieceType.QUEEN, Color.BLACK), pos)
+
+    assert board.pieces_mask(PieceType.PAWN, Color.WHITE) == 0
+    assert board.color_mask(Color.WHITE) == 0
+    assert board.pieces_mask(PieceType.QUEEN, Color.BLACK) == 1 << 36
+
+
+def test_king_square_and_copy_masks():
+    board = Board()
+    assert board.king_square(Color.WHITE) is None
+    board.place_piece(Piece.create(PieceType.KING, Color.WHITE), Position.from_algebraic("e1"))
+    assert board.king_square(Color.WHITE) == 60
+
+    new_board = board.copy()
+    new_board.remove_piece(Position.from_algebraic("e1"))
+    assert new_board.king_square(Color.WHITE) is None
+    assert board.king_square(Color.WHITE) == 60
+
+
+def test_pieces_are_shared_singletons():
+    from src.domain.entities.piece import Pawn, Knight
+    assert Pawn(Color.WHITE) is Pawn(Color.WHITE)
+    assert Piece.create(PieceType.KNIGHT, Color.BLACK) is Knight(Color.BLACK)
+    assert Pawn(Color.WHITE) is not Pawn(Color.BLACK)
+    codes = {Piece.create(t, c).code for t in PieceType for c in Color}
+    assert codes == set(range(1, 13))
+    assert Piece.from_code(Pawn(Color.BLACK).code) is Pawn(Color.BLACK)
+    assert Piece.from_code(0) is None
+    with pytest.raises(AttributeError):
+        Pawn(Color.WHITE).color = Color.BLACK
+
+
+def test_board_stores_piece_codes():
+    board = Board()
+    queen = Piece.create(PieceType.QUEEN, Color.BLACK)
+    board.place_piece(queen, Position(0, 3))
+    assert board.code_at(3) == queen.code
+    assert board.code_at(4) == 0
+
+    copy = board.copy()
+    assert copy == board
+    copy.remove_piece(Position(0, 3))
+    assert copy != board
@@ -0,0 +1,102 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from src.infrastructure.api.broadcast import Broadcaster, RESYNC, CLOSED
+from src.domain.value_objects.move import Move
+from src.infrastructure.api.session_manager import SessionManager
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_fan_out_shares_one_encoded_message():
+    async def scenario():
+        broadcaster = Broadcaster()
+        subscriptions = [broadcaster.subscribe("game") for _ in range(1000)]
+        other = broadcaster.subscribe("other")
+        message = '{"type":"move"}'
+        assert broadcaster.publish("game", message) == 1000
+        received = [await subscription.get() for subscription in subscriptions]
+        assert all(item is message for item in received)
+        assert len(other) == 0
+        subscriptions[0].close()
+        assert broadcaster.subscribers("game") == 999
+
+    run(scenario())
+
+
+def test_slow_consumer_is_resynced_without_blocking_others():
+    async def scenario():
+        broadcaster = Broadcaster(max_pending=4)
+        slow = broadcaster.subscribe("game")
+        fast = broadcaster.subscribe("game")
+        for number in range(10):
+            broadcaster.publish("game", str(number))
+            assert await fast.get() == str(number)
+        # the slow one lost its backlog, and gets told to fetch the state
+        assert slow.resyncs == 1
+        # what came after is covered by the state it fetches
+        assert len(slow) == 1
+        assert await slow.get() is RESYNC
+        broadcaster.publish("game", "10")
+        assert await slow.get() == "10"
+        assert await fast.get() == "10"
+        broadcaster.close("game")
+        assert await fast.get() is CLOSED
+        assert broadcaster.subscribers("game") == 0
+
+    run(scenario())
+
+
+def test_moves_are_published_as_deltas():
+    manager = SessionManager(executor=ThreadPoolExecutor(1))
+
+    async def scenario():
+        session = manager.create("r3k3/8/8/8/3p4/8/4P3/R3K2R w KQq - M - 0/0")
+        subscription, game = await manager.subscribe(session.id)
+        assert game["version"] == 0
+        for move in ("e2e4", "d4e3", "e1g1", "a8a1", "f1a1"):
+            await manager.play(session.id, move)
+        deltas = [json.loads(await subscription.get()) for _ in range(5)]
+        manager.remove(session.id)
+        assert await subscription.get() is CLOSED
+        return deltas
+
+    deltas = run(scenario())
+    manager.close()
+    code = deltas[0].pop("code")
+    assert deltas[0] == {"type": "move", "version": 1, "san": "e4", "from": "e2", "to": "e4",
+                         "turn": "black", "phase": "movement"}
+    assert str(Move.from_code(code)) == "e2e4" and Move.from_code(code).is_double_push
+    assert Move.from_code(deltas[1]["code"]).is_en_passant
+    assert deltas[1]["captured"] == "P"
+    assert deltas[1]["captured_square"] == "e4"
+    assert deltas[2]["san"] == "O-O"
+    assert deltas[2]["rook"] == ["h1", "f1"]
+    assert deltas[3]["captured"] == "R"
+    assert "captured_square" not in deltas[3]
+    assert deltas[4]["san"] == "Rxa1"
+    assert deltas[4]["captured"] == "r"
+    assert "status" not in deltas[4]
+
+
+def test_placements_and_promotions_deltas():
+    manager = SessionManager(executor=ThreadPoolExecutor(1))
+
+    async def scenario():
+        from src.domain.value_objects.game_config import GameConfigStandard
+        from src.domain.value_objects.piece_type import PieceType
+        session = manager.create("k7/4P3/8/8/8/8/8/K7 w - - P - 0/0", GameConfigStandard({PieceType.KNIGHT: 1}))
+        subscription, _ = await manager.subscribe(session.id)
+        await manager.play(session.id, "N@c3")
+        await manager.play(session.id, "n@f3")
+        await manager.play(session.id, "e8=Q+")
+        return [json.loads(await subscription.get()) for _ in range(3)]
+
+    deltas = run(scenario())
+    manager.close()
+    assert deltas[0]["drop"] == "N" and deltas[0]["to"] == "c3" and "from" not in deltas[0]
+    assert deltas[1]["drop"] == "n"
+    assert deltas[1]["phase"] == "movement"
+    assert deltas[2]["promotion"] == "Q"
@@ -0,0 +1,68 @@
+import pickle
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.entities.codec import (
+    encode_state, decode_state, encode_many, decode_many, record_size,
+)
+from src.domain.entities.piece import Queen
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.services.perft import REFERENCE_POSITIONS
+
+FENS = [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b Kq - M - 0/0",
+    "rnbqkbnr/pppp1ppp/8/8/3Pp3/8/PPP1PPPP/RNBQKBNR b KQkq d3 P QN2P3/qn2p3 2/1",
+    "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 P / 7/7",
+    "k9/10/10/10/10/10/10/10/10/9K w - - P R/ 0/0",
+]
+
+
+def test_round_trip():
+    states = [GameState.from_fen(fen) for fen in FENS]
+    states += [reference.build() for reference in REFERENCE_POSITIONS.values()]
+    for state in states:
+        data = encode_state(state)
+        assert len(data) == record_size(state.board.size)
+        decoded = decode_state(data)
+        assert decoded.to_fen() == state.to_fen()
+        assert decoded.zobrist_key == state.zobrist_key
+
+
+def test_fixed_size():
+    assert record_size(8) == 49
+    sizes = {len(encode_state(reference.build())) for reference in REFERENCE_POSITIONS.values()}
+    assert sizes == {49}
+
+
+def test_much_smaller_than_pickle():
+    state = REFERENCE_POSITIONS["start-reserves"].build()
+    assert len(encode_state(state)) * 50 < len(pickle.dumps(state))
+
+
+def test_bulk():
+    states = [GameState.from_fen(fen) for fen in FENS[:3]]
+    corpus = encode_many(states)
+    assert len(corpus) == 3 * record_size(8)
+    decoded = list(decode_many(corpus))
+    assert [state.to_fen() for state in decoded] == [state.to_fen() for state in states]
+    # a single record can be read straight out of the buffer
+    assert decode_state(corpus, record_size(8)).to_fen() == FENS[1]
+    with pytest.raises(ValueError):
+        list(decode_many(corpus[:-1]))
+
+
+def test_largest_counters():
+    state = GameState.from_fen("8/8/8/8/8/8/8/8 w - - P Q/ 0/0")
+    state.reserves[Color.WHITE][PieceType.QUEEN] = 255
+    state.placement_turns[Color.BLACK] = 255
+    decoded = decode_state(encode_state(state))
+    assert decoded.reserves[Color.WHITE][PieceType.QUEEN] == 255
+    assert decoded.placement_turns[Color.BLACK] == 255
+
+
+def test_pickled_state_keeps_its_key():
+    state = REFERENCE_POSITIONS["kings"].build()
+    state.make_drop(Queen(Color.WHITE), Position.from_algebraic("d4"))
+    copy = pickle.loads(pickle.dumps(state))
+    copy.reserves[Color.WHITE][PieceType.PAWN] -= 1
+    assert copy.zobrist_key == copy.compute_zobrist_key()
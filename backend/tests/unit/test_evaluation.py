@@ -0,0 +1,73 @@
+import random
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.services.evaluation import IncrementalEvaluator, evaluate, weights_of
+from src.domain.services.move_generator import legal_moves
+from src.domain.services.search import Searcher
+from src.domain.value_objects.game_config import GameConfigStandard, EvaluationWeights, DEFAULT_WEIGHTS
+from src.domain.value_objects.piece_type import PieceType
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0"
+PROMOTIONS = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - M - 0/0"
+RESERVES = "4k3/8/8/8/8/8/8/4K3 w - - P QR2NP3/qr2np3 0/0"
+
+
+@pytest.mark.parametrize("fen", [KIWIPETE, PROMOTIONS, RESERVES])
+def test_incremental_terms_follow_make_and_unmake(fen):
+    rng = random.Random(3)
+    state = GameState.from_fen(fen)
+    evaluator = IncrementalEvaluator(state)
+    start = evaluator.terms()
+    for _ in range(20):
+        depth = 0
+        for _ in range(10):
+            moves = legal_moves(state)
+            if not moves:
+                break
+            evaluator.push(state.play(rng.choice(moves)))
+            depth += 1
+            assert evaluator.score() == evaluate(state)
+        for _ in range(depth):
+            state.unmake_move()
+            evaluator.pop()
+            assert evaluator.score() == evaluate(state)
+    assert evaluator.terms() == start
+
+
+def test_pieces_in_hand_are_valued():
+    state = GameState.from_fen(RESERVES)
+    evaluator = IncrementalEvaluator(state)
+    assert evaluator.in_hand == 0
+    state.reserves[state.current_player_color][PieceType.QUEEN] = 0
+    evaluator.reset()
+    assert evaluator.in_hand == -900 * 90 // 100
+    assert evaluator.score() == evaluate(state)
+
+
+def test_weights_from_the_variant_config():
+    weights = EvaluationWeights.from_dict({"piece_values": {"N": 300}, "reserve_percent": 50,
+                                           "mobility": [0, 0, 0, 0, 0, 0]})
+    assert weights.piece_values == (100, 300, 330, 500, 900, 0)
+    assert weights.reserve_percent == 50
+    with pytest.raises(ValueError):
+        EvaluationWeights.from_dict({"piece_value": {}})
+    with pytest.raises(ValueError):
+        EvaluationWeights.from_dict({"center_bonus": {"X": 1}})
+
+    state = GameState.from_fen(RESERVES)
+    assert weights_of(state) is DEFAULT_WEIGHTS
+    state.config = GameConfigStandard({PieceType.KNIGHT: 1}, evaluation=weights)
+    assert weights_of(state) is weights
+    assert IncrementalEvaluator(state).weights is weights
+    state.reserves[state.current_player_color][PieceType.KNIGHT] = 0
+    assert evaluate(state) == -300 * 50 // 100
+
+
+def test_move_ordering_uses_the_variant_values():
+    state = GameState.from_fen("q3k3/8/8/8/8/4K3/8/R6n w - - M - 0/0")
+    captures = {str(move): move for move in legal_moves(state) if move.is_capture}
+    searcher = Searcher(state)
+    assert searcher._capture_score(captures["a1a8"]) > searcher._capture_score(captures["a1h1"])
+    state.config = GameConfigStandard({}, evaluation=EvaluationWeights.from_dict({"piece_values": {"N": 1000}}))
+    searcher = Searcher(state)
+    assert searcher._capture_score(captures["a1a8"]) < searcher._capture_score(captures["a1h1"])
@@ -0,0 +1,89 @@
+import pytest
+from src.domain.entities.game_state import GameState, GamePhase
+from src.domain.entities.fen import STARTING_FEN
+from src.domain.entities.piece import Rook, King
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.services.perft import REFERENCE_POSITIONS
+
+
+def test_round_trip():
+    fens = [
+        STARTING_FEN,
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b Kq e3 M - 0/0",
+        "4k3/8/8/8/8/8/8/4K3 w - - P QN12P2/qnp2 3/10",
+        "8/8/8/8/8/8/8/8 b - - P / 0/0",
+    ]
+    for fen in fens:
+        assert GameState.from_fen(fen).to_fen() == fen
+
+
+def test_fields():
+    state = GameState.from_fen("4k3/8/8/8/4Pp2/8/8/R3K3 b Q e3 M R2P/n 4/5")
+    assert state.current_player_color == Color.BLACK
+    assert state.board.get_piece(Position.from_algebraic("a1")) == Rook(Color.WHITE)
+    assert state.board.get_piece(Position.from_algebraic("e8")) == King(Color.BLACK)
+    assert state.castling_rights[Color.WHITE] == {"kingside": False, "queenside": True}
+    assert state.castling_rights[Color.BLACK] == {"kingside": False, "queenside": False}
+    assert state.en_passant_target == Position.from_algebraic("e3")
+    assert state.phase == GamePhase.MOVEMENT
+    assert state.reserves == {
+        Color.WHITE: {PieceType.ROOK: 2, PieceType.PAWN: 1},
+        Color.BLACK: {PieceType.KNIGHT: 1},
+    }
+    assert state.placement_turns == {Color.WHITE: 4, Color.BLACK: 5}
+    assert state.zobrist_key == state.compute_zobrist_key()
+
+
+def test_plain_fen():
+    state = GameState.from_fen("rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1")
+    assert state.reserves is None
+    assert state.phase == GamePhase.PLACEMENT
+    assert state.to_fen() == "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 P - 0/0"
+
+
+def test_same_position_same_key():
+    # built by FEN or by playing the moves
+    played = REFERENCE_POSITIONS["start"].build()
+    played.make_move(Position.from_algebraic("g1"), Position.from_algebraic("f3"))
+    loaded = GameState.from_fen(played.to_fen())
+    assert loaded.zobrist_key == played.zobrist_key
+    assert loaded.board == played.board
+
+
+def test_bigger_boards():
+    fen = "k9/10/10/10/10/10/10/10/10/9K w - - P - 0/0"
+    state = GameState.from_fen(fen)
+    assert state.board.size == 10
+    assert state.board.king_square(Color.WHITE) == 99
+    assert state.to_fen() == fen
+
+
+@pytest.mark.parametrize("fen", [
+    "",
+    "8/8/8/8/8/8/8/8 w - -  P",
+    "8/8/8/8/8/8/8/9 w - - P - 0/0",
+    "8/8/8/8/8/8/8/7x w - - P - 0/0",
+    "8/8/8/8/8/8/8/8 x - - P - 0/0",
+    "8/8/8/8/8/8/8/8 w X - P - 0/0",
+    "8/8/8/8/8/8/8/8 w - - X - 0/0",
+    "8/8/8/8/8/8/8/8 w - - P Qq 0/0",
+    "8/8/8/8/8/8/8/8 w - - P q/Q 0/0",
+    "8/8/8/8/8/8/8/8 w - - P 2Q/ 0/0",
+    "8/8/8/8/8/8/8/8 w - - P - 0",
+    "8/8/8/8/8/8/8/8 w - z9 P - 0/0",
+    "8/8/8/8/8/8/8/8 w - e33 M - 0/0",
+    "8/8/8/8/8/8/8/8 w - - P Q256/ 0/0",
+    "8/8/8/8/8/8/8/8 w - - P Q-1/ 0/0",
+    "8/8/8/8/8/8/8/8 w - - P - 256/0",
+    "8/8/8/8/8/8/8/8 w - - P - -1/0",
+])
+def test_invalid(fen):
+    with pytest.raises(ValueError):
+        GameState.from_fen(fen)
+
+
+def test_largest_counts():
+    state = GameState.from_fen("8/8/8/8/8/8/8/8 w - - P Q255/ 255/0")
+    assert state.reserves[Color.WHITE][PieceType.QUEEN] == 255
+    assert state.zobrist_key == state.compute_zobrist_key()
@@ -0,0 +1,57 @@
+import random
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.services.move_generator import legal_moves
+from src.domain.value_objects.game_record import GameRecord
+from src.infrastructure.persistence.game_database import GameDatabase, GameDatabaseWriter
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P QN2P2/qn2p2 0/0"
+
+
+def random_games(count: int, seed: int = 0) -> list[GameRecord]:
+    rng = random.Random(seed)
+    games = []
+    for number in range(count):
+        state = GameState.from_fen(START)
+        moves = []
+        for _ in range(rng.randrange(20)):
+            options = legal_moves(state)
+            if not options:
+                break
+            moves.append(rng.choice(options))
+            state.play(moves[-1])
+        games.append(GameRecord(START, moves, rng.choice(["1-0", "0-1", "*"]), {"Round": str(number), "Site": "héré"}))
+    return games
+
+
+def test_random_access(tmp_path):
+    games = random_games(30)
+    path = tmp_path / "games.db"
+    with GameDatabaseWriter(path) as writer:
+        assert writer.add_many(games) == 30
+    with GameDatabase(path) as database:
+        assert len(database) == 30
+        assert database[17] == games[17]
+        assert database[-1] == games[-1]
+        assert list(database) == games
+        with pytest.raises(IndexError):
+            database[30]
+
+
+def test_append(tmp_path):
+    games = random_games(10, seed=1)
+    path = tmp_path / "games.db"
+    with GameDatabaseWriter(path) as writer:
+        writer.add_many(games[:4])
+    with GameDatabaseWriter(path, append=True) as writer:
+        assert writer.add(games[4]) == 4
+        writer.add_many(games[5:])
+    with GameDatabase(path) as database:
+        assert list(database) == games
+
+
+def test_rejects_unfinished_files(tmp_path):
+    path = tmp_path / "games.db"
+    path.write_bytes(b"not a database at all, really")
+    with pytest.raises(ValueError):
+        GameDatabase(path)
@@ -0,0 +1,44 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from src.infrastructure.api.game_routes import CreateGameRequest, create_game
+from src.infrastructure.api.session_manager import SessionManager
+
+
+@pytest.fixture
+def manager():
+    manager = SessionManager(search_executor=ThreadPoolExecutor(1))
+    yield manager
+    manager.close()
+
+
+def create(manager: SessionManager, **fields):
+    return asyncio.run(create_game(CreateGameRequest(**fields), manager))
+
+
+def test_create_game(manager):
+    game = create(manager, reserves={"Q": 1, "N": 2})
+    assert game["fen"].endswith(" P QN2/qn2 0/0")
+    assert len(manager) == 1
+
+
+@pytest.mark.parametrize("fen", [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq z9 M - 0/0",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P Q300/ 0/0",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+])
+def test_invalid_fen_is_rejected(manager, fen):
+    with pytest.raises(HTTPException) as error:
+        create(manager, fen=fen)
+    assert error.value.status_code == 422
+    assert len(manager) == 0
+
+
+@pytest.mark.parametrize("reserves", [{"Q": 300}, {"N": -1}])
+def test_reserve_counts_are_bounded(reserves):
+    with pytest.raises(ValidationError):
+        CreateGameRequest(reserves=reserves)
+    with pytest.raises(ValidationError):
+        CreateGameRequest(max_placement_turns=256)
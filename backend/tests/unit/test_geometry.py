@@ -0,0 +1,107 @@
+import random
+import pytest
+from unittest.mock import MagicMock
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Pawn
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.move_cache import LegalMoveCache
+from src.domain.services.move_generator import legal_moves, is_in_check
+from src.domain.services.notation import to_san
+from src.domain.services.search import Searcher
+from src.domain.value_objects.geometry import geometry
+from src.domain.value_objects.move import Move, CAPTURE
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+
+BIG_BOARDS = {
+    10: "r4k3r/pppppppppp/10/10/10/10/10/10/PPPPPPPPPP/R4K3R w KQkq - M - 0/0",
+    12: "rnb3k3nr/pppppppppppp/12/12/12/12/12/12/12/12/PPPPPPPPPPPP/RNB3K3NR w KQkq - M - 0/0",
+}
+
+
+def scanned_moves(state: GameState) -> set[tuple[str, str]]:
+    """The legal moves found by the pieces' own grid scan."""
+    color = state.current_player_color
+    moves = set()
+    for position in Position.table(state.board.size):
+        piece = state.board.get_piece(position)
+        if piece is None or piece.color != color:
+            continue
+        for target in piece.get_possible_moves(position, state):
+            undo = state.apply_move(position, target)
+            if not is_in_check(state, color):
+                moves.add((position.algebraic(), target.algebraic()))
+            state.revert_move(undo)
+    return moves
+
+
+def test_geometry_of_the_standard_board():
+    rows = geometry(8)
+    assert rows.pawn_row == (6, 1)
+    assert rows.en_passant_row == (3, 4)
+    assert rows.promotion_row == (0, 7)
+    kingside = rows.castling[Color.WHITE.value]["kingside"]
+    assert (kingside.king_from, kingside.king_to, kingside.rook_from, kingside.rook_to) == (60, 62, 63, 61)
+    queenside = rows.castling[Color.BLACK.value]["queenside"]
+    assert (queenside.king_to, queenside.rook_to) == (2, 3)
+    assert queenside.empty == 0b1110
+
+
+@pytest.mark.parametrize("size", sorted(BIG_BOARDS))
+def test_generator_agrees_with_the_grid_scan_on_big_boards(size):
+    rng = random.Random(size)
+    state = GameState.from_fen(BIG_BOARDS[size])
+    seen_castling = seen_double_push = False
+    for _ in range(120):
+        moves = legal_moves(state, placements=False)
+        assert {(m.from_pos.algebraic(), m.to_pos.algebraic()) for m in moves} == scanned_moves(state)
+        if not moves:
+            break
+        seen_castling |= any(m.is_castle for m in moves)
+        seen_double_push |= any(m.is_double_push for m in moves)
+        state.play(rng.choice(moves))
+    assert seen_castling and seen_double_push
+
+
+def test_castling_on_a_10x10_board():
+    state = GameState.from_fen(BIG_BOARDS[10])
+    castles = {str(move) for move in legal_moves(state) if move.is_castle}
+    assert castles == {"f1h1", "f1d1"}
+    state.play(next(m for m in legal_moves(state) if str(m) == "f1h1"))
+    assert state.to_fen().startswith("r4k3r/pppppppppp/10/10/10/10/10/10/PPPPPPPPPP/R5RK2 b kq")
+
+
+def test_en_passant_and_promotion_on_a_12x12_board():
+    state = GameState.from_fen("6k5/12/12/12/12/12/12/12/3p8/12/2P9/6K5 w - - M - 0/0")
+    state.play(next(m for m in legal_moves(state) if str(m) == "c2c4"))
+    assert state.en_passant_target == Position.from_algebraic("c3", 12)
+    assert "d4c3" in {str(move) for move in legal_moves(state) if move.is_en_passant}
+
+    state = GameState.from_fen("6k5/P11/12/12/12/12/12/12/12/12/12/6K5 w - - M - 0/0")
+    engine = GoChessEngine(state, [])
+    engine.promotion_prompt = MagicMock(return_value=PieceType.ROOK)
+    engine.move_piece(Position.from_algebraic("a11", 12), Position.from_algebraic("a12", 12))
+    assert state.board.get_piece(Position.from_algebraic("a12", 12)).type == PieceType.ROOK
+    assert Pawn(Color.WHITE).get_possible_moves(Position.from_algebraic("c2", 12), state) == [
+        Position.from_algebraic("c3", 12), Position.from_algebraic("c4", 12),
+    ]
+
+
+def test_positions_made_without_the_size_on_a_10x10_board():
+    state = GameState.from_fen(BIG_BOARDS[10])
+    engine = GoChessEngine(state, [])
+    engine.move_piece(Position(8, 0), Position(7, 0))
+    state.switch_player()
+    engine.move_piece(Position(1, 1), Position(2, 1))
+    state.switch_player()
+    engine.move_piece(Position(7, 0), Position(6, 0))
+    assert [str(move) for move in state.move_history] == ["a2a3", "b9b8", "a3a4"]
+
+    state.switch_player()
+    cache = LegalMoveCache()
+    assert {str(move) for move in cache.moves_from(state, Position(1, 2))} == {"c9c8", "c9c7"}
+    assert Move(Position(1, 2), Position(3, 2)) in cache.get(state)
+    # both rooks reach e10
+    state = GameState.from_fen("r8r/10/10/10/10/10/10/10/Q9/K8k b - - M - 0/0")
+    assert to_san(state, Move(Position(0, 0), Position(0, 4))) == "Rae10"
+    assert Searcher(state)._capture_score(Move(Position(0, 0), Position(8, 0), flags=CAPTURE)) > 0
@@ -0,0 +1,97 @@
+import io
+import json
+from src.domain.entities.game_state import GameState
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.instrumentation import (
+    MetricsInstrumentation, JsonLinesExporter, MoveEvent, Phase, NULL_INSTRUMENTATION,
+)
+from src.domain.value_objects.game_config import GameConfigStandard
+from src.domain.value_objects.move import Move
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import PieceType
+
+
+def square(name: str) -> Position:
+    return Position.from_algebraic(name)
+
+
+def engine_for(fen: str, metrics=NULL_INSTRUMENTATION) -> GoChessEngine:
+    return GoChessEngine(GameState.from_fen(fen), [], metrics)
+
+
+def test_move_piece_does_not_print(capsys):
+    engine = engine_for("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - M - 0/0")
+    engine.move_piece(square("e2"), square("e4"))
+    assert capsys.readouterr().out == ""
+
+
+def test_events_and_hooks():
+    metrics = MetricsInstrumentation()
+    seen = []
+    metrics.on(MoveEvent.CHECK, lambda event, data: seen.append(data))
+    everything = []
+    metrics.on(None, lambda event, data: everything.append(event))
+
+    engine = engine_for("4k3/8/8/3pP3/8/8/8/R3K2R w KQ d6 M - 0/0", metrics)
+    engine.move_piece(square("e5"), square("d6"))
+    state = engine._game_state
+    state.switch_player()
+    engine.move_piece(square("e8"), square("f7"))
+    state.switch_player()
+    engine.move_piece(square("e1"), square("c1"))
+
+    assert everything == [
+        MoveEvent.MOVE_APPLIED, MoveEvent.CAPTURE, MoveEvent.EN_PASSANT,
+        MoveEvent.MOVE_APPLIED,
+        MoveEvent.MOVE_APPLIED, MoveEvent.CASTLE,
+    ]
+    counters = metrics.snapshot().counters
+    assert counters["capture"] == 1 and counters["castle"] == 1
+    assert seen == []
+
+    state.switch_player()
+    engine.move_piece(square("f7"), square("e6"))
+    state.switch_player()
+    engine.move_piece(square("d1"), square("e1"))
+    assert seen == [{"piece": "rook", "color": "white", "to": "e1", "from": "d1", "checked": "black"}]
+
+
+def test_promotion_and_placement_events_through_play_move():
+    metrics = MetricsInstrumentation()
+    config = GameConfigStandard({PieceType.KNIGHT: 1})
+    state = GameState.from_fen("k7/4P3/8/8/8/8/8/K7 w - - P N/n 0/0")
+    state.config = config
+    engine = GoChessEngine(state, [], metrics)
+    engine.play_move(Move(None, square("c3"), drop=PieceType.KNIGHT))
+    state.switch_player()
+    engine.play_move(Move(None, square("f3"), drop=PieceType.KNIGHT))
+    state.switch_player()
+    engine.play_move(Move(square("e7"), square("e8"), PieceType.QUEEN))
+    snapshot = metrics.snapshot()
+    assert snapshot.counters["placement"] == 2
+    assert snapshot.counters["promotion"] == 1
+    assert snapshot.counters["check"] == 1
+    assert snapshot.timers["application"].calls == 3
+    assert snapshot.timers["validation"].calls == 2
+
+
+def test_phase_timers_and_json_lines_export():
+    metrics = MetricsInstrumentation()
+    engine = engine_for("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - M - 0/0", metrics)
+    sink = io.StringIO()
+    exporter = JsonLinesExporter(sink)
+    metrics.on(None, exporter.write_event)
+    engine.move_piece(square("g1"), square("f3"))
+    exporter.export(metrics)
+
+    timers = metrics.snapshot().timers
+    for phase in Phase:
+        assert timers[phase.value].calls == 1
+        assert timers[phase.value].total >= 0
+    event, snapshot = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert event["type"] == "event" and event["event"] == "move_applied" and event["to"] == "f3"
+    assert snapshot["type"] == "metrics"
+    assert snapshot["counters"] == {"move_applied": 1}
+    assert snapshot["timers"]["generation"]["calls"] == 1
+    metrics.reset()
+    assert metrics.snapshot().counters == {}
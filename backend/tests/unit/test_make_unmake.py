@@ -0,0 +1,123 @@
+import pytest
+from src.domain.entities.board import Board
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Pawn, Knight, Rook, King, Queen
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.services.go_chess_engine import GoChessEngine
+
+
+def snapshot(state: GameState):
+    board = state.board
+    return (
+        [board.piece_at(sq) for sq in range(board.num_squares)],
+        [masks[:] for masks in board._pieces],
+        board.occupied,
+        state.en_passant_target,
+        state.castling,
+        state.current_player_color,
+        dict(state.placement_turns),
+    )
+
+
+def setup(*pieces, color=Color.WHITE):
+    state = GameState(Board(), color)
+    engine = GoChessEngine(state, [])
+    for piece, square in pieces:
+        engine.place_piece(piece, Position.from_algebraic(square))
+    return state, engine
+
+
+def test_unmake_restores_capture():
+    state, engine = setup((Rook(Color.WHITE), "a1"), (Knight(Color.BLACK), "a8"))
+    before = snapshot(state)
+
+    undo = engine.make_move(Position.from_algebraic("a1"), Position.from_algebraic("a8"))
+    assert undo.captured.type == PieceType.KNIGHT
+    assert state.current_player_color == Color.BLACK
+    assert state.board.pieces_mask(PieceType.KNIGHT, Color.BLACK) == 0
+
+    engine.unmake_move()
+    assert snapshot(state) == before
+
+
+def test_unmake_restores_en_passant():
+    state, engine = setup((Pawn(Color.WHITE), "e5"), (Pawn(Color.BLACK), "d7"), color=Color.BLACK)
+    engine.make_move(Position.from_algebraic("d7"), Position.from_algebraic("d5"))
+    assert state.en_passant_target == Position.from_algebraic("d6")
+    before = snapshot(state)
+
+    undo = engine.make_move(Position.from_algebraic("e5"), Position.from_algebraic("d6"))
+    assert undo.captured_square == state.board.square_index(Position.from_algebraic("d5"))
+    assert state.board.get_piece(Position.from_algebraic("d5")) is None
+    assert state.en_passant_target is None
+
+    engine.unmake_move()
+    assert snapshot(state) == before
+
+
+def test_unmake_restores_castling():
+    state, engine = setup((King(Color.WHITE), "e1"), (Rook(Color.WHITE), "h1"))
+    before = snapshot(state)
+
+    undo = engine.make_move(Position.from_algebraic("e1"), Position.from_algebraic("g1"))
+    assert state.board.get_piece(Position.from_algebraic("f1")).type == PieceType.ROOK
+    assert undo.rook_from >= 0
+    assert not state.castling_rights[Color.WHITE]["kingside"]
+    assert not state.castling_rights[Color.WHITE]["queenside"]
+
+    engine.unmake_move()
+    assert snapshot(state) == before
+    assert state.castling_rights[Color.WHITE]["kingside"]
+
+
+def test_capturing_rook_removes_castling_right():
+    state, engine = setup((Rook(Color.WHITE), "a1"), (Rook(Color.BLACK), "a8"))
+    engine.make_move(Position.from_algebraic("a1"), Position.from_algebraic("a8"))
+    assert not state.castling_rights[Color.WHITE]["queenside"]
+    assert not state.castling_rights[Color.BLACK]["queenside"]
+    assert state.castling_rights[Color.BLACK]["kingside"]
+
+
+@pytest.mark.parametrize("promotion", [PieceType.QUEEN, PieceType.KNIGHT])
+def test_unmake_restores_promotion(promotion):
+    state, engine = setup((Pawn(Color.WHITE), "g7"), (Rook(Color.BLACK), "h8"))
+    before = snapshot(state)
+
+    undo = engine.make_move(Position.from_algebraic("g7"), Position.from_algebraic("h8"), promotion)
+    assert state.board.get_piece(Position.from_algebraic("h8")).type == promotion
+    assert undo.promotion.type == promotion
+
+    engine.unmake_move()
+    assert snapshot(state) == before
+    assert state.board.get_piece(Position.from_algebraic("g7")).type == PieceType.PAWN
+
+
+def test_make_and_unmake_drop():
+    reserves = {Color.WHITE: {PieceType.QUEEN: 1}, Color.BLACK: {}}
+    state = GameState(Board(), Color.WHITE, reserves=reserves)
+    state.en_passant_target = Position.from_algebraic("e3")
+    engine = GoChessEngine(state, [])
+    before = snapshot(state)
+
+    engine.make_drop(Queen(Color.WHITE), Position.from_algebraic("d4"))
+    assert state.board.get_piece(Position.from_algebraic("d4")).type == PieceType.QUEEN
+    assert state.reserves[Color.WHITE][PieceType.QUEEN] == 0
+    assert state.placement_turns[Color.WHITE] == 1
+    assert state.en_passant_target is None
+
+    engine.unmake_drop()
+    assert snapshot(state) == before
+    assert state.reserves[Color.WHITE][PieceType.QUEEN] == 1
+
+
+def test_check_next_does_not_change_state():
+    from src.domain.services.validators import CheckNextValidator
+    # the white rook is pinned against the king
+    state, engine = setup((King(Color.WHITE), "e1"), (Rook(Color.WHITE), "e2"), (Rook(Color.BLACK), "e8"))
+    before = snapshot(state)
+    validator = CheckNextValidator()
+    e2 = Position.from_algebraic("e2")
+    assert validator.validate(state, e2, Position.from_algebraic("d2"), Color.WHITE)
+    assert not validator.validate(state, e2, Position.from_algebraic("e5"), Color.WHITE)
+    assert snapshot(state) == before
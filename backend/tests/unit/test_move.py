@@ -0,0 +1,55 @@
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.services.move_generator import legal_moves
+from src.domain.value_objects.move import Move, MoveList, CAPTURE, EN_PASSANT, DOUBLE_PUSH, CODE_MASK
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import PieceType
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0"
+
+
+def generated(fen: str) -> dict[str, Move]:
+    return {str(move): move for move in legal_moves(GameState.from_fen(fen))}
+
+
+def test_generator_flags():
+    moves = generated(KIWIPETE)
+    assert moves["e2a6"].flags == CAPTURE
+    assert moves["e1g1"].is_castle and moves["e1c1"].is_castle
+    assert moves["a2a4"].is_double_push and not moves["a2a3"].is_double_push
+    assert moves["e5d3"].flags == 0
+    moves = generated("4k3/8/8/3pP3/8/8/8/4K3 w - d6 M - 0/0")
+    assert moves["e5d6"].flags == CAPTURE | EN_PASSANT
+    moves = generated("1r2k3/P7/8/8/8/8/8/4K3 w - - M - 0/0")
+    assert moves["a7b8q"].is_capture and not moves["a7a8q"].is_capture
+
+
+def test_codes_round_trip_with_flags():
+    for move in legal_moves(GameState.from_fen(KIWIPETE)):
+        decoded = Move.from_code(move.to_code())
+        assert decoded == move and decoded.flags == move.flags
+    drop = Move(None, Position.from_algebraic("e4", 10), drop=PieceType.KNIGHT)
+    assert Move.from_code(drop.to_code(), 10) == drop
+
+
+def test_flags_are_not_compared():
+    e2, e4 = Position.from_algebraic("e2"), Position.from_algebraic("e4")
+    assert Move(e2, e4) == Move(e2, e4, flags=DOUBLE_PUSH)
+    assert hash(Move(e2, e4)) == hash(Move(e2, e4, flags=DOUBLE_PUSH))
+    assert Move(e2, e4, flags=DOUBLE_PUSH).to_code() & CODE_MASK == Move(e2, e4).to_code()
+
+
+def test_move_list():
+    moves = legal_moves(GameState.from_fen(KIWIPETE))
+    packed = MoveList(moves)
+    assert len(packed) == len(moves) == 48
+    assert packed.codes.itemsize == 4
+    assert list(packed) == moves and packed == moves
+    assert packed[3] == moves[3] and packed[-2:] == moves[-2:]
+    assert moves[7] in packed
+    assert MoveList.from_codes(packed.codes) == packed
+    packed.append(moves[0])
+    assert packed.pop() == moves[0]
+    assert packed != moves[1:]
+    with pytest.raises(TypeError):
+        hash(packed)
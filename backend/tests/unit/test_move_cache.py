@@ -0,0 +1,97 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.services.move_cache import LegalMoveCache
+from src.domain.services.move_generator import legal_moves
+from src.domain.value_objects.game_config import GameConfigStandard
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import PieceType
+from src.domain.value_objects.move import Move
+from src.infrastructure.api.session_manager import SessionManager
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0"
+
+
+def square(name: str) -> Position:
+    return Position.from_algebraic(name)
+
+
+def test_per_square_subsets():
+    state = GameState.from_fen(KIWIPETE)
+    cache = LegalMoveCache()
+    moves = cache.get(state)
+    assert set(moves) == set(legal_moves(state))
+    assert {str(move) for move in moves.from_square(square("e1"))} == {"e1d1", "e1f1", "e1g1", "e1c1"}
+    assert set(moves.destinations(square("a2"))) == {square("a3"), square("a4")}
+    assert moves.from_square(square("e4")) == ()
+    assert moves.from_square(square("a8")) == ()  # black piece
+    assert moves.placements() == ()
+
+
+def test_placements_by_type():
+    state = GameState.from_fen("4k3/8/8/8/8/8/8/4K3 w - - P QN/qn 0/0")
+    moves = LegalMoveCache().get(state)
+    knights = moves.placements(PieceType.KNIGHT)
+    assert knights and all(move.drop == PieceType.KNIGHT for move in knights)
+    assert len(moves.placements()) == len(knights) + len(moves.placements(PieceType.QUEEN))
+    assert Move(None, square("d4"), drop=PieceType.QUEEN) in moves
+
+
+def test_hits_and_automatic_invalidation():
+    state = GameState.from_fen(KIWIPETE)
+    cache = LegalMoveCache()
+    first = cache.get(state)
+    assert cache.get(state) is first
+    state.play(next(iter(first)))
+    second = cache.get(state)
+    assert second is not first
+    assert set(second) == set(legal_moves(state))
+    state.unmake_move()
+    assert cache.get(state) is first
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_config_rules_are_part_of_the_key():
+    fen = "4k3/8/8/8/8/8/8/4K3 w - - P P/p 0/0"
+    near, far = GameState.from_fen(fen), GameState.from_fen(fen)
+    near.config = GameConfigStandard({PieceType.PAWN: 1}, pawn_promotion_distance=1)
+    far.config = GameConfigStandard({PieceType.PAWN: 1}, pawn_promotion_distance=3)
+    cache = LegalMoveCache()
+    assert len(cache.get(near)) != len(cache.get(far))
+    assert cache.stats.misses == 2
+
+
+def test_lru_eviction():
+    cache = LegalMoveCache(capacity=2)
+    states = [GameState.from_fen(KIWIPETE) for _ in range(3)]
+    for state, move in zip(states[1:], ("a2a3", "a2a4")):
+        state.play(Move(square(move[:2]), square(move[2:])))
+    cache.get(states[0])
+    cache.get(states[1])
+    cache.get(states[0])
+    cache.get(states[2])  # evicts states[1], the least recently used
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert cache.peek(states[1]) is None
+    assert cache.peek(states[0]) is not None
+    with pytest.raises(ValueError):
+        LegalMoveCache(0)
+
+
+def test_session_manager_serves_moves_per_square():
+    manager = SessionManager(executor=ThreadPoolExecutor(1))
+    session = manager.create()
+
+    async def scenario():
+        knight = await manager.legal_moves(session.id, "g1")
+        for _ in range(10):
+            await manager.legal_moves(session.id, "e2")
+        await manager.play(session.id, "e2e4")
+        return knight
+
+    assert sorted(asyncio.run(scenario())) == ["g1f3", "g1h3"]
+    manager.close()
+    assert manager.move_cache.stats.misses == 1
+    assert manager.move_cache.stats.hits == 11
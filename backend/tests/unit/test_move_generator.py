@@ -0,0 +1,160 @@
+import random
+
+import pytest
+from src.domain.entities.board import Board
+from src.domain.entities.game_state import GameState, GamePhase
+from src.domain.entities.piece import Piece
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.services.validators import CheckNextValidator
+from src.domain.services.move_generator import (
+    legal_moves, has_legal_move, is_checkmate, pinned_pieces, PROMOTIONS,
+)
+
+LETTERS = {"p": PieceType.PAWN, "n": PieceType.KNIGHT, "b": PieceType.BISHOP,
+           "r": PieceType.ROOK, "q": PieceType.QUEEN, "k": PieceType.KING}
+
+
+def build_state(placement: str, color: Color = Color.WHITE, castling: str = "-",
+                en_passant: str | None = None, reserves=None) -> GameState:
+    """Builds a state from the piece placement field of a FEN string."""
+    board = Board()
+    for row, rank in enumerate(placement.split("/")):
+        col = 0
+        for char in rank:
+            if char.isdigit():
+                col += int(char)
+                continue
+            piece_color = Color.WHITE if char.isupper() else Color.BLACK
+            board.place_piece(Piece.create(LETTERS[char.lower()], piece_color), Position(row, col))
+            col += 1
+    state = GameState(board, color, reserves=reserves)
+    state.castling_rights = {
+        Color.WHITE: {"kingside": "K" in castling, "queenside": "Q" in castling},
+        Color.BLACK: {"kingside": "k" in castling, "queenside": "q" in castling},
+    }
+    if en_passant:
+        state.en_passant_target = Position.from_algebraic(en_passant)
+    return state
+
+
+def naive_moves(state: GameState) -> set:
+    """Reference generator: pseudo-legal moves filtered by CheckNextValidator."""
+    board = state.board
+    color = state.current_player_color
+    moves = set()
+    for r in range(8):
+        for c in range(8):
+            from_pos = Position(r, c)
+            piece = board.get_piece(from_pos)
+            if piece is None or piece.color != color:
+                continue
+            for to_pos in piece.get_possible_moves(from_pos, state):
+                if CheckNextValidator().validate(state, from_pos, to_pos, color):
+                    continue
+                if piece.type == PieceType.PAWN and to_pos.row in (0, 7):
+                    moves.update((from_pos, to_pos, p) for p in PROMOTIONS)
+                else:
+                    moves.add((from_pos, to_pos, None))
+    return moves
+
+
+def perft(state: GameState, depth: int) -> int:
+    if depth == 0:
+        return 1
+    moves = legal_moves(state)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        state.play(move)
+        nodes += perft(state, depth - 1)
+        state.unmake_move()
+    return nodes
+
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR"
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R"
+
+
+@pytest.mark.parametrize("placement, castling, depth, expected", [
+    (START, "KQkq", 1, 20),
+    (START, "KQkq", 3, 8902),
+    (KIWIPETE, "KQkq", 1, 48),
+    (KIWIPETE, "KQkq", 2, 2039),
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8", "-", 3, 2812),
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1", "kq", 2, 264),
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R", "KQ", 2, 1486),
+])
+def test_perft_reference_positions(placement, castling, depth, expected):
+    state = build_state(placement, Color.WHITE, castling)
+    assert perft(state, depth) == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_legal_moves_match_naive_filter(seed):
+    rng = random.Random(seed)
+    state = build_state(KIWIPETE, Color.WHITE, "KQkq")
+    for _ in range(12):
+        generated = {(m.from_pos, m.to_pos, m.promotion) for m in legal_moves(state)}
+        assert generated == naive_moves(state)
+        moves = legal_moves(state)
+        if not moves:
+            break
+        state.play(rng.choice(moves))
+
+
+def test_pinned_piece_moves_along_pin():
+    state = build_state("4r2k/8/8/8/8/8/4R3/4K3")
+    board = state.board
+    e2 = board.square_index(Position.from_algebraic("e2"))
+    pins = pinned_pieces(board, board.king_square(Color.WHITE), Color.WHITE)
+    assert e2 in pins
+    rook_targets = {m.to_pos.algebraic() for m in legal_moves(state)
+                    if m.from_pos == Position.from_algebraic("e2")}
+    assert rook_targets == {"e3", "e4", "e5", "e6", "e7", "e8"}
+
+
+def test_en_passant_exposing_king_is_illegal():
+    # capturing en passant would clear the fifth rank between king and rook
+    state = build_state("8/8/8/KPp4r/8/8/8/7k", en_passant="c6")
+    targets = {m.to_pos.algebraic() for m in legal_moves(state)
+               if m.from_pos == Position.from_algebraic("b5")}
+    assert targets == {"b6"}
+
+
+def test_checkmate_and_stalemate():
+    # back rank mate
+    state = build_state("6k1/5ppp/8/8/8/8/8/R5K1", Color.BLACK)
+    assert not is_checkmate(state)
+    state.make_move(Position.from_algebraic("g8"), Position.from_algebraic("h8"))
+    state.make_move(Position.from_algebraic("a1"), Position.from_algebraic("a8"))
+    assert state.is_checkmate()
+    assert not state.is_stalemate()
+
+    state = build_state("7k/5Q2/6K1/8/8/8/8/8", Color.BLACK)
+    assert state.is_stalemate()
+    assert not state.is_checkmate()
+
+
+def test_drops_block_check_and_avoid_edge_ranks():
+    reserves = {Color.WHITE: {PieceType.PAWN: 1, PieceType.KNIGHT: 1}, Color.BLACK: {}}
+    # the black rook checks along the first rank
+    state = build_state("7k/8/8/8/8/8/8/r3K3", reserves=reserves)
+    drops = {(m.drop, m.to_pos.algebraic()) for m in legal_moves(state) if m.is_drop}
+    assert drops == {(PieceType.KNIGHT, sq) for sq in ("b1", "c1", "d1")}
+
+    state = build_state("7k/8/8/8/8/8/8/4K3", reserves=reserves)
+    pawn_drops = {m.to_pos for m in legal_moves(state) if m.drop == PieceType.PAWN}
+    assert len(pawn_drops) == 48  # every square off the first and last ranks
+    assert all(pos.row not in (0, 7) for pos in pawn_drops)
+
+    state.phase = GamePhase.MOVEMENT
+    assert not any(m.is_drop for m in legal_moves(state))
+
+
+def test_drops_keep_a_stalemated_player_alive():
+    state = build_state("7k/5Q2/6K1/8/8/8/8/8", Color.BLACK,
+                        reserves={Color.WHITE: {}, Color.BLACK: {PieceType.ROOK: 1}})
+    assert has_legal_move(state)
+    assert not state.is_stalemate()
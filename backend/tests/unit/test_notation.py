@@ -0,0 +1,133 @@
+import io
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.exceptions.game_error import InvalidMoveError
+from src.domain.services.notation import to_san, from_san, record_to_san
+from src.domain.services.move_generator import legal_moves
+from src.domain.value_objects.game_record import GameRecord
+from src.domain.value_objects.move import Move
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import PieceType
+from src.infrastructure.persistence.pgn import format_game, read_games, write_games
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0"
+RESERVES = "4k3/8/8/8/8/8/8/4K3 w - - P QNP2/qnp2 0/0"
+
+
+def move(text: str) -> Move:
+    return Move(Position.from_algebraic(text[:2]), Position.from_algebraic(text[2:4]))
+
+
+def test_san_of_moves():
+    state = GameState.from_fen(KIWIPETE)
+    assert to_san(state, move("e2a6")) == "Bxa6"
+    assert to_san(state, move("e1g1")) == "O-O"
+    assert to_san(state, move("e1c1")) == "O-O-O"
+    assert to_san(state, move("d5e6")) == "dxe6"
+    assert to_san(state, move("a2a4")) == "a4"
+    assert to_san(state, move("e5f7")) == "Nxf7"
+    assert to_san(state, move("e5d3")) == "Nd3"
+
+
+def test_disambiguation():
+    state = GameState.from_fen("4k3/8/8/8/8/8/K7/R6R w - - M - 0/0")
+    assert to_san(state, move("a1d1")) == "Rad1"
+    assert to_san(state, move("h1f1")) == "Rhf1"
+    assert to_san(state, move("h1h5")) == "Rh5"
+    state = GameState.from_fen("4k3/8/8/R7/8/8/8/R3K3 w - - M - 0/0")
+    assert to_san(state, move("a1a3")) == "R1a3"
+    assert to_san(state, move("a5a3")) == "R5a3"
+
+
+def test_check_mate_promotion_and_placements():
+    state = GameState.from_fen("7k/4P3/8/8/8/8/8/K5R1 w - - M - 0/0")
+    assert to_san(state, Move(Position.from_algebraic("e7"), Position.from_algebraic("e8"), PieceType.QUEEN)) == "e8=Q+"
+    state = GameState.from_fen("7k/8/6K1/8/8/8/8/R7 w - - M - 0/0")
+    assert to_san(state, move("a1a8")) == "Ra8#"
+    state = GameState.from_fen(RESERVES)
+    assert to_san(state, Move(None, Position.from_algebraic("e4"), drop=PieceType.KNIGHT)) == "N@e4"
+    assert to_san(state, Move(None, Position.from_algebraic("e7"), drop=PieceType.QUEEN)) == "Q@e7+"
+    assert to_san(state, Move(None, Position.from_algebraic("d3"), drop=PieceType.PAWN)) == "P@d3"
+
+
+def test_from_san_round_trip():
+    for fen in (KIWIPETE, RESERVES, "r3k2r/1P6/8/8/8/8/8/R3K2R w KQkq - M - 0/0"):
+        state = GameState.from_fen(fen)
+        moves = legal_moves(state)
+        for legal in moves:
+            assert from_san(state, to_san(state, legal, moves)) == legal
+
+
+def test_from_san_errors():
+    state = GameState.from_fen("4k3/8/8/8/8/8/K7/R6R w - - M - 0/0")
+    assert from_san(state, "Rhf1") == move("h1f1")
+    with pytest.raises(InvalidMoveError):
+        from_san(state, "Rf1")  # ambiguous
+    with pytest.raises(InvalidMoveError):
+        from_san(state, "Qd1")  # no queen
+    with pytest.raises(InvalidMoveError):
+        from_san(state, "N@e4")  # no reserves
+    with pytest.raises(InvalidMoveError):
+        from_san(state, "hello")
+
+
+def test_pgn_round_trip():
+    start = GameState.from_fen(RESERVES)
+    moves = []
+    for san in ("Q@d4", "Q@d5", "N@f3", "n@f6", "P@a2", "P@h7", "Qxd5", "Nxd5"):
+        played = from_san(start, san)
+        moves.append(played)
+        start.play(played)
+    record = GameRecord(RESERVES, moves, "*", {"White": 'a "quoted" name', "Event": "Test"})
+    assert record_to_san(record)[:3] == ["Q@d4", "Q@d5", "N@f3"]
+
+    text = format_game(record)
+    assert '[FEN "' + RESERVES + '"]' in text
+    assert "1. Q@d4 Q@d5 2. N@f3 N@f6" in text
+
+    buffer = io.StringIO()
+    assert write_games(buffer, [record, GameRecord(KIWIPETE, [move("e1g1")], "1/2-1/2")]) == 2
+    buffer.seek(0)
+    games = list(read_games(buffer))
+    assert games[0] == record
+    assert games[1].moves == [move("e1g1")]
+    assert games[1].result == "1/2-1/2"
+
+
+def test_pgn_reads_black_to_move_and_comments():
+    text = (
+        '[FEN "4k3/8/8/8/8/8/8/R3K3 b - - M - 0/0"]\n\n'
+        "1... Kd7 {a comment} 2. Ra7+ Kc6 ; rest of line\n3. Ra6+ 0-1\n"
+    )
+    (game,) = read_games(io.StringIO(text))
+    assert len(game.moves) == 4
+    assert game.result == "0-1"
+    assert "\n1... Kd7 2. Ra7+ Kc6 3. Ra6+ 0-1\n" in format_game(game)
+
+
+def test_pgn_rejects_illegal_moves():
+    with pytest.raises(InvalidMoveError):
+        list(read_games(io.StringIO("1. e5 *\n")))
+
+
+def test_engine_records_the_game():
+    from src.domain.services.game import Game
+
+    game = Game(None)
+    record = game.record({"Event": "Test"})
+    assert record.fen.startswith("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - P")
+    assert record_to_san(record) == ["e4", "a5", "e5", "a4", "e6", "d5", "exf7+", "Kd7"]
+    assert record.result == "*"
+
+
+def test_config_game_record_reads_back():
+    from src.domain.services.game import Game
+    from src.domain.value_objects.game_config import GameConfigStandard
+
+    game = Game(GameConfigStandard({PieceType.KNIGHT: 1}, enable_castling=False))
+    game.engine.play_move(from_san(game.state, "N@e4"))
+    record = game.record()
+    assert " P N/n 0/0" in record.fen
+    (read,) = read_games(io.StringIO(format_game(record)))
+    assert read == record
+    assert record_to_san(read)[-1] == "N@e4"
@@ -0,0 +1,53 @@
+from src.domain.entities.board import Board
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Pawn, Rook, King
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color
+from src.domain.entities.codec import encode_state
+from src.domain.services.move_generator import legal_moves
+from src.domain.services.search import Searcher, SearchLimits, MATE_SCORE
+from src.domain.services.parallel import ParallelSearcher
+from src.domain.services import parallel
+
+
+def back_rank_mate():
+    board = Board()
+    for piece, square in [(King(Color.WHITE), "g1"), (Rook(Color.WHITE), "a1"),
+                          (King(Color.BLACK), "g8"), (Pawn(Color.BLACK), "f7"),
+                          (Pawn(Color.BLACK), "g7"), (Pawn(Color.BLACK), "h7")]:
+        board.place_piece(piece, Position.from_algebraic(square))
+    return GameState(board, Color.WHITE)
+
+
+def test_single_worker_is_plain_search():
+    with ParallelSearcher(1) as searcher:
+        first = searcher.search(back_rank_mate(), SearchLimits(max_depth=3))
+    assert str(first.best_move) == "a1a8"
+    assert first.score == MATE_SCORE - 1
+
+
+def test_workers_split_root_moves():
+    state = back_rank_mate()
+    key = state.zobrist_key
+    with ParallelSearcher(2, table_bytes=1 << 16) as searcher:
+        result = searcher.search(state, SearchLimits(max_depth=3))
+    assert str(result.best_move) == "a1a8"
+    assert result.score == MATE_SCORE - 1
+    assert state.zobrist_key == key
+
+
+def test_worker_table_is_kept_between_searches():
+    state = back_rank_mate()
+    codes = [move.to_code() for move in legal_moves(state)]
+    parallel._init_worker(1 << 16)
+    try:
+        table = parallel._worker_table
+        parallel._search_share(encode_state(state), None, codes, SearchLimits(max_depth=2))
+        assert table.probe(state.zobrist_key) is not None
+        parallel._search_share(encode_state(state), None, codes, SearchLimits(max_depth=1))
+        assert parallel._worker_table is table
+        assert table.probe(state.zobrist_key) is not None
+        Searcher(state, table)
+        assert table.probe(state.zobrist_key) is not None
+    finally:
+        parallel._worker_table = None
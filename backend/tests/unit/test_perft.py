@@ -0,0 +1,42 @@
+import pytest
+from src.domain.services.perft import (
+    REFERENCE_POSITIONS, perft, perft_stats, divide, main,
+)
+
+
+@pytest.mark.parametrize("name, depth", [
+    ("start", 3), ("kiwipete", 2), ("endgame", 3), ("promotions", 2),
+    ("kings", 1), ("start-reserves", 2),
+])
+def test_reference_stats(name, depth):
+    reference = REFERENCE_POSITIONS[name]
+    assert perft_stats(reference.build(), depth) == reference.expected[depth]
+
+
+@pytest.mark.parametrize("name", list(REFERENCE_POSITIONS))
+def test_reference_nodes(name):
+    reference = REFERENCE_POSITIONS[name]
+    assert perft(reference.build(), 2) == reference.expected_nodes(2)
+
+
+def test_divide_sums_to_perft():
+    state = REFERENCE_POSITIONS["kiwipete"].build()
+    counts = divide(state, 2)
+    assert len(counts) == 48
+    assert counts["e1g1"] == 43
+    assert sum(counts.values()) == 2039
+
+
+def test_perft_leaves_state_unchanged():
+    state = REFERENCE_POSITIONS["start-reserves"].build()
+    before = [state.board.piece_at(sq) for sq in range(64)], state.castling, dict(state.reserves[state.current_player_color])
+    perft(state, 2)
+    after = [state.board.piece_at(sq) for sq in range(64)], state.castling, dict(state.reserves[state.current_player_color])
+    assert before == after
+
+
+def test_main_reports_throughput(capsys):
+    assert main(["2", "endgame", "--stats"]) == 0
+    out = capsys.readouterr().out
+    assert "nodes/s" in out
+    assert "OK" in out
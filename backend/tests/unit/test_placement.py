@@ -0,0 +1,110 @@
+import pytest
+from src.domain.entities.board import Board
+from src.domain.entities.game_state import GameState, GamePhase
+from src.domain.entities.piece import Pawn, Knight, Rook, King
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.value_objects.game_config import GameConfigStandard
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.move_generator import legal_moves
+from src.domain.services.placement import (
+    PlacementStatus, check_placement, generate_placements, can_place,
+)
+from src.domain.exceptions.game_error import InvalidMoveError, IllegalMoveError
+
+
+def setup(config, *pieces, color=Color.WHITE):
+    board = Board()
+    for piece, square in pieces:
+        board.place_piece(piece, Position.from_algebraic(square))
+    state = GameState(board, color, reserves=config.initial_reserves(), config=config)
+    return state, GoChessEngine(state, [])
+
+
+def squares(moves, piece_type):
+    return {move.to_pos.algebraic() for move in moves if move.drop == piece_type}
+
+
+def test_pawns_keep_promotion_distance():
+    config = GameConfigStandard({PieceType.PAWN: 1}, pawn_promotion_distance=2)
+    state, _ = setup(config)
+    white = squares(generate_placements(state), PieceType.PAWN)
+    assert {sq[1] for sq in white} == set("23456")
+
+    state.switch_player()
+    black = squares(generate_placements(state), PieceType.PAWN)
+    assert {sq[1] for sq in black} == set("34567")
+
+
+def test_generator_agrees_with_check_placement():
+    config = GameConfigStandard({PieceType.PAWN: 2, PieceType.KNIGHT: 1, PieceType.KING: 1})
+    state, _ = setup(config, (King(Color.WHITE), "e1"), (Rook(Color.BLACK), "e6"),
+                     (Pawn(Color.WHITE), "d4"))
+    generated = {(move.drop, move.to_pos) for move in generate_placements(state)}
+    checked = {
+        (piece_type, position)
+        for piece_type in config.allowed_pieces
+        for position in Position.table(8)
+        if check_placement(state, piece_type, position).is_legal
+    }
+    assert generated == checked
+    # in check from e6, only the squares in between block it
+    assert squares(legal_moves(state), PieceType.KNIGHT) == {"e2", "e3", "e4", "e5"}
+
+
+def test_statuses():
+    config = GameConfigStandard({PieceType.PAWN: 1, PieceType.KNIGHT: 1})
+    state, _ = setup(config, (King(Color.WHITE), "e1"), (Rook(Color.BLACK), "e6"))
+    pos = Position.from_algebraic
+    assert check_placement(state, PieceType.KNIGHT, pos("e3")) is PlacementStatus.LEGAL
+    assert check_placement(state, PieceType.KNIGHT, pos("a3")) is PlacementStatus.KING_IN_CHECK
+    assert check_placement(state, PieceType.KNIGHT, pos("e6")) is PlacementStatus.OCCUPIED
+    assert check_placement(state, PieceType.PAWN, pos("e7")) is PlacementStatus.RESTRICTED_SQUARE
+    assert check_placement(state, PieceType.QUEEN, pos("e3")) is PlacementStatus.NO_RESERVE
+    state.phase = GamePhase.MOVEMENT
+    assert check_placement(state, PieceType.KNIGHT, pos("e3")) is PlacementStatus.WRONG_PHASE
+
+
+def test_engine_rejects_invalid_and_illegal_placements():
+    config = GameConfigStandard({PieceType.KNIGHT: 2})
+    state, engine = setup(config, (King(Color.WHITE), "e1"), (Rook(Color.BLACK), "e6"))
+    with pytest.raises(IllegalMoveError):
+        engine.place_piece(Knight(Color.WHITE), Position.from_algebraic("a3"))
+    with pytest.raises(InvalidMoveError):
+        engine.place_piece(Knight(Color.BLACK), Position.from_algebraic("a3"))
+    with pytest.raises(InvalidMoveError):
+        engine.place_piece(Knight(Color.WHITE), Position.from_algebraic("e1"))
+    assert state.reserves[Color.WHITE][PieceType.KNIGHT] == 2
+
+    engine.place_piece(Knight(Color.WHITE), Position.from_algebraic("e4"))
+    assert state.board.get_piece(Position.from_algebraic("e4")) == Knight(Color.WHITE)
+    assert state.reserves[Color.WHITE][PieceType.KNIGHT] == 1
+    assert state.placement_turns[Color.WHITE] == 1
+
+
+def test_placement_turn_limit():
+    config = GameConfigStandard({PieceType.KNIGHT: 3}, max_placement_turns=1)
+    state, engine = setup(config)
+    engine.place_piece(Knight(Color.WHITE), Position.from_algebraic("c3"))
+    assert not can_place(state, Color.WHITE)
+    assert list(generate_placements(state)) == []
+    assert check_placement(state, PieceType.KNIGHT, Position.from_algebraic("f3")) \
+        is PlacementStatus.NO_PLACEMENT_TURNS
+
+
+def test_phase_ends_when_nobody_can_place():
+    config = GameConfigStandard({PieceType.KNIGHT: 1})
+    state, engine = setup(config, (King(Color.WHITE), "e1"), (King(Color.BLACK), "e8"))
+    engine.place_piece(Knight(Color.WHITE), Position.from_algebraic("c3"))
+    assert state.phase == GamePhase.PLACEMENT
+    state.switch_player()
+    engine.place_piece(Knight(Color.BLACK), Position.from_algebraic("c6"))
+    assert state.phase == GamePhase.MOVEMENT
+
+
+def test_second_king_is_never_placed():
+    config = GameConfigStandard({PieceType.KING: 1})
+    state, _ = setup(config, (King(Color.WHITE), "e1"))
+    assert list(generate_placements(state)) == []
+    assert check_placement(state, PieceType.KING, Position.from_algebraic("a4")) \
+        is PlacementStatus.RESTRICTED_SQUARE
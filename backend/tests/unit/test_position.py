@@ -0,0 +1,58 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError
+
+import pytest
+from src.domain.value_objects.position import Position
+from src.domain.exceptions.game_error import InvalidMoveError
+
+
+def test_positions_are_interned():
+    assert Position(3, 4) is Position(3, 4)
+    assert Position.from_algebraic("e5") is Position(3, 4)
+    assert Position.from_index(36) is Position(4, 4)
+    assert Position.table(8)[Position(6, 2).index] is Position(6, 2)
+
+
+def test_square_index_and_algebraic():
+    pos = Position(7, 0)
+    assert pos.index == 56
+    assert pos.algebraic() == "a1"
+    assert Position(0, 7).algebraic() == "h8"
+
+
+def test_off_board_positions_are_allowed():
+    pos = Position(-1, 3)
+    assert pos.index == -1
+    assert pos == Position(-1, 3)
+    assert pos != Position(0, 3)
+
+
+def test_from_algebraic_rejects_invalid_notation():
+    for notation in ("i1", "a9", "a0", "e", "e44", 42, None):
+        with pytest.raises(InvalidMoveError):
+            Position.from_algebraic(notation)
+
+
+def test_positions_are_immutable():
+    pos = Position(1, 1)
+    with pytest.raises(FrozenInstanceError):
+        pos.row = 2
+
+
+def test_positions_survive_copy_and_pickle():
+    pos = Position(2, 5)
+    assert copy.copy(pos) is pos
+    assert copy.deepcopy(pos) is pos
+    assert pickle.loads(pickle.dumps(pos)) is pos
+    assert len({Position(2, 5), Position(2, 5), Position(5, 2)}) == 2
+
+
+def test_other_board_sizes():
+    table = Position.table(10)
+    assert len(table) == 100
+    assert table[0].algebraic() == "a10"
+    assert Position.from_algebraic("j1", size=10) is table[99]
+    assert table[99].index == 99
+    # same square, same value, whatever the table
+    assert table[11] == Position(1, 1)
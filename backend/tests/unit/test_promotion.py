@@ -110,4 +110,14 @@ def test_white_pawn_underpromotion(promotion_piece):
     promoted_piece = board.get_piece(promotion_pos)
     assert promoted_piece is not None
     assert promoted_piece.type == promotion_piece
-    assert promoted_piece.color == Color.WHITE
\ No newline at end of file
+    assert promoted_piece.color == Color.WHITE
+
+
+def test_promotion_given_with_the_move_is_not_asked():
+    engine, state, pawn_pos = setup_engine_for_promotion(Color.WHITE, "a7", PieceType.QUEEN)
+
+    engine.move_piece(pawn_pos, Position.from_algebraic("a8"), PieceType.KNIGHT)
+
+    assert state.board.get_piece(Position.from_algebraic("a8")).type == PieceType.KNIGHT
+    assert state.move_history[-1].promotion == PieceType.KNIGHT
+    engine.promotion_prompt.assert_not_called()
@@ -0,0 +1,102 @@
+import random
+import pytest
+from src.domain.entities.game_state import GameState, GamePhase
+from src.domain.entities.piece import Piece
+from src.domain.exceptions.game_error import InvalidMoveError
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.move_generator import legal_moves
+from src.domain.services.replay import apply_moves, replay_fen
+from src.domain.value_objects.game_record import GameRecord
+from src.domain.value_objects.move import Move
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import PieceType
+from src.infrastructure.api.session_manager import SessionManager, GameStatus
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - M - 0/0"
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - M - 0/0"
+RESERVES = "4k3/8/8/8/8/8/8/4K3 w - - P QNP2/qnp2 0/0"
+
+
+def move(text: str) -> Move:
+    return Move(Position.from_algebraic(text[:2]), Position.from_algebraic(text[2:4]))
+
+
+def play_live(fen: str, moves: list[Move]) -> GameState:
+    state = GameState.from_fen(fen)
+    engine = GoChessEngine(state, [])
+    for played in moves:
+        if played.drop is not None:
+            engine.place_piece(Piece.create(played.drop, state.current_player_color), played.to_pos)
+        else:
+            engine.move_piece(played.from_pos, played.to_pos, played.promotion)
+        state.switch_player()
+    return state
+
+
+def random_game(fen: str, seed: int, length: int = 40) -> list[Move]:
+    rng = random.Random(seed)
+    state = GameState.from_fen(fen)
+    moves = []
+    for _ in range(length):
+        options = legal_moves(state)
+        if not options:
+            break
+        moves.append(rng.choice(options))
+        apply_moves(state, moves[-1:], record=False)
+    return moves
+
+
+@pytest.mark.parametrize("fen", [START, KIWIPETE, RESERVES])
+def test_trusted_replay_matches_live_play(fen):
+    for seed in range(3):
+        moves = random_game(fen, seed)
+        live = play_live(fen, moves)
+        replayed = replay_fen(fen, moves)
+        assert replayed.to_fen() == live.to_fen()
+        assert replayed.zobrist_key == live.zobrist_key
+        assert replayed.phase == live.phase
+        assert replayed.move_history == live.move_history
+        assert replayed.initial_fen == fen
+
+
+def test_placements_end_the_phase():
+    moves = [Move(None, Position.from_algebraic(square), drop=PieceType.KNIGHT) for square in ("c3", "c6")]
+    state = replay_fen("4k3/8/8/8/8/8/8/4K3 w - - P N/n 0/0", moves)
+    assert state.phase == GamePhase.MOVEMENT
+    assert state.to_fen().startswith("4k3/8/2n5/8/8/2N5/8/4K3 w - - M")
+
+
+def test_replays_move_codes_and_promotions():
+    moves = [move("e2e4"), move("d7d5"), move("e4d5"), move("g8f6")]
+    assert replay_fen(START, [m.to_code() for m in moves]).to_fen() == replay_fen(START, moves).to_fen()
+    promotion = Move(Position.from_algebraic("a7"), Position.from_algebraic("a8"), PieceType.KNIGHT)
+    state = replay_fen("4k3/P7/8/8/8/8/8/4K3 w - - M - 0/0", [promotion.to_code()])
+    assert state.to_fen().startswith("N3k3/8/")
+
+
+def test_untrusted_replay_stops_at_illegal_moves():
+    state = GameState.from_fen(START)
+    with pytest.raises(InvalidMoveError):
+        apply_moves(state, [move("e2e4"), move("e7e5"), move("e4e5")], trusted=False)
+    assert len(state.move_history) == 2
+    assert state.to_fen() == replay_fen(START, [move("e2e4"), move("e7e5")]).to_fen()
+
+
+def test_replay_without_history():
+    state = GameState.from_fen(START)
+    assert apply_moves(state, [move("e2e4"), move("e7e5")], record=False) == 2
+    assert state.move_history == []
+
+
+def test_sessions_are_restored_from_records():
+    manager = SessionManager()
+    try:
+        moves = [move("f2f3"), move("e7e5"), move("g2g4"), move("d8h4")]
+        session = manager.restore(GameRecord(START, moves), game_id="saved")
+        assert manager.get("saved") is session
+        assert session.version == 4
+        assert session.status == GameStatus.CHECKMATE
+        assert session.record().result == "0-1"
+        assert session.record().moves == moves
+    finally:
+        manager.close()
@@ -0,0 +1,96 @@
+import time
+from src.domain.entities.board import Board
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Pawn, Knight, Rook, King, Queen
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.perft import REFERENCE_POSITIONS
+from src.domain.services.search import SearchLimits, search, MATE_SCORE
+
+
+def build(*pieces, color=Color.WHITE, reserves=None):
+    board = Board()
+    for piece, square in pieces:
+        board.place_piece(piece, Position.from_algebraic(square))
+    return GameState(board, color, reserves=reserves)
+
+
+def test_finds_mate_in_one():
+    # back rank mate with the rook
+    state = build((King(Color.WHITE), "g1"), (Rook(Color.WHITE), "a1"),
+                  (King(Color.BLACK), "g8"), (Pawn(Color.BLACK), "f7"),
+                  (Pawn(Color.BLACK), "g7"), (Pawn(Color.BLACK), "h7"))
+    result = search(state, SearchLimits(max_depth=3))
+    assert str(result.best_move) == "a1a8"
+    assert result.score == MATE_SCORE - 1
+    assert result.is_mate
+
+
+def test_finds_mate_by_placement():
+    # the only way to mate is dropping the queen next to the cornered king
+    state = build((King(Color.WHITE), "f6"), (King(Color.BLACK), "h8"),
+                  reserves={Color.WHITE: {PieceType.QUEEN: 1}, Color.BLACK: {}})
+    result = search(state, SearchLimits(max_depth=2))
+    assert result.best_move.is_drop
+    assert result.score == MATE_SCORE - 1
+
+
+def test_sees_mate_and_placement_blocks_at_the_horizon():
+    # at depth 1 the reply to the check is left to the quiescence search
+    mate = [(King(Color.WHITE), "g1"), (Rook(Color.WHITE), "a1"),
+            (King(Color.BLACK), "g8"), (Pawn(Color.BLACK), "f7"),
+            (Pawn(Color.BLACK), "g7"), (Pawn(Color.BLACK), "h7")]
+    result = search(build(*mate), SearchLimits(max_depth=1))
+    assert str(result.best_move) == "a1a8"
+    assert result.score == MATE_SCORE - 1
+
+    # a knight in black's hand can block the check on the back rank
+    state = build(*mate, reserves={Color.WHITE: {}, Color.BLACK: {PieceType.KNIGHT: 1}})
+    result = search(state, SearchLimits(max_depth=1))
+    assert not result.is_mate
+
+
+def test_wins_hanging_queen():
+    state = build((King(Color.WHITE), "a1"), (Knight(Color.WHITE), "c3"),
+                  (King(Color.BLACK), "h8"), (Queen(Color.BLACK), "d5"))
+    result = search(state, SearchLimits(max_depth=2))
+    assert str(result.best_move) == "c3d5"
+    assert result.pv[0] == result.best_move
+
+
+def test_search_leaves_state_untouched():
+    state = REFERENCE_POSITIONS["kiwipete"].build()
+    key = state.zobrist_key
+    board = state.board.copy()
+    # a node limit interrupts the search in the middle of the tree
+    result = search(state, SearchLimits(max_nodes=3000))
+    assert result.best_move is not None
+    assert result.nodes <= 3000
+    assert state.zobrist_key == key
+    assert state.board == board
+    assert state._undo_stack == []
+
+
+def test_time_limit():
+    state = REFERENCE_POSITIONS["start-reserves"].build()
+    start = time.perf_counter()
+    result = search(state, SearchLimits(time_limit=0.3))
+    assert time.perf_counter() - start < 0.6
+    assert result.best_move is not None
+
+
+def test_no_legal_move():
+    state = build((King(Color.WHITE), "a1"), (Queen(Color.BLACK), "b2"), (King(Color.BLACK), "c3"))
+    result = search(state, SearchLimits(max_depth=2))
+    assert result.best_move is None
+    assert result.score == -MATE_SCORE
+
+
+def test_engine_plays_best_move():
+    state = build((King(Color.WHITE), "a1"), (Knight(Color.WHITE), "c3"),
+                  (King(Color.BLACK), "h8"), (Queen(Color.BLACK), "d5"))
+    engine = GoChessEngine(state, [])
+    result = engine.find_best_move(SearchLimits(max_depth=2))
+    engine.play_move(result.best_move)
+    assert state.board.get_piece(Position.from_algebraic("d5")) == Knight(Color.WHITE)
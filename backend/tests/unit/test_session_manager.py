@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.domain.exceptions.game_error import InvalidMoveError
+from src.domain.services.search import SearchLimits
+from src.domain.value_objects.game_config import GameConfigStandard
+from src.domain.value_objects.piece_type import PieceType
+from src.infrastructure.api.session_manager import (
+    SessionManager, SessionNotFoundError, SessionLimitError, GameStatus,
+)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def manager():
+    manager = SessionManager(search_executor=ThreadPoolExecutor(1))
+    yield manager
+    manager.close()
+
+
+def test_play_moves_in_any_notation(manager):
+    session = manager.create()
+
+    async def play():
+        assert "e2e4" in await manager.legal_moves(session.id)
+        assert (await manager.play(session.id, "e2e4"))[0] == "e4"
+        san, game = await manager.play(session.id, "Nf6")
+        return san, game
+
+    san, game = run(play())
+    assert san == "Nf6"
+    assert game["turn"] == "white"
+    assert game["version"] == 2
+    assert game["fen"].startswith("rnbqkb1r/pppppppp/5n2/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - P")
+    assert session.record().moves[0].to_pos.algebraic() == "e4"
+
+
+def test_rejects_illegal_moves_and_unknown_games(manager):
+    session = manager.create()
+    with pytest.raises(InvalidMoveError):
+        run(manager.play(session.id, "e2e5"))
+    assert session.version == 0
+    with pytest.raises(SessionNotFoundError):
+        run(manager.snapshot("nope"))
+
+
+def test_placements_and_checkmate(manager):
+    config = GameConfigStandard({PieceType.QUEEN: 1})
+    session = manager.create("7k/8/6K1/8/8/8/8/8 w - - P - 0/0", config)
+
+    async def play():
+        assert "Q@a8" in await manager.legal_moves(session.id)
+        return await manager.play(session.id, "Q@g7")
+
+    san, game = run(play())
+    assert san == "Q@g7#"
+    assert game["status"] == GameStatus.CHECKMATE.value
+    assert game["winner"] == "white"
+    assert game["reserves"] == {"white": {}, "black": {"Q": 1}}
+    assert run(manager.legal_moves(session.id)) == []
+    with pytest.raises(InvalidMoveError):
+        run(manager.play(session.id, "Kh7"))
+    assert manager.remove(session.id).result == "1-0"
+    assert len(manager) == 0
+
+
+def test_bot_move(manager):
+    session = manager.create("7k/8/6K1/8/8/8/8/R7 w - - M - 0/0")
+    san, game = run(manager.play_bot(session.id, SearchLimits(max_depth=2)))
+    assert san == "Ra8#"
+    assert game["status"] == "checkmate"
+
+
+def test_concurrent_games_and_limits():
+    manager = SessionManager(max_sessions=20)
+    sessions = [manager.create() for _ in range(20)]
+    with pytest.raises(SessionLimitError):
+        manager.create()
+
+    async def play_all():
+        # concurrent requests on the same game are applied one after the other
+        results = await asyncio.gather(
+            *(manager.play(session.id, "e2e4") for session in sessions),
+            *(manager.play(session.id, "e7e5") for session in sessions),
+        )
+        return results
+
+    results = run(play_all())
+    manager.close()
+    assert [san for san, _ in results] == ["e4"] * 20 + ["e5"] * 20
+    assert all(session.version == 2 for session in sessions)
+    assert manager.evict_idle(0) == 20
@@ -0,0 +1,75 @@
+import pytest
+from src.domain.value_objects.move import Move
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import PieceType
+from src.domain.services.transposition import TranspositionTable, EXACT, LOWER, UPPER, ENTRY_BYTES
+from src.domain.services.perft import REFERENCE_POSITIONS
+from src.domain.services.search import Searcher, SearchLimits
+from src.domain.services.move_generator import legal_moves
+
+
+def test_store_and_probe():
+    table = TranspositionTable(64 * 1024)
+    move = Move(Position.from_algebraic("e7"), Position.from_algebraic("e8"), PieceType.KNIGHT)
+    table.store(12345, depth=5, bound=LOWER, score=-250, move=move.to_code())
+    entry = table.probe(12345)
+    assert (entry.depth, entry.bound, entry.score) == (5, LOWER, -250)
+    assert Move.from_code(entry.move) == move
+    assert table.probe(54321) is None
+    assert table.stats.hits == 1 and table.stats.probes == 2
+
+
+def test_budget_is_respected():
+    for budget in (1024, 10_000, 1 << 20, 3 << 20):
+        table = TranspositionTable(budget)
+        assert table.nbytes <= budget
+        assert table.nbytes > budget // 2
+        assert len(table._keys) * 8 + len(table._data) * 8 == table.nbytes
+    with pytest.raises(ValueError):
+        TranspositionTable(ENTRY_BYTES)
+
+
+def test_depth_preferred_replacement():
+    table = TranspositionTable(1024)
+    buckets = table.size // 2
+    deep, shallow, other = 7, 7 + buckets, 7 + 2 * buckets  # same bucket
+    table.store(deep, depth=8, bound=EXACT, score=1)
+    table.store(shallow, depth=2, bound=EXACT, score=2)
+    table.store(other, depth=1, bound=UPPER, score=3)
+    # the deep entry survives, the always-replace slot took the newest one
+    assert table.probe(deep).score == 1
+    assert table.probe(shallow) is None
+    assert table.probe(other).score == 3
+    assert table.stats.overwrites == 1
+    assert table.stats.collisions == 1
+
+    # entries of an older search give way
+    table.new_search()
+    table.store(shallow, depth=1, bound=EXACT, score=4)
+    assert table.probe(shallow).score == 4
+    assert table.probe(deep).score == 1
+
+
+def test_keeps_move_when_storing_without_one():
+    table = TranspositionTable(1024)
+    table.store(99, depth=2, bound=EXACT, score=0, move=1234)
+    table.store(99, depth=3, bound=UPPER, score=-5)
+    assert table.probe(99).move == 1234
+
+
+def test_move_codes_round_trip():
+    state = REFERENCE_POSITIONS["start-reserves"].build()
+    for move in legal_moves(state):
+        assert Move.from_code(move.to_code()) == move
+    drop = Move(None, Position.from_algebraic("a8"), drop=PieceType.PAWN)
+    assert drop.to_code() != 0
+
+
+def test_search_reuses_table():
+    state = REFERENCE_POSITIONS["kiwipete"].build()
+    searcher = Searcher(state, TranspositionTable(1 << 20))
+    first = searcher.search(SearchLimits(max_depth=3))
+    second = searcher.search(SearchLimits(max_depth=3))
+    assert second.best_move == first.best_move
+    assert second.nodes < first.nodes
+    assert searcher.table.stats.hits > 0
@@ -0,0 +1,92 @@
+import pytest
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Knight, Queen
+from src.domain.exceptions.game_error import InvalidMoveError, IllegalMoveError
+from src.domain.services.go_chess_engine import GoChessEngine
+from src.domain.services.validators import (
+    Rule, ValidatorPipeline, ValidationContext, compile_pipeline,
+    PieceOwnershipRule, PieceMovementRule, KingSafetyRule, CheckNowValidator,
+)
+from src.domain.value_objects.game_config import GameConfigStandard
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - M - 0/0"
+
+
+def square(name: str) -> Position:
+    return Position.from_algebraic(name)
+
+
+def context(state: GameState, source: str, target: str) -> ValidationContext:
+    return ValidationContext(state, square(target), square(source), state.board.get_piece(square(source)))
+
+
+def test_rules_run_cheapest_first_and_stop_at_the_first_rejection():
+    pipeline = ValidatorPipeline([KingSafetyRule(), PieceMovementRule(), PieceOwnershipRule()])
+    assert [rule.name for rule in pipeline.rules] == ["piece_ownership", "piece_movement", "king_safety"]
+
+    state = GameState.from_fen(START)
+    with pytest.raises(InvalidMoveError, match="No piece"):
+        pipeline.validate(context(state, "e4", "e5"))
+    with pytest.raises(InvalidMoveError, match="Invalid move"):
+        pipeline.validate(context(state, "e2", "e5"))
+    pipeline.validate(context(state, "e2", "e4"))
+    stats = pipeline.stats
+    assert (stats["piece_ownership"].calls, stats["piece_ownership"].rejections) == (3, 1)
+    assert (stats["piece_movement"].calls, stats["piece_movement"].rejections) == (2, 1)
+    assert (stats["king_safety"].calls, stats["king_safety"].rejections) == (1, 0)
+    assert all(entry.time >= 0 for entry in stats.values())
+
+
+def test_pipelines_are_compiled_once_per_variant():
+    assert compile_pipeline(None) is compile_pipeline(GameConfigStandard({PieceType.PAWN: 1}))
+    no_castling = compile_pipeline(GameConfigStandard({}, enable_castling=False))
+    assert "no_castling" in [rule.name for rule in no_castling.rules]
+    assert no_castling is compile_pipeline(GameConfigStandard({PieceType.QUEEN: 2}, enable_castling=False))
+    assert [rule.name for rule in compile_pipeline(None, placements=True).rules] == [
+        "placement_turn", "placement", "placement_king_safety",
+    ]
+
+
+def test_engine_runs_the_variant_rules():
+    state = GameState.from_fen("4k3/8/8/8/8/8/8/R3K2R w KQ - M - 0/0")
+    state.config = GameConfigStandard({}, enable_castling=False)
+    engine = GoChessEngine(state, [])
+    with pytest.raises(InvalidMoveError, match="Castling is disabled"):
+        engine.move_piece(square("e1"), square("g1"))
+    with pytest.raises(InvalidMoveError, match="not your turn"):
+        engine.move_piece(square("e8"), square("e7"))
+    engine.move_piece(square("e1"), square("f2"))
+
+
+def test_engine_adds_its_own_rules():
+    class NoQueenMoves(Rule):
+        name = "no_queen_moves"
+        cost = 5
+
+        def check(self, context):
+            return "Queens are asleep" if context.piece.type == PieceType.QUEEN else None
+
+    engine = GoChessEngine(GameState.from_fen("4k3/8/8/8/8/8/8/3QK3 w - - M - 0/0"), [NoQueenMoves()])
+    assert [rule.name for rule in engine.pipeline().rules][:2] == ["piece_ownership", "no_queen_moves"]
+    with pytest.raises(InvalidMoveError, match="asleep"):
+        engine.move_piece(square("d1"), square("d4"))
+    assert engine.pipeline().stats["piece_movement"].calls == 0
+
+
+def test_engine_rejects_validators_outside_the_pipeline():
+    with pytest.raises(TypeError, match="CheckNowValidator"):
+        GoChessEngine(GameState.from_fen("4k3/8/8/8/8/8/8/3QK3 w - - M - 0/0"), [CheckNowValidator()])
+
+
+def test_placement_rules():
+    state = GameState.from_fen("4k3/8/8/8/8/8/8/4K2r w - - P QN/ 0/0")
+    engine = GoChessEngine(state, [])
+    with pytest.raises(InvalidMoveError, match="not your turn"):
+        engine.place_piece(Knight(Color.BLACK), square("c3"))
+    with pytest.raises(InvalidMoveError, match="occupied"):
+        engine.place_piece(Queen(Color.WHITE), square("e1"))
+    with pytest.raises(IllegalMoveError):
+        engine.place_piece(Knight(Color.WHITE), square("c3"))
+    engine.place_piece(Queen(Color.WHITE), square("g1"))
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+from src.domain.entities.board import Board
+from src.domain.entities.game_state import GameState
+from src.domain.entities.piece import Knight, Bishop
+from src.domain.value_objects.position import Position
+from src.domain.value_objects.piece_type import Color, PieceType
+from src.domain.services.move_generator import legal_moves
+from src.domain.services.perft import REFERENCE_POSITIONS
+
+
+@pytest.mark.parametrize("name", ["kiwipete", "promotions", "start-reserves", "kings"])
+def test_incremental_key_matches_recomputed_key(name):
+    rng = random.Random(name)
+    state = REFERENCE_POSITIONS[name].build()
+    start_key = state.zobrist_key
+    assert start_key == state.compute_zobrist_key()
+
+    keys = []
+    for _ in range(30):
+        moves = legal_moves(state)
+        if not moves:
+            break
+        keys.append(state.zobrist_key)
+        state.play(rng.choice(moves))
+        assert state.zobrist_key == state.compute_zobrist_key()
+
+    # taking the moves back walks the same keys in reverse
+    while keys:
+        state.unmake_move()
+        assert state.zobrist_key == keys.pop()
+    assert state.zobrist_key == start_key
+
+
+def test_placement_orders_transpose():
+    reserves = {Color.WHITE: {PieceType.KNIGHT: 1, PieceType.BISHOP: 1}, Color.BLACK: {}}
+    first = GameState(Board(), Color.WHITE, reserves=reserves)
+    second = GameState(Board(), Color.WHITE, reserves=reserves)
+
+    first.apply_drop(Knight(Color.WHITE), Position.from_algebraic("c3"))
+    first.apply_drop(Bishop(Color.WHITE), Position.from_algebraic("f4"))
+    second.apply_drop(Bishop(Color.WHITE), Position.from_algebraic("f4"))
+    second.apply_drop(Knight(Color.WHITE), Position.from_algebraic("c3"))
+
+    assert first.zobrist_key == second.zobrist_key
+
+
+def test_key_covers_game_state():
+    state = GameState(Board(), Color.WHITE, reserves={Color.WHITE: {PieceType.QUEEN: 1}, Color.BLACK: {}})
+    keys = {state.zobrist_key}
+
+    state.switch_player()
+    keys.add(state.zobrist_key)
+    state.castling_rights[Color.WHITE]["kingside"] = False
+    keys.add(state.zobrist_key)
+    state.en_passant_target = Position.from_algebraic("e3")
+    keys.add(state.zobrist_key)
+    state.switch_phase()
+    keys.add(state.zobrist_key)
+    state.reserves[Color.WHITE][PieceType.QUEEN] -= 1
+    keys.add(state.zobrist_key)
+    state.placement_turns[Color.WHITE] += 1
+    keys.add(state.zobrist_key)
+
+    assert len(keys) == 7
+    assert state.zobrist_key == state.compute_zobrist_key()
+
+
+def test_explicit_zero_reserve_hashes_like_missing_entry():
+    with_zero = GameState(Board(), Color.WHITE, reserves={Color.WHITE: {PieceType.ROOK: 0}, Color.BLACK: {}})
+    without = GameState(Board(), Color.WHITE, reserves={Color.WHITE: {}, Color.BLACK: {}})
+    assert with_zero.zobrist_key == without.zobrist_key